@@ -20,6 +20,16 @@ if config.config_file_name is not None:
 
 target_metadata = Base.metadata
 
+# Objects created by DDL events in `src.models` rather than mapped columns.
+UNMAPPED_OBJECTS = {"search_vector", "ix_todo_search_vector"}
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """
+    The function excludes unmapped objects from autogenerate.
+    """
+    return not (reflected and name in UNMAPPED_OBJECTS)
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
@@ -37,6 +47,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -60,7 +71,9 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,47 @@
+"""
+adding todo filter sort indexes
+
+Revision ID: 3f1d7a2c9e64
+Revises: 95b0c3bd488e
+Create Date: 2026-10-18 11:03:27.640915
+"""
+from alembic import op
+
+
+revision = "3f1d7a2c9e64"
+down_revision = "95b0c3bd488e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    The function upgrades all changes from a specific revision.
+    """
+    op.create_index(
+        "ix_todo_owner_id_complete_priority",
+        "todo",
+        ["owner_id", "complete", "priority", "todo_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_todo_owner_id_priority",
+        "todo",
+        ["owner_id", "priority", "todo_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_todo_owner_id_title",
+        "todo",
+        ["owner_id", "title", "todo_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """
+    The function downgrades all changes from a specific revision.
+    """
+    op.drop_index("ix_todo_owner_id_title", table_name="todo")
+    op.drop_index("ix_todo_owner_id_priority", table_name="todo")
+    op.drop_index("ix_todo_owner_id_complete_priority", table_name="todo")
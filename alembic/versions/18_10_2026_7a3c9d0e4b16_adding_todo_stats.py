@@ -0,0 +1,121 @@
+"""
+adding todo stats
+
+Revision ID: 7a3c9d0e4b16
+Revises: e5b7c1f93a28
+Create Date: 2026-10-18 16:11:42.508317
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "7a3c9d0e4b16"
+down_revision = "e5b7c1f93a28"
+branch_labels = None
+depends_on = None
+
+
+TODO_STATS_TRIGGERS = {
+    "INSERT": "REFERENCING NEW TABLE AS new_todos",
+    "UPDATE": "REFERENCING NEW TABLE AS new_todos OLD TABLE AS old_todos",
+    "DELETE": "REFERENCING OLD TABLE AS old_todos",
+}
+
+
+def upgrade() -> None:
+    """
+    The function upgrades all changes from a specific revision.
+    """
+    op.create_table(
+        "todo_stats",
+        sa.Column("owner_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "priority",
+            postgresql.ENUM(
+                "one",
+                "two",
+                "three",
+                "four",
+                "five",
+                name="priority",
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("complete", sa.Boolean(), nullable=False),
+        sa.Column("count", sa.Integer(), server_default="0", nullable=False),
+        sa.ForeignKeyConstraint(
+            ["owner_id"], ["user.user_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("owner_id", "priority", "complete"),
+    )
+    op.execute("""
+        CREATE FUNCTION update_todo_stats() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                INSERT INTO todo_stats (owner_id, priority, complete, count)
+                SELECT owner_id, priority, coalesce(complete, false), count(*)
+                FROM new_todos
+                GROUP BY 1, 2, 3
+                ON CONFLICT (owner_id, priority, complete)
+                DO UPDATE SET count = todo_stats.count + excluded.count;
+            ELSIF TG_OP = 'UPDATE' THEN
+                INSERT INTO todo_stats (owner_id, priority, complete, count)
+                SELECT owner_id, priority, complete, sum(delta)
+                FROM (
+                    SELECT owner_id, priority,
+                        coalesce(complete, false) AS complete, 1 AS delta
+                    FROM new_todos
+                    UNION ALL
+                    SELECT owner_id, priority, coalesce(complete, false), -1
+                    FROM old_todos
+                ) AS changes
+                GROUP BY 1, 2, 3
+                HAVING sum(delta) <> 0
+                ON CONFLICT (owner_id, priority, complete)
+                DO UPDATE SET count = todo_stats.count + excluded.count;
+            ELSE
+                UPDATE todo_stats SET count = todo_stats.count - deleted.count
+                FROM (
+                    SELECT owner_id, priority,
+                        coalesce(complete, false) AS complete,
+                        count(*) AS count
+                    FROM old_todos
+                    GROUP BY 1, 2, 3
+                ) AS deleted
+                WHERE todo_stats.owner_id = deleted.owner_id
+                    AND todo_stats.priority = deleted.priority
+                    AND todo_stats.complete = deleted.complete;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$
+        """)
+
+    for operation, transition_tables in TODO_STATS_TRIGGERS.items():
+        op.execute(
+            f"CREATE TRIGGER todo_{operation.lower()}_todo_stats "
+            f"AFTER {operation} ON todo {transition_tables} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION update_todo_stats()"
+        )
+
+    op.execute("""
+        INSERT INTO todo_stats (owner_id, priority, complete, count)
+        SELECT owner_id, priority, coalesce(complete, false), count(*)
+        FROM todo
+        GROUP BY 1, 2, 3
+        """)
+
+
+def downgrade() -> None:
+    """
+    The function downgrades all changes from a specific revision.
+    """
+    for operation in TODO_STATS_TRIGGERS:
+        op.execute(f"DROP TRIGGER todo_{operation.lower()}_todo_stats ON todo")
+
+    op.execute("DROP FUNCTION update_todo_stats()")
+    op.drop_table("todo_stats")
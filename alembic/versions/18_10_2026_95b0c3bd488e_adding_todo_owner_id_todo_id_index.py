@@ -0,0 +1,33 @@
+"""
+adding todo owner_id todo_id index
+
+Revision ID: 95b0c3bd488e
+Revises: 9c508c87ee5f
+Create Date: 2026-10-18 09:12:41.518306
+"""
+from alembic import op
+
+
+revision = "95b0c3bd488e"
+down_revision = "9c508c87ee5f"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    The function upgrades all changes from a specific revision.
+    """
+    op.create_index(
+        "ix_todo_owner_id_todo_id",
+        "todo",
+        ["owner_id", "todo_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """
+    The function downgrades all changes from a specific revision.
+    """
+    op.drop_index("ix_todo_owner_id_todo_id", table_name="todo")
@@ -0,0 +1,98 @@
+"""
+adding todo stats total
+
+Revision ID: b6e4f20a8d37
+Revises: 7a3c9d0e4b16
+Create Date: 2026-10-18 19:02:17.316584
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "b6e4f20a8d37"
+down_revision = "7a3c9d0e4b16"
+branch_labels = None
+depends_on = None
+
+
+TODO_STATS_SHARDS = 16
+
+
+def upgrade() -> None:
+    """
+    The function upgrades all changes from a specific revision.
+    """
+    op.create_table(
+        "todo_stats_total",
+        sa.Column("shard", sa.Integer(), nullable=False),
+        sa.Column(
+            "priority",
+            postgresql.ENUM(
+                "one",
+                "two",
+                "three",
+                "four",
+                "five",
+                name="priority",
+                create_type=False,
+            ),
+            nullable=False,
+        ),
+        sa.Column("complete", sa.Boolean(), nullable=False),
+        sa.Column("count", sa.Integer(), server_default="0", nullable=False),
+        sa.PrimaryKeyConstraint("shard", "priority", "complete"),
+    )
+    op.execute(f"""
+        CREATE FUNCTION update_todo_stats_total() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            stats todo_stats;
+            delta integer;
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                stats := NEW;
+                delta := NEW.count;
+            ELSIF TG_OP = 'UPDATE' THEN
+                stats := NEW;
+                delta := NEW.count - OLD.count;
+            ELSE
+                stats := OLD;
+                delta := -OLD.count;
+            END IF;
+
+            INSERT INTO todo_stats_total (shard, priority, complete, count)
+            VALUES (
+                mod(stats.owner_id, {TODO_STATS_SHARDS}),
+                stats.priority,
+                stats.complete,
+                delta
+            )
+            ON CONFLICT (shard, priority, complete)
+            DO UPDATE SET count = todo_stats_total.count + excluded.count;
+
+            RETURN NULL;
+        END;
+        $$
+        """)
+    op.execute(
+        "CREATE TRIGGER todo_stats_total "
+        "AFTER INSERT OR UPDATE OR DELETE ON todo_stats "
+        "FOR EACH ROW EXECUTE FUNCTION update_todo_stats_total()"
+    )
+    op.execute(f"""
+        INSERT INTO todo_stats_total (shard, priority, complete, count)
+        SELECT mod(owner_id, {TODO_STATS_SHARDS}), priority, complete,
+            sum(count)
+        FROM todo_stats
+        GROUP BY 1, 2, 3
+        """)
+
+
+def downgrade() -> None:
+    """
+    The function downgrades all changes from a specific revision.
+    """
+    op.execute("DROP TRIGGER todo_stats_total ON todo_stats")
+    op.execute("DROP FUNCTION update_todo_stats_total()")
+    op.drop_table("todo_stats_total")
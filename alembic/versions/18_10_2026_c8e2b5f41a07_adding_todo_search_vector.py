@@ -0,0 +1,41 @@
+"""
+adding todo search vector
+
+Revision ID: c8e2b5f41a07
+Revises: 3f1d7a2c9e64
+Create Date: 2026-10-18 12:41:09.207384
+"""
+from alembic import op
+
+
+revision = "c8e2b5f41a07"
+down_revision = "3f1d7a2c9e64"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    The function upgrades all changes from a specific revision.
+    """
+    op.execute(
+        "ALTER TABLE todo ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "to_tsvector('english', title || ' ' || description)"
+        ") STORED"
+    )
+    op.create_index(
+        "ix_todo_search_vector",
+        "todo",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """
+    The function downgrades all changes from a specific revision.
+    """
+    op.drop_index("ix_todo_search_vector", table_name="todo")
+    op.drop_column("todo", "search_vector")
@@ -0,0 +1,78 @@
+"""
+adding user todos version
+
+Revision ID: d41a9e6b7c23
+Revises: c8e2b5f41a07
+Create Date: 2026-10-18 14:17:52.381046
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "d41a9e6b7c23"
+down_revision = "c8e2b5f41a07"
+branch_labels = None
+depends_on = None
+
+
+TODOS_VERSION_TRIGGERS = {
+    "INSERT": "REFERENCING NEW TABLE AS new_todos",
+    "UPDATE": "REFERENCING NEW TABLE AS new_todos OLD TABLE AS old_todos",
+    "DELETE": "REFERENCING OLD TABLE AS old_todos",
+}
+
+
+def upgrade() -> None:
+    """
+    The function upgrades all changes from a specific revision.
+    """
+    op.add_column(
+        "user",
+        sa.Column(
+            "todos_version", sa.Integer(), server_default="0", nullable=False
+        ),
+    )
+    op.execute(
+        """
+        CREATE FUNCTION bump_todos_version() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE "user" SET todos_version = todos_version + 1
+                WHERE user_id IN (SELECT owner_id FROM new_todos);
+            ELSIF TG_OP = 'UPDATE' THEN
+                UPDATE "user" SET todos_version = todos_version + 1
+                WHERE user_id IN (
+                    SELECT owner_id FROM new_todos
+                    UNION SELECT owner_id FROM old_todos
+                );
+            ELSE
+                UPDATE "user" SET todos_version = todos_version + 1
+                WHERE user_id IN (SELECT owner_id FROM old_todos);
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$
+        """
+    )
+
+    for operation, transition_tables in TODOS_VERSION_TRIGGERS.items():
+        op.execute(
+            f"CREATE TRIGGER todo_{operation.lower()}_todos_version "
+            f"AFTER {operation} ON todo {transition_tables} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION bump_todos_version()"
+        )
+
+
+def downgrade() -> None:
+    """
+    The function downgrades all changes from a specific revision.
+    """
+    for operation in TODOS_VERSION_TRIGGERS:
+        op.execute(
+            f"DROP TRIGGER todo_{operation.lower()}_todos_version ON todo"
+        )
+
+    op.execute("DROP FUNCTION bump_todos_version()")
+    op.drop_column("user", "todos_version")
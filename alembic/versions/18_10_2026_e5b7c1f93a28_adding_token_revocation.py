@@ -0,0 +1,54 @@
+"""
+adding token revocation
+
+Revision ID: e5b7c1f93a28
+Revises: d41a9e6b7c23
+Create Date: 2026-10-18 15:02:19.734512
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "e5b7c1f93a28"
+down_revision = "d41a9e6b7c23"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """
+    The function upgrades all changes from a specific revision.
+    """
+    op.add_column(
+        "user",
+        sa.Column(
+            "tokens_valid_after", sa.DateTime(timezone=True), nullable=True
+        ),
+    )
+    op.create_table(
+        "revoked_token",
+        sa.Column("jti", sa.String(length=32), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["user.user_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("jti"),
+    )
+    op.create_index(
+        op.f("ix_revoked_token_expires_at"),
+        "revoked_token",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """
+    The function downgrades all changes from a specific revision.
+    """
+    op.drop_index(
+        op.f("ix_revoked_token_expires_at"), table_name="revoked_token"
+    )
+    op.drop_table("revoked_token")
+    op.drop_column("user", "tokens_valid_after")
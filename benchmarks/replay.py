@@ -0,0 +1,307 @@
+"""
+The load-testing harness that replays a JSONL request trace.
+
+It seeds throwaway users with `todos` in the database configured in the
+settings, replays the trace against `src.main:app` (in-process, or against
+a running server with `--base-url`) with the given concurrency, reports the
+throughput and the p50/p95/p99 latency per route, and saves the results as
+JSON so that runs can be compared across commits:
+
+    python -m benchmarks.replay benchmarks/traces/todos.jsonl \
+        --requests 5000 --concurrency 20
+
+Every line of the trace is a request, for example:
+
+    {"method": "GET", "path": "/todos/{todo_id}"}
+    {"method": "GET", "path": "/todos/", "params": {"sort": "-priority"}}
+    {"method": "PUT", "path": "/todos/{todo_id}", "json": {...}}
+
+The `{todo_id}` placeholder is replaced with one of the seeded `todos` of
+the user making the request, and the results are grouped by the method and
+the path of the line as written.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import random
+import subprocess
+import time
+import uuid
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+from sqlalchemy import delete, insert
+
+from src.database import SessionLocal
+from src.main import app
+from src.models import Priority, Role, Todo, User
+from src.oauth2 import create_access_token
+from src.utils import get_hashed_password
+
+RESULTS_DIRECTORY = Path(__file__).parent / "results"
+
+
+def load_trace(path: Path) -> list[dict]:
+    """
+    The function returns the requests of the JSONL trace.
+    """
+    with path.open() as trace_file:
+        trace = [json.loads(line) for line in trace_file if line.strip()]
+
+    if not trace:
+        raise ValueError(f"The trace `{path}` has no requests.")
+
+    return trace
+
+
+async def seed(
+    run_id: str, users: int, todos_per_user: int
+) -> dict[int, tuple[str, list[int]]]:
+    """
+    The function creates the users and their `todos`, and returns
+    an access token and the `todo` ids of every user.
+    """
+    password = get_hashed_password(password="B3nchm@rk")
+
+    async with SessionLocal() as db:
+        user_ids = await db.scalars(
+            insert(User).returning(User.user_id, sort_by_parameter_order=True),
+            [
+                {
+                    "email": f"bench_{run_id}_{index}@example.com",
+                    "username": f"bench_{run_id}_{index}",
+                    "password": password,
+                    "role": Role.user,
+                    "is_active": True,
+                    "first_name": "Bench",
+                    "last_name": "Mark",
+                }
+                for index in range(users)
+            ],
+        )
+        user_ids = user_ids.all()
+
+        todo_ids = await db.execute(
+            insert(Todo).returning(Todo.owner_id, Todo.todo_id),
+            [
+                {
+                    "title": f"Benchmark task {index}",
+                    "description": f"Replay the benchmark report {index}",
+                    "priority": Priority(index % 5 + 1),
+                    "complete": index % 3 == 0,
+                    "owner_id": user_id,
+                }
+                for user_id in user_ids
+                for index in range(todos_per_user)
+            ],
+        )
+        todos = defaultdict(list)
+
+        for owner_id, todo_id in todo_ids:
+            todos[owner_id].append(todo_id)
+
+        await db.commit()
+
+    return {
+        user_id: (
+            create_access_token(
+                username=f"bench_{run_id}_{index}",
+                user_id=user_id,
+                role=Role.user,
+            ),
+            todos[user_id],
+        )
+        for index, user_id in enumerate(user_ids)
+    }
+
+
+async def cleanup(user_ids: list[int]) -> None:
+    """
+    The function deletes the seeded users along with their `todos`.
+    """
+    async with SessionLocal() as db:
+        await db.execute(delete(User).where(User.user_id.in_(user_ids)))
+        await db.commit()
+
+
+async def replay(
+    client: httpx.AsyncClient,
+    trace: list[dict],
+    users: dict[int, tuple[str, list[int]]],
+    requests: int,
+    concurrency: int,
+) -> tuple[dict[str, list[float]], dict[str, int], float]:
+    """
+    The function replays the `trace` in order, cycling through it, and
+    returns the latencies and the errors per route and the elapsed time.
+    """
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    lines = itertools.islice(itertools.cycle(trace), requests)
+    sessions = list(users.values())
+
+    async def worker(index: int) -> None:
+        token, todo_ids = sessions[index % len(sessions)]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        for line in lines:
+            method = line.get("method", "GET").upper()
+            route = f"{method} {line['path']}"
+            path = line["path"].replace(
+                "{todo_id}", str(random.choice(todo_ids))
+            )
+
+            started_at = time.perf_counter()
+            try:
+                response = await client.request(
+                    method=method,
+                    url=path,
+                    params=line.get("params"),
+                    json=line.get("json"),
+                    headers=headers,
+                )
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+
+            latencies[route].append(time.perf_counter() - started_at)
+
+            if failed:
+                errors[route] += 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+
+    return latencies, errors, time.perf_counter() - started_at
+
+
+def percentile(values: list[float], percent: float) -> float:
+    """
+    The function returns the nearest-rank percentile of sorted `values`.
+    """
+    return values[max(0, math.ceil(percent / 100 * len(values)) - 1)]
+
+
+def summarise(latencies: list[float], errors: int) -> dict[str, float | int]:
+    """
+    The function returns the latency summary of a route in milliseconds.
+    """
+    latencies = sorted(latencies)
+
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "mean_ms": sum(latencies) / len(latencies) * 1000,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def get_commit() -> str | None:
+    """
+    The function returns the current git commit, if any.
+    """
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("trace", type=Path)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--todos-per-user", type=int, default=50)
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--output", type=Path, default=None)
+    args = parser.parse_args()
+
+    trace = load_trace(path=args.trace)
+    run_id = uuid.uuid4().hex[:8]
+    users = await seed(
+        run_id=run_id, users=args.users, todos_per_user=args.todos_per_user
+    )
+
+    if args.base_url is None:
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app, raise_app_exceptions=False),
+            base_url="http://bench",
+        )
+    else:
+        client = httpx.AsyncClient(base_url=args.base_url)
+
+    try:
+        async with client:
+            latencies, errors, elapsed = await replay(
+                client=client,
+                trace=trace,
+                users=users,
+                requests=args.requests,
+                concurrency=args.concurrency,
+            )
+    finally:
+        await cleanup(user_ids=list(users))
+
+    all_latencies = list(itertools.chain.from_iterable(latencies.values()))
+    results = {
+        "commit": get_commit(),
+        "started_at": datetime.now(tz=timezone.utc).isoformat(),
+        "trace": str(args.trace),
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "users": args.users,
+            "todos_per_user": args.todos_per_user,
+            "base_url": args.base_url,
+        },
+        "elapsed_s": elapsed,
+        "throughput_rps": len(all_latencies) / elapsed,
+        "total": summarise(
+            latencies=all_latencies, errors=sum(errors.values())
+        ),
+        "routes": {
+            route: summarise(latencies=values, errors=errors[route])
+            for route, values in sorted(latencies.items())
+        },
+    }
+
+    output = args.output or RESULTS_DIRECTORY / (
+        f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_"
+        f"{results['commit'] or run_id}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+
+    print(
+        f"{'route':<32} {'requests':>8} {'errors':>6} "
+        f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}"
+    )
+
+    for route, summary in {
+        **results["routes"],
+        "total": results["total"],
+    }.items():
+        print(
+            f"{route:<32} {summary['requests']:>8} {summary['errors']:>6} "
+            f"{summary['p50_ms']:>8.2f} {summary['p95_ms']:>8.2f} "
+            f"{summary['p99_ms']:>8.2f}"
+        )
+
+    print(f"throughput: {results['throughput_rps']:.0f} req/s, saved {output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
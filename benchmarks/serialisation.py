@@ -0,0 +1,129 @@
+"""
+The micro-benchmark of the `todo` response serialisation.
+
+It compares the per-row cost of building `TodoResponse` models from ORM
+objects, validating them again through the response model and encoding
+them with the standard JSON encoder, with projecting the columns into
+dicts and encoding them with `orjson`. No database is needed:
+
+    python -m benchmarks.serialisation --rows 1000
+"""
+
+import argparse
+import json
+import time
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.utils import create_response_field
+
+from src.models import Priority, Todo, User
+from src.schemas import (
+    TodoResponse,
+    UserSummaryResponse,
+    get_todo_response_dict,
+)
+
+
+def make_rows(rows: int) -> list[tuple[Todo, User]]:
+    """
+    The function returns `todos` with their owners as loaded by the ORM.
+    """
+    owner = User(user_id=1, email="lebron.james@gmail.com", username="lebron")
+
+    return [
+        (
+            Todo(
+                todo_id=index,
+                title=f"Benchmark task {index}",
+                description=f"Replay the benchmark report {index}",
+                priority=Priority(index % 5 + 1),
+                complete=index % 2 == 0,
+                owner_id=owner.user_id,
+            ),
+            owner,
+        )
+        for index in range(rows)
+    ]
+
+
+def serialise_models(rows: list[tuple[Todo, User]]) -> bytes:
+    """
+    The function serialises the rows the way the endpoints used to.
+    """
+    todos = [
+        TodoResponse(
+            **todo.__dict__, owner=UserSummaryResponse(**owner.__dict__)
+        )
+        for todo, owner in rows
+    ]
+    value, errors = RESPONSE_FIELD.validate(todos, {}, loc=("response",))
+
+    return json.dumps(jsonable_encoder(value)).encode()
+
+
+def serialise_projection(rows: list[tuple]) -> bytes:
+    """
+    The function serialises projected rows through the fast path.
+    """
+    return orjson.dumps([get_todo_response_dict(*row) for row in rows])
+
+
+RESPONSE_FIELD = create_response_field(
+    name="response", type_=list[TodoResponse]
+)
+
+
+def bench(function, rows: list, iterations: int) -> float:
+    """
+    The function returns the mean cost of the `function` per row
+    in microseconds.
+    """
+    function(rows)
+
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        function(rows)
+    elapsed = time.perf_counter() - started_at
+
+    return elapsed / iterations / len(rows) * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = make_rows(rows=args.rows)
+    projected_rows = [
+        (
+            todo.todo_id,
+            todo.title,
+            todo.description,
+            todo.priority,
+            todo.complete,
+            owner.user_id,
+            owner.email,
+            owner.username,
+        )
+        for todo, owner in rows
+    ]
+
+    assert json.loads(serialise_models(rows)) == json.loads(
+        serialise_projection(projected_rows)
+    )
+
+    models = bench(serialise_models, rows=rows, iterations=args.iterations)
+    projection = bench(
+        serialise_projection, rows=projected_rows, iterations=args.iterations
+    )
+
+    print(
+        f"per row: models {models:.2f} us, projection {projection:.2f} us "
+        f"({models / projection:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
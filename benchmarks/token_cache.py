@@ -0,0 +1,145 @@
+"""
+The benchmark of the verified-token cache of `get_current_user`.
+
+It compares a full `jwt.decode` with a cache hit, and the throughput of
+`GET /todos/` with the cache disabled and enabled, against the database
+configured in the settings, where it registers a throwaway user and
+deletes it afterwards:
+
+    python -m benchmarks.token_cache --requests 2000
+"""
+
+import argparse
+import asyncio
+import time
+import uuid
+
+import httpx
+from sqlalchemy import delete
+
+from src.database import SessionLocal
+from src.main import app
+from src.models import User
+from src.oauth2 import create_access_token, get_current_user, token_cache
+
+
+async def bench_get_current_user(iterations: int) -> dict[str, float]:
+    """
+    The function returns the mean time of `get_current_user` in
+    microseconds with a cold and a warm token cache.
+    """
+    token = create_access_token(username="bench", user_id=1, role="user")
+    max_entries = token_cache.max_entries
+    results = {}
+
+    async with SessionLocal() as db:
+        for name, entries in (("decode", 0), ("cached", max_entries)):
+            token_cache.max_entries = entries
+            await token_cache.clear()
+            await get_current_user(token=token, db=db)
+
+            started_at = time.perf_counter()
+            for _ in range(iterations):
+                await get_current_user(token=token, db=db)
+            elapsed = time.perf_counter() - started_at
+
+            results[name] = elapsed / iterations * 1_000_000
+
+    token_cache.max_entries = max_entries
+
+    return results
+
+
+async def bench_todos(requests: int, concurrency: int) -> dict[str, float]:
+    """
+    The function returns the `GET /todos/` throughput in requests per
+    second with the token cache disabled and enabled.
+    """
+    username = f"bench_{uuid.uuid4().hex[:8]}"
+    password = "P@ssw0rd"
+    max_entries = token_cache.max_entries
+    results = {}
+
+    try:
+        async with httpx.AsyncClient(
+            app=app, base_url="http://bench"
+        ) as client:
+            response = await client.post(
+                url="/auth/",
+                json={
+                    "email": f"{username}@example.com",
+                    "username": username,
+                    "password": password,
+                    "role": "user",
+                    "first_name": "Bench",
+                    "last_name": "Mark",
+                    "phone_number": "+380500000000",
+                },
+            )
+            response.raise_for_status()
+
+            response = await client.post(
+                url="/auth/token",
+                data={"username": username, "password": password},
+            )
+            response.raise_for_status()
+            headers = {
+                "Authorization": f"Bearer {response.json()['access_token']}"
+            }
+
+            async def worker(count: int) -> None:
+                for _ in range(count):
+                    response = await client.get(url="/todos/", headers=headers)
+                    response.raise_for_status()
+
+            for name, entries in (("decode", 0), ("cached", max_entries)):
+                token_cache.max_entries = entries
+                await token_cache.clear()
+                await worker(count=10)
+
+                started_at = time.perf_counter()
+                await asyncio.gather(
+                    *(
+                        worker(count=requests // concurrency)
+                        for _ in range(concurrency)
+                    )
+                )
+                elapsed = time.perf_counter() - started_at
+
+                results[name] = requests // concurrency * concurrency / elapsed
+    finally:
+        token_cache.max_entries = max_entries
+
+        async with SessionLocal() as db:
+            await db.execute(delete(User).where(User.username == username))
+            await db.commit()
+
+    return results
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    timings = await bench_get_current_user(iterations=args.iterations)
+    print(
+        f"get_current_user: decode {timings['decode']:.1f} us, "
+        f"cached {timings['cached']:.1f} us "
+        f"({timings['decode'] / timings['cached']:.1f}x)"
+    )
+
+    throughput = await bench_todos(
+        requests=args.requests, concurrency=args.concurrency
+    )
+    print(
+        f"GET /todos/: decode {throughput['decode']:.0f} req/s, "
+        f"cached {throughput['cached']:.0f} req/s "
+        f"({throughput['cached'] / throughput['decode']:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
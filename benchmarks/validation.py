@@ -0,0 +1,135 @@
+"""
+The micro-benchmark of the request body validation.
+
+It measures the cost of validating the bodies of the write requests
+(`UserCreate`, `TodoCreate` and `AddressCreate`) with typical and with
+maximum-length values, both of the custom field validators alone and of
+the whole model, so that the validators can be compared across commits.
+No database is needed:
+
+    python -m benchmarks.validation --iterations 20000
+"""
+
+import argparse
+import time
+from typing import Callable
+
+from pydantic import BaseModel
+
+from src.schemas import AddressCreate, TodoCreate, UserCreate
+
+PAYLOADS = {
+    "user": (
+        UserCreate,
+        {
+            "email": "lebron.james@gmail.com",
+            "username": "lebron_james",
+            "password": "L3br()nnn",
+            "role": "user",
+            "first_name": "Lebron",
+            "last_name": "James",
+            "phone_number": "+380503184923",
+        },
+    ),
+    "user (max length)": (
+        UserCreate,
+        {
+            "email": "lebron.james@gmail.com",
+            "username": "lebron_james_" + "a" * 17,
+            "password": "L3br()nnn" * 8,
+            "role": "user",
+            "first_name": "L" + "e" * 29,
+            "last_name": "J" + "a" * 29,
+            "phone_number": "+380503184923",
+        },
+    ),
+    "todo": (
+        TodoCreate,
+        {
+            "title": "Plan Charity Event",
+            "description": "Coordinate a charity event to support a cause.",
+            "priority": 5,
+            "complete": False,
+        },
+    ),
+    "todo (max length)": (
+        TodoCreate,
+        {
+            "title": "Plan Charity Event, 2026-10-18",
+            "description": "Coordinate a charity event to support a cause. "
+            * 4,
+            "priority": 5,
+            "complete": False,
+        },
+    ),
+    "address": (
+        AddressCreate,
+        {
+            "city": "Kyiv",
+            "state": "Kyiv",
+            "country": "Ukraine",
+            "postal_code": "01001",
+        },
+    ),
+}
+
+
+def get_field_validators(
+    model: type[BaseModel], payload: dict
+) -> list[tuple[Callable[[str], str], str]]:
+    """
+    The function returns the custom validators of the `model` along with
+    the values of the `payload` they validate.
+    """
+    return [
+        (getattr(model, f"validate_{field}"), value)
+        for field, value in payload.items()
+        if hasattr(model, f"validate_{field}")
+    ]
+
+
+def validate_fields(
+    field_validators: list[tuple[Callable[[str], str], str]],
+) -> None:
+    """
+    The function runs the custom validators on their values.
+    """
+    for validator, value in field_validators:
+        validator(value)
+
+
+def bench(function: Callable[[], object], iterations: int) -> float:
+    """
+    The function returns the mean cost of the `function` in microseconds.
+    """
+    function()
+
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        function()
+    elapsed = time.perf_counter() - started_at
+
+    return elapsed / iterations * 1_000_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'payload':<20} {'validators':>12} {'model':>12}")
+
+    for name, (model, payload) in PAYLOADS.items():
+        field_validators = get_field_validators(model=model, payload=payload)
+        validators_cost = bench(
+            lambda: validate_fields(field_validators=field_validators),
+            iterations=args.iterations,
+        )
+        model_cost = bench(
+            lambda: model(**payload), iterations=args.iterations
+        )
+        print(f"{name:<20} {validators_cost:>9.2f} us {model_cost:>9.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+import pickle
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable
+
+from src.config import settings
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:
+    redis_asyncio = None
+
+
+class CacheBackend(ABC):
+    """
+    The base class of the cache storage backends.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None:
+        """
+        The method returns the cached value or `None` on a miss.
+        """
+
+    @abstractmethod
+    async def set(
+        self, key: str, value: Any, ttl: float | None = None
+    ) -> None:
+        """
+        The method stores the `value` under the `key` for `ttl` seconds,
+        or for the default time-to-live of the backend.
+        """
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """
+        The method removes all cached values.
+        """
+
+    def size(self) -> int | None:
+        """
+        The method returns the number of cached values, if known.
+        """
+        return None
+
+
+class InMemoryCache(CacheBackend):
+    """
+    An in-process LRU cache with a time-to-live and a size bound.
+    """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return None
+
+        expires_at, value = entry
+
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+
+        return value
+
+    async def set(
+        self, key: str, value: Any, ttl: float | None = None
+    ) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache(CacheBackend):
+    """
+    A cache shared between workers, stored in Redis.
+    """
+
+    def __init__(
+        self, url: str, ttl: float, prefix: str = "todo-app:"
+    ) -> None:
+        if redis_asyncio is None:
+            raise RuntimeError(
+                "The `redis` package is required for the Redis cache backend."
+            )
+
+        self.ttl = ttl
+        self.prefix = prefix
+        self._client = redis_asyncio.from_url(url)
+
+    async def get(self, key: str) -> Any | None:
+        value = await self._client.get(self.prefix + key)
+
+        return None if value is None else pickle.loads(value)
+
+    async def set(
+        self, key: str, value: Any, ttl: float | None = None
+    ) -> None:
+        await self._client.set(
+            self.prefix + key,
+            pickle.dumps(value),
+            px=int((self.ttl if ttl is None else ttl) * 1000),
+        )
+
+    async def clear(self) -> None:
+        async for key in self._client.scan_iter(match=self.prefix + "*"):
+            await self._client.delete(key)
+
+
+class TodoCache:
+    """
+    The read cache of the `todo` endpoints, keyed by owner.
+
+    Every owner has a generation token that is part of all of their keys,
+    so replacing the token invalidates all of the owner's entries at once.
+    """
+
+    def __init__(self, backend: CacheBackend | None) -> None:
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    async def _get_generation(self, owner_id: int) -> str:
+        """
+        The method returns the owner's current generation token.
+        """
+        generation = await self.backend.get(f"generation:{owner_id}")
+
+        if generation is None:
+            generation = uuid.uuid4().hex
+            await self.backend.set(f"generation:{owner_id}", generation)
+
+        return generation
+
+    async def get_or_load(
+        self,
+        owner_id: int,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        The method returns the owner's cached value, calling the `loader`
+        and caching its result on a miss.
+
+        The generation is read before the `loader` runs, so a value loaded
+        concurrently with an invalidation is stored under the old generation
+        and never served.
+        """
+        if self.backend is None:
+            return await loader()
+
+        generation = await self._get_generation(owner_id=owner_id)
+        cache_key = f"todos:{owner_id}:{generation}:{key}"
+        value = await self.backend.get(cache_key)
+
+        if value is not None:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = await loader()
+        await self.backend.set(cache_key, value)
+
+        return value
+
+    async def invalidate(self, owner_id: int) -> None:
+        """
+        The method invalidates all cached values of the owner.
+        """
+        if self.backend is None:
+            return
+
+        self.invalidations += 1
+        await self.backend.set(f"generation:{owner_id}", uuid.uuid4().hex)
+
+    async def clear(self) -> None:
+        """
+        The method removes all cached values.
+        """
+        if self.backend is not None:
+            await self.backend.clear()
+
+    def stats(self) -> dict[str, int | str | None]:
+        """
+        The method returns the cache metrics.
+        """
+        return {
+            "backend": type(self.backend).__name__ if self.backend else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "size": None if self.backend is None else self.backend.size(),
+        }
+
+
+def get_cache_backend() -> CacheBackend | None:
+    """
+    The function returns the cache backend configured in the settings.
+    """
+    if settings.TODO_CACHE_BACKEND == "memory":
+        return InMemoryCache(
+            max_entries=settings.TODO_CACHE_MAX_ENTRIES,
+            ttl=settings.TODO_CACHE_TTL,
+        )
+
+    if settings.TODO_CACHE_BACKEND == "redis":
+        return RedisCache(
+            url=settings.TODO_CACHE_REDIS_URL, ttl=settings.TODO_CACHE_TTL
+        )
+
+    return None
+
+
+todo_cache = TodoCache(backend=get_cache_backend())
@@ -7,10 +7,51 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str
     POSTGRES_PORT: str
     POSTGRES_DB: str
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT: float = 30.0
+    DATABASE_POOL_RECYCLE: int = -1
+    DATABASE_POOL_PRE_PING: bool = False
+    DATABASE_REPLICA_URLS: list[str] = []
+    DATABASE_REPLICA_STICKINESS: float = 5.0
+    DATABASE_REPLICA_STICKINESS_BACKEND: str = "memory"
+    DATABASE_REPLICA_STICKINESS_REDIS_URL: str | None = None
+    QUERY_BUDGET_MODE: str = "off"
+    QUERY_BUDGET: int = 20
+    QUERY_BUDGET_MAX_REPEATS: int = 3
+    QUERY_BUDGET_ROUTES: dict[str, int] = {}
 
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE: int
+    REFRESH_TOKEN_EXPIRE: int = 43200
+    TOKEN_REVOCATION_SYNC_INTERVAL: float = 5.0
+    LOGIN_RATE_LIMIT_BACKEND: str = "memory"
+    LOGIN_RATE_LIMIT_WINDOW: float = 60.0
+    LOGIN_RATE_LIMIT_PER_USERNAME: int = 5
+    LOGIN_RATE_LIMIT_PER_CLIENT: int = 20
+    LOGIN_RATE_LIMIT_MAX_KEYS: int = 100000
+    LOGIN_RATE_LIMIT_REDIS_URL: str | None = None
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CACHE_TTL: float = 300.0
+
+    TODOS_PAGE_SIZE: int = 100
+    TODOS_MAX_PAGE_SIZE: int = 1000
+    TODOS_BULK_MAX_ITEMS: int = 1000
+    ADMIN_TODOS_STREAM_BATCH: int = 500
+    ADMIN_STATS_PAGE_SIZE: int = 100
+    ADMIN_STATS_MAX_PAGE_SIZE: int = 1000
+    USER_IMPORT_BATCH_SIZE: int = 500
+    USER_IMPORT_MAX_LINE_LENGTH: int = 65536
+
+    TODO_CACHE_BACKEND: str = "memory"
+    TODO_CACHE_MAX_ENTRIES: int = 10000
+    TODO_CACHE_TTL: float = 30.0
+    TODO_CACHE_REDIS_URL: str | None = None
+
+    PASSWORD_HASHING_EXECUTOR: str = "thread"
+    PASSWORD_HASHING_WORKERS: int | None = None
+    PASSWORD_HASHING_MAX_QUEUE: int = 64
 
     class Config:
         env_file = ".env"
@@ -1,29 +1,442 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
-
-from src.config import settings
-
-
-SQLALCHEMY_DATABASE_URL = (
-    f"postgresql://"
-    f"{settings.POSTGRES_USER}:"
-    f"{settings.POSTGRES_PASSWORD}@"
-    f"{settings.POSTGRES_HOST}:"
-    f"{settings.POSTGRES_PORT}/"
-    f"{settings.POSTGRES_DB}"
-)
-
-engine = create_engine(url=SQLALCHEMY_DATABASE_URL)
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-
-def get_db() -> Session:
-    """
-    The function creates and closes a database session.
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+import itertools
+import re
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from typing import AsyncIterator
+
+from sqlalchemy import Engine, event, exc
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    PoolProxiedConnection,
+)
+from sqlalchemy.util import await_only
+from sqlalchemy.util.queue import AsyncAdaptedQueue
+
+from src.config import settings
+from src.metrics import registry
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:
+    redis_asyncio = None
+
+SQLALCHEMY_DATABASE_URL = (
+    f"postgresql://"
+    f"{settings.POSTGRES_USER}:"
+    f"{settings.POSTGRES_PASSWORD}@"
+    f"{settings.POSTGRES_HOST}:"
+    f"{settings.POSTGRES_PORT}/"
+    f"{settings.POSTGRES_DB}"
+)
+
+SQLALCHEMY_ASYNC_DATABASE_URL = SQLALCHEMY_DATABASE_URL.replace(
+    "postgresql://", "postgresql+asyncpg://", 1
+)
+
+pool_checkouts = registry.counter(
+    name="db_pool_checkouts_total",
+    documentation="The number of connections checked out from the pool.",
+    label_names=("engine",),
+)
+pool_timeouts = registry.counter(
+    name="db_pool_timeouts_total",
+    documentation="The number of checkouts that timed out.",
+    label_names=("engine",),
+)
+pool_wait_seconds = registry.histogram(
+    name="db_pool_wait_seconds",
+    documentation="The time the checkouts at the overflow limit spent waiting "
+    "for an idle connection, excluding connecting and the pre-ping.",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+    label_names=("engine",),
+)
+pool_checked_out = registry.gauge(
+    name="db_pool_checked_out",
+    documentation="The number of connections currently checked out.",
+    label_names=("engine",),
+)
+pool_overflow = registry.gauge(
+    name="db_pool_overflow",
+    documentation="The number of overflow connections currently open.",
+    label_names=("engine",),
+)
+db_queries = registry.counter(
+    name="db_queries_total",
+    documentation="The number of executed database queries.",
+).labels()
+
+
+class InstrumentedQueue(AsyncAdaptedQueue):
+    """
+    The queue of the idle connections of the `InstrumentedPool`, which
+    records how long the checkouts wait for one.
+
+    A checkout only blocks on the queue once the pool has reached its
+    overflow limit; before that it opens a new connection instead. Opening
+    connections and the pre-ping both happen outside of the queue, so
+    the recorded time is the queue wait only.
+    """
+
+    engine_name = "default"
+
+    def get(
+        self, block: bool = True, timeout: float | None = None
+    ) -> ConnectionPoolEntry:
+        if not block:
+            return super().get(block=block, timeout=timeout)
+
+        started_at = time.perf_counter()
+
+        try:
+            return super().get(block=block, timeout=timeout)
+        finally:
+            pool_wait_seconds.labels(self.engine_name).observe(
+                time.perf_counter() - started_at
+            )
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    A queue pool that records how long checkouts wait for a connection
+    and how many of them time out.
+
+    The metrics are labelled with the logging name of the pool, which
+    names the engine it belongs to.
+    """
+
+    _queue_class = InstrumentedQueue
+
+    def __init__(self, creator, **kwargs) -> None:
+        super().__init__(creator, **kwargs)
+
+        self.engine_name = self.logging_name or "default"
+        self._pool.engine_name = self.engine_name
+
+    def connect(self) -> PoolProxiedConnection:
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            pool_timeouts.labels(self.engine_name).inc()
+            raise
+
+        pool_checkouts.labels(self.engine_name).inc()
+
+        return connection
+
+
+def get_engine(url: str, name: str = "primary") -> AsyncEngine:
+    """
+    The function creates an asynchronous engine with the configured pool,
+    whose metrics are labelled with the engine `name`.
+    """
+    engine = create_async_engine(
+        url=url.replace("postgresql://", "postgresql+asyncpg://", 1),
+        poolclass=InstrumentedPool,
+        pool_size=settings.DATABASE_POOL_SIZE,
+        max_overflow=settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_pre_ping=settings.DATABASE_POOL_PRE_PING,
+        pool_logging_name=name,
+    )
+
+    for family in (pool_checkouts, pool_timeouts, pool_wait_seconds):
+        family.labels(name)
+
+    pool_checked_out.labels(name).function = lambda: engine.pool.checkedout()
+    pool_overflow.labels(name).function = lambda: engine.pool.overflow()
+
+    return engine
+
+
+engine = get_engine(url=SQLALCHEMY_ASYNC_DATABASE_URL)
+
+SessionLocal = async_sessionmaker(
+    bind=engine, autoflush=False, expire_on_commit=False
+)
+
+
+class QueryStats:
+    """
+    The number, the total duration and the statement shapes of the queries
+    of a request.
+    """
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.duration = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def add(self, statement: str, duration: float) -> None:
+        """
+        The method records an executed `statement`.
+        """
+        self.queries += 1
+        self.duration += duration
+        self.statements[get_statement_shape(statement=statement)] += 1
+
+
+def get_statement_shape(statement: str) -> str:
+    """
+    The function returns the `statement` with its bound parameters and
+    whitespace normalised, so that repeated queries compare equal.
+    """
+    statement = re.sub(r"\$\d+|%\(\w+\)s|\?", "?", statement)
+    statement = re.sub(r"\?(?:\s*,\s*\?)+", "?", statement)
+
+    return " ".join(statement.split())
+
+
+request_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "request_query_stats", default=None
+)
+
+
+def start_query_timer(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    """
+    The function records the start time of a query.
+    """
+    context.query_started_at = time.perf_counter()
+
+
+def stop_query_timer(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    """
+    The function adds the query to the metrics of the current request.
+    """
+    db_queries.inc()
+    query_stats = request_query_stats.get()
+
+    if query_stats is not None:
+        query_stats.add(
+            statement=statement,
+            duration=time.perf_counter() - context.query_started_at,
+        )
+
+
+event.listen(Engine, "before_cursor_execute", start_query_timer)
+event.listen(Engine, "after_cursor_execute", stop_query_timer)
+
+
+class WriteMarkerBackend(ABC):
+    """
+    The base class of the storage backends of the users' last writes.
+    """
+
+    @abstractmethod
+    async def mark(self, user_id: int, ttl: float) -> None:
+        """
+        The method marks a write of the user for `ttl` seconds.
+        """
+
+    @abstractmethod
+    async def is_marked(self, user_id: int) -> bool:
+        """
+        The method checks whether the user has written within the time-to-live
+        of their last mark.
+        """
+
+
+class InMemoryWriteMarker(WriteMarkerBackend):
+    """
+    The last writes of the users, kept in the process.
+
+    The marks are not shared between workers, so a user whose next request
+    is served by another worker can read from a replica that has not caught
+    up with their write. With more than one worker, use the Redis backend.
+    """
+
+    def __init__(self) -> None:
+        self._expires_at: OrderedDict[int, float] = OrderedDict()
+
+    async def mark(self, user_id: int, ttl: float) -> None:
+        now = time.monotonic()
+
+        self._expires_at[user_id] = now + ttl
+        self._expires_at.move_to_end(user_id)
+
+        while (
+            self._expires_at and next(iter(self._expires_at.values())) <= now
+        ):
+            self._expires_at.popitem(last=False)
+
+    async def is_marked(self, user_id: int) -> bool:
+        expires_at = self._expires_at.get(user_id)
+
+        if expires_at is None:
+            return False
+
+        if expires_at <= time.monotonic():
+            del self._expires_at[user_id]
+            return False
+
+        return True
+
+
+class RedisWriteMarker(WriteMarkerBackend):
+    """
+    The last writes of the users shared between workers, stored in Redis
+    as keys that expire with the mark.
+    """
+
+    def __init__(self, url: str, prefix: str = "todo-app:write:") -> None:
+        if redis_asyncio is None:
+            raise RuntimeError(
+                "The `redis` package is required for the Redis write marker "
+                "backend."
+            )
+
+        self.prefix = prefix
+        self._client = redis_asyncio.from_url(url)
+
+    async def mark(self, user_id: int, ttl: float) -> None:
+        await self._client.set(
+            f"{self.prefix}{user_id}", 1, px=max(int(ttl * 1000), 1)
+        )
+
+    async def is_marked(self, user_id: int) -> bool:
+        return bool(await self._client.exists(f"{self.prefix}{user_id}"))
+
+
+class ReplicaRouter:
+    """
+    The router of read-only sessions to the read replicas.
+
+    Replicas are picked in turn, except for a user who has committed a write
+    within the last `stickiness` seconds, whose reads stay on the primary so
+    that they always see their own writes.
+    """
+
+    def __init__(
+        self,
+        engines: list[AsyncEngine],
+        stickiness: float,
+        backend: WriteMarkerBackend,
+    ) -> None:
+        self.engines = engines
+        self.stickiness = stickiness
+        self.backend = backend
+        self._next_engines = itertools.cycle(engines)
+
+    async def mark_write(self, user_id: int) -> None:
+        """
+        The method pins the user's reads to the primary for a while.
+        There is nothing to pin without replicas.
+        """
+        if self.engines:
+            await self.backend.mark(user_id=user_id, ttl=self.stickiness)
+
+    async def get_engine(
+        self, user_id: int | None = None
+    ) -> AsyncEngine | None:
+        """
+        The method returns the replica engine to read from, or `None` if
+        the read must go to the primary.
+        """
+        if not self.engines:
+            return None
+
+        if user_id is not None and await self.backend.is_marked(
+            user_id=user_id
+        ):
+            return None
+
+        return next(self._next_engines)
+
+
+def get_write_marker_backend() -> WriteMarkerBackend:
+    """
+    The function returns the write marker backend configured in the settings.
+    """
+    if settings.DATABASE_REPLICA_STICKINESS_BACKEND == "redis":
+        return RedisWriteMarker(
+            url=settings.DATABASE_REPLICA_STICKINESS_REDIS_URL
+        )
+
+    return InMemoryWriteMarker()
+
+
+replica_router = ReplicaRouter(
+    engines=[
+        get_engine(url=url, name=f"replica-{index}")
+        for index, url in enumerate(settings.DATABASE_REPLICA_URLS, start=1)
+    ],
+    stickiness=settings.DATABASE_REPLICA_STICKINESS,
+    backend=get_write_marker_backend(),
+)
+
+ReadSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+
+
+def mark_user_write(session: Session) -> None:
+    """
+    The function marks a write of the user the session belongs to.
+
+    The hook runs inside the commit of an asynchronous session, so the mark
+    is stored before the commit returns and the response is sent.
+    """
+    user_id = session.info.get("user_id")
+
+    if user_id is not None:
+        await_only(replica_router.mark_write(user_id=user_id))
+
+
+event.listen(Session, "after_commit", mark_user_write)
+
+
+def get_engine_pool_stats(
+    engine: AsyncEngine,
+) -> dict[str, int | float | dict]:
+    """
+    The function returns the state and the checkout metrics of the pool
+    of the `engine`.
+    """
+    pool = engine.pool
+
+    return {
+        "size": pool.size(),
+        "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "checkouts": pool_checkouts.labels(pool.engine_name).value,
+        "timeouts": pool_timeouts.labels(pool.engine_name).value,
+        "wait_seconds": pool_wait_seconds.labels(pool.engine_name).snapshot(),
+    }
+
+
+def get_pool_stats() -> dict[str, int | float | dict]:
+    """
+    The function returns the state and the checkout metrics of the primary
+    pool, along with those of the replica pools.
+    """
+    return {
+        **get_engine_pool_stats(engine=engine),
+        "replicas": {
+            replica_engine.pool.engine_name: get_engine_pool_stats(
+                engine=replica_engine
+            )
+            for replica_engine in replica_router.engines
+        },
+    }
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """
+    The function creates and closes an asynchronous database session.
+    """
+    async with SessionLocal() as db:
+        yield db
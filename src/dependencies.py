@@ -1,11 +1,104 @@
-from typing import Annotated
+from typing import Annotated, AsyncIterator
 
-from fastapi import Depends
-from sqlalchemy.orm import Session
+from fastapi import Depends, Query, Request
+from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.database import get_db
+from src.database import ReadSessionLocal, get_db, replica_router
 from src.oauth2 import get_current_user
+from src.rate_limit import login_rate_limiter
+from src.schemas import TodoField, TodoFilter, TodoSort, TokenPayload
 
+TODO_FIELDS_PATTERN = "|".join(field.value for field in TodoField)
 
-db_dependency = Annotated[Session, Depends(get_db)]
+
+async def get_read_db(
+    user: Annotated[TokenPayload, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> AsyncIterator[AsyncSession]:
+    """
+    The function creates and closes a read-only session on a replica,
+    falling back to the primary session when there are no replicas
+    or the user has just written.
+    """
+    replica_engine = await replica_router.get_engine(user_id=user.user_id)
+
+    if replica_engine is None:
+        yield db
+        return
+
+    async with ReadSessionLocal(bind=replica_engine) as read_db:
+        yield read_db
+
+
+async def check_login_rate_limit(
+    request: Request,
+    form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
+) -> None:
+    """
+    The function rejects the login attempt if the client or the username
+    is over its rate limit, before any database or password work is done.
+    """
+    await login_rate_limiter.check(
+        username=form_data.username,
+        client=request.client.host if request.client else None,
+    )
+
+
+def get_user_include(
+    include: str | None = Query(
+        default=None, regex=r"^(todos|address)(,(todos|address))*$"
+    ),
+) -> set[str]:
+    """
+    The function returns the relations of the `user` to expand,
+    given as a comma-separated `include` query parameter.
+    """
+    return set(include.split(",")) if include else set()
+
+
+def get_todo_fields(
+    fields: str | None = Query(
+        default=None,
+        regex=rf"^({TODO_FIELDS_PATTERN})(,({TODO_FIELDS_PATTERN}))*$",
+    ),
+) -> list[TodoField] | None:
+    """
+    The function returns the `todo` fields to respond with, given as
+    a comma-separated `fields` query parameter, or `None` for all fields.
+    """
+    if not fields:
+        return None
+
+    requested_fields = set(fields.split(","))
+
+    return [field for field in TodoField if field.value in requested_fields]
+
+
+def get_todo_filter(
+    complete: bool | None = Query(default=None),
+    priority: int | None = Query(default=None, ge=1, le=5),
+    priority_min: int | None = Query(default=None, ge=1, le=5),
+    priority_max: int | None = Query(default=None, ge=1, le=5),
+    sort: TodoSort = Query(default=TodoSort.todo_id),
+) -> TodoFilter:
+    """
+    The function returns a `TodoFilter` built from the query parameters.
+    """
+    return TodoFilter(
+        complete=complete,
+        priority=priority,
+        priority_min=priority_min,
+        priority_max=priority_max,
+        sort=sort,
+    )
+
+
+db_dependency = Annotated[AsyncSession, Depends(get_db)]
+read_db_dependency = Annotated[AsyncSession, Depends(get_read_db)]
 user_dependency = Annotated[dict, Depends(get_current_user)]
+todo_filter_dependency = Annotated[TodoFilter, Depends(get_todo_filter)]
+user_include_dependency = Annotated[set[str], Depends(get_user_include)]
+todo_fields_dependency = Annotated[
+    list[TodoField] | None, Depends(get_todo_fields)
+]
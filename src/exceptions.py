@@ -132,3 +132,26 @@ class PostalCodeFormatException(HTTPException):
         super().__init__(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail
         )
+
+
+class TodoBatchFormatException(HTTPException):
+    """
+    A custom exception is raised when the `todo` batch has an incorrect format.
+    """
+
+    def __init__(self, detail: str) -> None:
+        self.detail = detail
+        super().__init__(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=detail
+        )
+
+
+class QueryBudgetException(Exception):
+    """
+    A custom exception is raised when a request exceeds its query budget
+    or repeats the same statement, which usually means an N+1 pattern.
+    """
+
+    def __init__(self, detail: str) -> None:
+        self.detail = detail
+        super().__init__(detail)
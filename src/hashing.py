@@ -0,0 +1,206 @@
+import asyncio
+import os
+import time
+from functools import partial
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+
+from src.config import settings
+from src.metrics import registry
+from src.utils import (
+    get_hashed_password,
+    get_password_hashing_unavailable,
+    verify_password,
+)
+
+password_hashing_submitted = registry.counter(
+    name="password_hashing_submitted_total",
+    documentation="The number of password operations submitted to the pool.",
+).labels()
+password_hashing_completed = registry.counter(
+    name="password_hashing_completed_total",
+    documentation="The number of password operations that finished.",
+).labels()
+password_hashing_rejected = registry.counter(
+    name="password_hashing_rejected_total",
+    documentation="The number of password operations rejected because "
+    "the queue was full.",
+).labels()
+password_hashing_busy_seconds = registry.counter(
+    name="password_hashing_busy_seconds_total",
+    documentation="The time the workers spent hashing and verifying "
+    "passwords, excluding the time queued.",
+).labels()
+
+
+def run_timed(function, /, **kwargs) -> tuple[object, float]:
+    """
+    The function runs the `function` and returns its result along with
+    the time it took, measured in the worker.
+    """
+    started_at = time.perf_counter()
+    result = function(**kwargs)
+
+    return result, time.perf_counter() - started_at
+
+
+class PasswordHashingPool:
+    """
+    A bounded worker pool that runs `bcrypt` hashing and verification
+    off the event loop.
+    """
+
+    def __init__(
+        self,
+        executor_type: str = "thread",
+        max_workers: int | None = None,
+        max_queue_size: int = 64,
+    ) -> None:
+        if executor_type not in ("thread", "process"):
+            raise ValueError(
+                "The `executor_type` must be either `thread` or `process`."
+            )
+
+        self.executor_type = executor_type
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue_size = max_queue_size
+
+        self._executor: Executor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._semaphore_loop: asyncio.AbstractEventLoop | None = None
+        self._pending = 0
+        self._submitted = 0
+        self._completed = 0
+        self._rejected = 0
+        self._max_pending = 0
+        self._busy_seconds = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        """
+        The property lazily creates the underlying executor.
+        """
+        if self._executor is None:
+            if self.executor_type == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="password-hashing",
+                )
+
+        return self._executor
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        """
+        The property lazily creates the semaphore that bounds the queue,
+        once per event loop since a semaphore is bound to the loop that
+        first waits on it.
+        """
+        loop = asyncio.get_running_loop()
+
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_queue_size)
+            self._semaphore_loop = loop
+
+        return self._semaphore
+
+    async def _run(self, function, /, wait: bool = False, **kwargs):
+        """
+        The method runs the `function` in the pool. When the queue is
+        already full, the call is rejected or, if `wait` is set, delayed
+        until the queue has room.
+        """
+        semaphore = self.semaphore
+
+        if semaphore.locked() and not wait:
+            self._rejected += 1
+            password_hashing_rejected.inc()
+            raise get_password_hashing_unavailable()
+
+        await semaphore.acquire()
+
+        try:
+            self._pending += 1
+            self._submitted += 1
+            self._max_pending = max(self._max_pending, self._pending)
+            password_hashing_submitted.inc()
+
+            try:
+                loop = asyncio.get_running_loop()
+                result, busy_seconds = await loop.run_in_executor(
+                    self.executor, partial(run_timed, function, **kwargs)
+                )
+            finally:
+                self._pending -= 1
+                self._completed += 1
+                password_hashing_completed.inc()
+        finally:
+            semaphore.release()
+
+        self._busy_seconds += busy_seconds
+        password_hashing_busy_seconds.inc(busy_seconds)
+
+        return result
+
+    async def hash(self, password: str, wait: bool = False) -> str:
+        """
+        The method hashes the user's `password` in the pool, waiting
+        for room in the queue instead of failing if `wait` is set.
+        """
+        return await self._run(
+            get_hashed_password, wait=wait, password=password
+        )
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        The method checks the user's `password` in the pool.
+        """
+        return await self._run(
+            verify_password,
+            plain_password=plain_password,
+            hashed_password=hashed_password,
+        )
+
+    def stats(self) -> dict[str, int | float | str]:
+        """
+        The method returns the pool metrics.
+        """
+        return {
+            "executor_type": self.executor_type,
+            "max_workers": self.max_workers,
+            "max_queue_size": self.max_queue_size,
+            "pending": self._pending,
+            "max_pending": self._max_pending,
+            "submitted": self._submitted,
+            "completed": self._completed,
+            "rejected": self._rejected,
+            "busy_seconds": self._busy_seconds,
+        }
+
+    def shutdown(self) -> None:
+        """
+        The method shuts down the underlying executor.
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hashing_pool = PasswordHashingPool(
+    executor_type=settings.PASSWORD_HASHING_EXECUTOR,
+    max_workers=settings.PASSWORD_HASHING_WORKERS,
+    max_queue_size=settings.PASSWORD_HASHING_MAX_QUEUE,
+)
+
+registry.gauge(
+    name="password_hashing_pending",
+    documentation="The number of password operations queued or running.",
+    function=lambda: password_hashing_pool.stats()["pending"],
+).labels()
@@ -1,7 +1,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from src.routers import admin, address, auth, todo, user
+from src.hashing import password_hashing_pool
+from src.middleware import MetricsMiddleware
+from src.routers import admin, address, auth, internal, metrics, todo, user
 
 app = FastAPI(title="Todo")
 
@@ -13,10 +15,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(router=address.router)
 app.include_router(router=admin.router)
 app.include_router(router=auth.router)
+app.include_router(router=internal.router)
+app.include_router(router=metrics.router)
 app.include_router(router=todo.router)
 app.include_router(router=user.router)
+
+
+@app.on_event("shutdown")
+def shutdown_password_hashing_pool() -> None:
+    """
+    The function shuts down the password hashing pool.
+    """
+    password_hashing_pool.shutdown()
@@ -0,0 +1,277 @@
+import bisect
+import math
+from typing import Callable
+
+
+class Counter:
+    """
+    A monotonically increasing counter.
+    """
+
+    def __init__(self) -> None:
+        self.value = 0
+
+    def inc(self, amount: int | float = 1) -> None:
+        """
+        The method increases the counter by the `amount`.
+        """
+        self.value += amount
+
+
+class Gauge:
+    """
+    A value that goes up and down, or is read from a `function`.
+    """
+
+    def __init__(self, function: Callable[[], float] | None = None) -> None:
+        self.function = function
+        self._value = 0
+
+    @property
+    def value(self) -> int | float:
+        """
+        The property returns the current value of the gauge.
+        """
+        return self._value if self.function is None else self.function()
+
+    def inc(self, amount: int | float = 1) -> None:
+        """
+        The method increases the gauge by the `amount`.
+        """
+        self._value += amount
+
+    def dec(self, amount: int | float = 1) -> None:
+        """
+        The method decreases the gauge by the `amount`.
+        """
+        self._value -= amount
+
+
+class Histogram:
+    """
+    A histogram of observed values over fixed upper bounds.
+    """
+
+    def __init__(self, buckets: tuple[float, ...]) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """
+        The method records the `value` in the first bucket it fits in.
+        """
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> dict[str, float | int | dict[str, int]]:
+        """
+        The method returns the cumulative bucket counts, the sum and
+        the count of the observed values.
+        """
+        cumulative_counts = {}
+        total = 0
+
+        for bucket, count in zip((*self.buckets, "+Inf"), self.counts):
+            total += count
+            cumulative_counts[str(bucket)] = total
+
+        return {
+            "buckets": cumulative_counts,
+            "sum": self.sum,
+            "count": self.count,
+        }
+
+
+class MetricFamily:
+    """
+    A named metric with one child metric per combination of label values.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        metric_type: str,
+        factory: Callable[[], Counter | Gauge | Histogram],
+        label_names: tuple[str, ...] = (),
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.metric_type = metric_type
+        self.factory = factory
+        self.label_names = label_names
+        self._metrics: dict[tuple[str, ...], Counter | Gauge | Histogram] = {}
+
+    def labels(self, *label_values: object) -> Counter | Gauge | Histogram:
+        """
+        The method returns the child metric of the `label_values`.
+        """
+        if len(label_values) != len(self.label_names):
+            raise ValueError(
+                f"The `{self.name}` metric expects the labels "
+                f"{self.label_names}."
+            )
+
+        key = tuple(map(str, label_values))
+        metric = self._metrics.get(key)
+
+        if metric is None:
+            metric = self._metrics[key] = self.factory()
+
+        return metric
+
+    def render(self) -> list[str]:
+        """
+        The method returns the lines of the family in the Prometheus
+        text exposition format.
+        """
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.metric_type}",
+        ]
+
+        for label_values, metric in sorted(self._metrics.items()):
+            labels = dict(zip(self.label_names, label_values))
+
+            if isinstance(metric, Histogram):
+                total = 0
+
+                for bucket, count in zip(
+                    (*metric.buckets, math.inf), metric.counts
+                ):
+                    total += count
+                    lines.append(
+                        f"{self.name}_bucket"
+                        f"{format_labels({**labels, 'le': bucket})} {total}"
+                    )
+
+                lines.append(
+                    f"{self.name}_sum{format_labels(labels)} {metric.sum}"
+                )
+                lines.append(
+                    f"{self.name}_count{format_labels(labels)} {metric.count}"
+                )
+            else:
+                lines.append(
+                    f"{self.name}{format_labels(labels)} {metric.value}"
+                )
+
+        return lines
+
+
+class Registry:
+    """
+    The collection of the metric families exposed by the application.
+    """
+
+    def __init__(self) -> None:
+        self._families: dict[str, MetricFamily] = {}
+
+    def _register(self, family: MetricFamily) -> MetricFamily:
+        """
+        The method adds the `family` to the registry.
+        """
+        if family.name in self._families:
+            raise ValueError(f"The `{family.name}` metric already exists.")
+
+        self._families[family.name] = family
+
+        return family
+
+    def counter(
+        self, name: str, documentation: str, label_names: tuple[str, ...] = ()
+    ) -> MetricFamily:
+        """
+        The method registers a counter family.
+        """
+        return self._register(
+            MetricFamily(
+                name=name,
+                documentation=documentation,
+                metric_type="counter",
+                factory=Counter,
+                label_names=label_names,
+            )
+        )
+
+    def gauge(
+        self,
+        name: str,
+        documentation: str,
+        label_names: tuple[str, ...] = (),
+        function: Callable[[], float] | None = None,
+    ) -> MetricFamily:
+        """
+        The method registers a gauge family.
+        """
+        return self._register(
+            MetricFamily(
+                name=name,
+                documentation=documentation,
+                metric_type="gauge",
+                factory=lambda: Gauge(function=function),
+                label_names=label_names,
+            )
+        )
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        buckets: tuple[float, ...],
+        label_names: tuple[str, ...] = (),
+    ) -> MetricFamily:
+        """
+        The method registers a histogram family.
+        """
+        return self._register(
+            MetricFamily(
+                name=name,
+                documentation=documentation,
+                metric_type="histogram",
+                factory=lambda: Histogram(buckets=buckets),
+                label_names=label_names,
+            )
+        )
+
+    def render(self) -> str:
+        """
+        The method returns all metrics in the Prometheus text exposition
+        format.
+        """
+        lines = []
+
+        for family in self._families.values():
+            lines.extend(family.render())
+
+        return "\n".join(lines) + "\n"
+
+
+def format_labels(labels: dict[str, object]) -> str:
+    """
+    The function formats the `labels` of a Prometheus sample.
+    """
+    if not labels:
+        return ""
+
+    formatted_labels = []
+
+    for name, value in labels.items():
+        if isinstance(value, float) and math.isinf(value):
+            value = "+Inf"
+
+        value = (
+            str(value)
+            .replace("\\", "\\\\")
+            .replace("\n", "\\n")
+            .replace('"', '\\"')
+        )
+        formatted_labels.append(f'{name}="{value}"')
+
+    return "{" + ",".join(formatted_labels) + "}"
+
+
+registry = Registry()
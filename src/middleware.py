@@ -0,0 +1,113 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.database import QueryStats, request_query_stats
+from src.metrics import registry
+from src.query_budget import query_budget
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+http_requests = registry.counter(
+    name="http_requests_total",
+    documentation="The number of handled HTTP requests.",
+    label_names=("method", "route", "status"),
+)
+http_requests_in_progress = registry.gauge(
+    name="http_requests_in_progress",
+    documentation="The number of HTTP requests being handled.",
+    label_names=("method",),
+)
+http_request_duration_seconds = registry.histogram(
+    name="http_request_duration_seconds",
+    documentation="The time spent handling HTTP requests.",
+    buckets=LATENCY_BUCKETS,
+    label_names=("method", "route", "status"),
+)
+http_request_db_queries = registry.histogram(
+    name="http_request_db_queries",
+    documentation="The number of database queries per HTTP request.",
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+    label_names=("method", "route"),
+)
+http_request_db_duration_seconds = registry.histogram(
+    name="http_request_db_duration_seconds",
+    documentation="The time spent in database queries per HTTP request.",
+    buckets=LATENCY_BUCKETS,
+    label_names=("method", "route"),
+)
+
+
+def get_route_path(scope: Scope) -> str:
+    """
+    The function returns the template of the route that handled
+    the request.
+    """
+    return getattr(scope.get("route"), "path", "unmatched")
+
+
+class MetricsMiddleware:
+    """
+    A pure ASGI middleware that records the request count, the requests
+    in progress, the latency and the database queries of every request,
+    labelled by the route template rather than the raw path.
+
+    Requests that complete are also checked against the query budget,
+    right before the last part of the response body is sent. The status
+    and the headers are sent by then, so in the `raise` mode a violation
+    aborts the response instead of changing its status, which the client
+    sees as a failed request rather than a complete one.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body" and not message.get(
+                "more_body", False
+            ):
+                query_budget.check(
+                    query_stats=query_stats, route=get_route_path(scope)
+                )
+
+            await send(message)
+
+        in_progress = http_requests_in_progress.labels(method)
+        in_progress.inc()
+        query_stats = QueryStats()
+        token = request_query_stats.set(query_stats)
+        started_at = time.perf_counter()
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - started_at
+            request_query_stats.reset(token)
+            in_progress.dec()
+
+            route_path = get_route_path(scope)
+
+            http_requests.labels(method, route_path, status_code).inc()
+            http_request_duration_seconds.labels(
+                method, route_path, status_code
+            ).observe(duration)
+            http_request_db_queries.labels(method, route_path).observe(
+                query_stats.queries
+            )
+            http_request_db_duration_seconds.labels(
+                method, route_path
+            ).observe(query_stats.duration)
@@ -1,6 +1,20 @@
 from enum import Enum
 
-from sqlalchemy import Boolean, Column, ForeignKey, Integer, String, types
+from sqlalchemy import (
+    DDL,
+    Boolean,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    PrimaryKeyConstraint,
+    String,
+    event,
+    literal_column,
+    types,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import declarative_base, relationship
 
 Base = declarative_base()
@@ -31,6 +45,10 @@ class User(Base):
     first_name = Column(String(length=30), nullable=True)
     last_name = Column(String(length=30), nullable=True)
     phone_number = Column(String(length=15), nullable=True)
+    todos_version = Column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    tokens_valid_after = Column(DateTime(timezone=True), nullable=True)
     address_id = Column(
         Integer,
         ForeignKey("address.address_id", ondelete="CASCADE"),
@@ -61,6 +79,19 @@ class Todo(Base):
 
     owner = relationship("User", back_populates="todos")
 
+    __table_args__ = (
+        Index("ix_todo_owner_id_todo_id", "owner_id", "todo_id"),
+        Index(
+            "ix_todo_owner_id_complete_priority",
+            "owner_id",
+            "complete",
+            "priority",
+            "todo_id",
+        ),
+        Index("ix_todo_owner_id_priority", "owner_id", "priority", "todo_id"),
+        Index("ix_todo_owner_id_title", "owner_id", "title", "todo_id"),
+    )
+
     def __repr__(self) -> str:
         """
         The method returns a string representation of the `Todo` instance class model.
@@ -68,6 +99,273 @@ class Todo(Base):
         return f"Todo(todo_id={self.todo_id}, title={self.title})"
 
 
+# The full-text search column only exists on PostgreSQL, so it is added
+# outside of the mapped columns and referenced through `TODO_SEARCH_VECTOR`.
+TODO_SEARCH_VECTOR = literal_column("todo.search_vector", type_=TSVECTOR)
+
+event.listen(
+    Todo.__table__,
+    "after_create",
+    DDL(
+        "ALTER TABLE todo ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS ("
+        "to_tsvector('english', title || ' ' || description)"
+        ") STORED"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    Todo.__table__,
+    "after_create",
+    DDL(
+        "CREATE INDEX ix_todo_search_vector ON todo USING gin (search_vector)"
+    ).execute_if(dialect="postgresql"),
+)
+
+# `User.todos_version` is bumped by statement-level triggers, so that every
+# write to the `todo` table (including bulk, batch and cascade deletes)
+# changes the version of the affected owners within the same transaction.
+TODOS_VERSION_FUNCTION = """
+CREATE FUNCTION bump_todos_version() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE "user" SET todos_version = todos_version + 1
+        WHERE user_id IN (SELECT owner_id FROM new_todos);
+    ELSIF TG_OP = 'UPDATE' THEN
+        UPDATE "user" SET todos_version = todos_version + 1
+        WHERE user_id IN (
+            SELECT owner_id FROM new_todos
+            UNION SELECT owner_id FROM old_todos
+        );
+    ELSE
+        UPDATE "user" SET todos_version = todos_version + 1
+        WHERE user_id IN (SELECT owner_id FROM old_todos);
+    END IF;
+
+    RETURN NULL;
+END;
+$$
+"""
+
+# The transition tables of the statement-level triggers on the `todo` table.
+TODO_TRANSITION_TABLES = {
+    "INSERT": "REFERENCING NEW TABLE AS new_todos",
+    "UPDATE": "REFERENCING NEW TABLE AS new_todos OLD TABLE AS old_todos",
+    "DELETE": "REFERENCING OLD TABLE AS old_todos",
+}
+
+event.listen(
+    Todo.__table__,
+    "after_create",
+    DDL(TODOS_VERSION_FUNCTION).execute_if(dialect="postgresql"),
+)
+
+for operation, transition_tables in TODO_TRANSITION_TABLES.items():
+    event.listen(
+        Todo.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TRIGGER todo_{operation.lower()}_todos_version "
+            f"AFTER {operation} ON todo {transition_tables} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION bump_todos_version()"
+        ).execute_if(dialect="postgresql"),
+    )
+
+event.listen(
+    Todo.__table__,
+    "before_drop",
+    DDL("DROP FUNCTION IF EXISTS bump_todos_version() CASCADE").execute_if(
+        dialect="postgresql"
+    ),
+)
+
+
+class TodoStats(Base):
+    __tablename__ = "todo_stats"
+
+    owner_id = Column(
+        Integer, ForeignKey("user.user_id", ondelete="CASCADE"), nullable=False
+    )
+    priority = Column(types.Enum(Priority), nullable=False)
+    complete = Column(Boolean, nullable=False)
+    count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        PrimaryKeyConstraint("owner_id", "priority", "complete"),
+    )
+
+    def __repr__(self) -> str:
+        """
+        The method returns a string representation of the `TodoStats` instance class model.
+        """
+        return (
+            f"TodoStats(owner_id={self.owner_id!r}, "
+            f"priority={self.priority!r}, "
+            f"complete={self.complete!r}, "
+            f"count={self.count!r})"
+        )
+
+
+# `TodoStats` is kept up to date by statement-level triggers on the `todo`
+# table, which apply the net change in the counts of every statement, so
+# the statistics are read without scanning the `todo` table.
+TODO_STATS_FUNCTION = """
+CREATE FUNCTION update_todo_stats() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO todo_stats (owner_id, priority, complete, count)
+        SELECT owner_id, priority, coalesce(complete, false), count(*)
+        FROM new_todos
+        GROUP BY 1, 2, 3
+        ON CONFLICT (owner_id, priority, complete)
+        DO UPDATE SET count = todo_stats.count + excluded.count;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO todo_stats (owner_id, priority, complete, count)
+        SELECT owner_id, priority, complete, sum(delta)
+        FROM (
+            SELECT owner_id, priority, coalesce(complete, false) AS complete,
+                1 AS delta
+            FROM new_todos
+            UNION ALL
+            SELECT owner_id, priority, coalesce(complete, false), -1
+            FROM old_todos
+        ) AS changes
+        GROUP BY 1, 2, 3
+        HAVING sum(delta) <> 0
+        ON CONFLICT (owner_id, priority, complete)
+        DO UPDATE SET count = todo_stats.count + excluded.count;
+    ELSE
+        UPDATE todo_stats SET count = todo_stats.count - deleted.count
+        FROM (
+            SELECT owner_id, priority, coalesce(complete, false) AS complete,
+                count(*) AS count
+            FROM old_todos
+            GROUP BY 1, 2, 3
+        ) AS deleted
+        WHERE todo_stats.owner_id = deleted.owner_id
+            AND todo_stats.priority = deleted.priority
+            AND todo_stats.complete = deleted.complete;
+    END IF;
+
+    RETURN NULL;
+END;
+$$
+"""
+
+event.listen(
+    Todo.__table__,
+    "after_create",
+    DDL(TODO_STATS_FUNCTION).execute_if(dialect="postgresql"),
+)
+
+for operation, transition_tables in TODO_TRANSITION_TABLES.items():
+    event.listen(
+        Todo.__table__,
+        "after_create",
+        DDL(
+            f"CREATE TRIGGER todo_{operation.lower()}_todo_stats "
+            f"AFTER {operation} ON todo {transition_tables} "
+            f"FOR EACH STATEMENT EXECUTE FUNCTION update_todo_stats()"
+        ).execute_if(dialect="postgresql"),
+    )
+
+event.listen(
+    Todo.__table__,
+    "before_drop",
+    DDL("DROP FUNCTION IF EXISTS update_todo_stats() CASCADE").execute_if(
+        dialect="postgresql"
+    ),
+)
+
+
+# The number of `TodoStatsTotal` rows per `priority` and `complete` pair,
+# which spreads the concurrent updates of the overall counts over several
+# rows while keeping them readable in a bounded number of rows.
+TODO_STATS_SHARDS = 16
+
+
+class TodoStatsTotal(Base):
+    __tablename__ = "todo_stats_total"
+
+    shard = Column(Integer, nullable=False)
+    priority = Column(types.Enum(Priority), nullable=False)
+    complete = Column(Boolean, nullable=False)
+    count = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (PrimaryKeyConstraint("shard", "priority", "complete"),)
+
+    def __repr__(self) -> str:
+        """
+        The method returns a string representation of the `TodoStatsTotal` instance class model.
+        """
+        return (
+            f"TodoStatsTotal(shard={self.shard!r}, "
+            f"priority={self.priority!r}, "
+            f"complete={self.complete!r}, "
+            f"count={self.count!r})"
+        )
+
+
+# `TodoStatsTotal` is kept up to date by a row-level trigger on the
+# `todo_stats` table, which adds the change in the count of every row to
+# the shard of its owner, including the rows deleted along with a user.
+TODO_STATS_TOTAL_FUNCTION = f"""
+CREATE FUNCTION update_todo_stats_total() RETURNS trigger
+LANGUAGE plpgsql AS $$
+DECLARE
+    stats todo_stats;
+    delta integer;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        stats := NEW;
+        delta := NEW.count;
+    ELSIF TG_OP = 'UPDATE' THEN
+        stats := NEW;
+        delta := NEW.count - OLD.count;
+    ELSE
+        stats := OLD;
+        delta := -OLD.count;
+    END IF;
+
+    INSERT INTO todo_stats_total (shard, priority, complete, count)
+    VALUES (
+        mod(stats.owner_id, {TODO_STATS_SHARDS}),
+        stats.priority,
+        stats.complete,
+        delta
+    )
+    ON CONFLICT (shard, priority, complete)
+    DO UPDATE SET count = todo_stats_total.count + excluded.count;
+
+    RETURN NULL;
+END;
+$$
+"""
+
+event.listen(
+    TodoStats.__table__,
+    "after_create",
+    DDL(TODO_STATS_TOTAL_FUNCTION).execute_if(dialect="postgresql"),
+)
+event.listen(
+    TodoStats.__table__,
+    "after_create",
+    DDL(
+        "CREATE TRIGGER todo_stats_total "
+        "AFTER INSERT OR UPDATE OR DELETE ON todo_stats "
+        "FOR EACH ROW EXECUTE FUNCTION update_todo_stats_total()"
+    ).execute_if(dialect="postgresql"),
+)
+event.listen(
+    TodoStats.__table__,
+    "before_drop",
+    DDL(
+        "DROP FUNCTION IF EXISTS update_todo_stats_total() CASCADE"
+    ).execute_if(dialect="postgresql"),
+)
+
+
 class Address(Base):
     __tablename__ = "address"
 
@@ -89,3 +387,19 @@ class Address(Base):
             f"state={self.state!r}, "
             f"country={self.country!r})"
         )
+
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_token"
+
+    jti = Column(String(length=32), primary_key=True)
+    user_id = Column(
+        Integer, ForeignKey("user.user_id", ondelete="CASCADE"), nullable=False
+    )
+    expires_at = Column(DateTime(timezone=True), index=True, nullable=False)
+
+    def __repr__(self) -> str:
+        """
+        The method returns a string representation of the `RevokedToken` instance class model.
+        """
+        return f"RevokedToken(jti={self.jti!r}, user_id={self.user_id!r})"
@@ -1,30 +1,45 @@
+import hashlib
+import time
+import uuid
 from datetime import timedelta, datetime
 
 from fastapi import Depends
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.cache import InMemoryCache
 from src.config import settings
+from src.database import get_db
+from src.hashing import password_hashing_pool
 from src.models import User
+from src.revocation import token_revocation_list
 from src.schemas import TokenPayload
-from src.utils import verify_password, get_credentials_exception
+from src.utils import get_credentials_exception
 
 ACCESS_TOKEN_EXPIRE = settings.ACCESS_TOKEN_EXPIRE
+REFRESH_TOKEN_EXPIRE = settings.REFRESH_TOKEN_EXPIRE
 ALGORITHM = settings.ALGORITHM
 SECRET_KEY = settings.SECRET_KEY
 
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl="auth/token")
 
+token_cache = InMemoryCache(
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+    ttl=settings.TOKEN_CACHE_TTL,
+)
 
-def authenticate_user(username: str, password: str, db) -> bool:
+
+async def authenticate_user(username: str, password: str, db) -> bool:
     """
     The function checks whether the `user` is authenticated.
     """
-    user = db.query(User).filter(User.username == username).first()
+    user = await db.scalar(select(User).filter(User.username == username))
 
     if not user:
         return False
-    if not verify_password(
+    if not await password_hashing_pool.verify(
         plain_password=password, hashed_password=user.password
     ):
         return False
@@ -32,6 +47,29 @@ def authenticate_user(username: str, password: str, db) -> bool:
     return True
 
 
+def create_token(
+    token_type: str,
+    username: str,
+    user_id: int,
+    role: str,
+    expires_delta: timedelta,
+) -> str:
+    """
+    The function creates a token of the `token_type` with a unique `jti`.
+    """
+    encode = {
+        "sub": username,
+        "user_id": user_id,
+        "role": role,
+        "type": token_type,
+        "jti": uuid.uuid4().hex,
+        "iat": time.time(),
+        "exp": datetime.utcnow() + expires_delta,
+    }
+
+    return jwt.encode(encode, SECRET_KEY, algorithm=ALGORITHM)
+
+
 def create_access_token(
     username: str,
     user_id: int,
@@ -41,30 +79,118 @@ def create_access_token(
     """
     The function creates an `access token`.
     """
-    encode = {"sub": username, "user_id": user_id, "role": role}
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE)
+    return create_token(
+        token_type="access",
+        username=username,
+        user_id=user_id,
+        role=role,
+        expires_delta=expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE),
+    )
 
-    encode.update({"exp": expire})
 
-    return jwt.encode(encode, SECRET_KEY, algorithm=ALGORITHM)
+def create_refresh_token(
+    username: str,
+    user_id: int,
+    role: str,
+    expires_delta: timedelta | None = None,
+) -> str:
+    """
+    The function creates a `refresh token`.
+    """
+    return create_token(
+        token_type="refresh",
+        username=username,
+        user_id=user_id,
+        role=role,
+        expires_delta=expires_delta or timedelta(minutes=REFRESH_TOKEN_EXPIRE),
+    )
 
 
-async def get_current_user(token: str = Depends(oauth2_bearer)):
+def decode_token(token: str, token_type: str) -> TokenPayload:
     """
-    The function returns a `TokenPayload` schema of the user.
+    The function verifies the token of the `token_type` and returns
+    its `TokenPayload` schema.
     """
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username: str = payload.get("sub")
-        user_id: int = payload.get("user_id")
-        role: str = payload.get("role")
+    except JWTError:
+        raise get_credentials_exception()
+
+    username: str = payload.get("sub")
+    user_id: int = payload.get("user_id")
+    role: str = payload.get("role")
+    jti: str = payload.get("jti")
+    issued_at: float = payload.get("iat")
+    expires_at: float = payload.get("exp")
+
+    if (
+        username is None
+        or user_id is None
+        or jti is None
+        or issued_at is None
+        or expires_at is None
+        or payload.get("type") != token_type
+    ):
+        raise get_credentials_exception()
 
-        if username is None or user_id is None:
-            raise get_credentials_exception()
+    return TokenPayload(
+        username=username,
+        user_id=user_id,
+        role=role,
+        jti=jti,
+        issued_at=issued_at,
+        expires_at=expires_at,
+    )
 
-        return TokenPayload(username=username, user_id=user_id, role=role)
-    except JWTError:
+
+async def check_token_revocation(
+    token_payload: TokenPayload, db: AsyncSession
+) -> None:
+    """
+    The function rejects the token if it has been revoked, syncing the
+    revocation list from the database when it is stale.
+    """
+    if token_revocation_list.is_stale():
+        await token_revocation_list.sync(db=db)
+
+    if token_revocation_list.is_revoked(
+        jti=token_payload.jti,
+        user_id=token_payload.user_id,
+        issued_at=token_payload.issued_at,
+    ):
         raise get_credentials_exception()
+
+
+async def get_current_user(
+    token: str = Depends(oauth2_bearer),
+    db: AsyncSession = Depends(get_db),
+) -> TokenPayload:
+    """
+    The function returns a `TokenPayload` schema of the user.
+
+    Verified tokens are cached by their digest until they expire,
+    so repeated requests with the same token skip `jwt.decode`.
+    The revocation check runs on every request, cached or not.
+    The session is tagged with the user, so that its commits pin
+    the user's reads to the primary database.
+    """
+    token_digest = hashlib.sha256(token.encode()).hexdigest()
+    token_payload = await token_cache.get(token_digest)
+
+    if token_payload is None:
+        token_payload = decode_token(token=token, token_type="access")
+
+        if token_cache.max_entries > 0:
+            await token_cache.set(
+                token_digest,
+                token_payload,
+                ttl=min(
+                    token_cache.ttl, token_payload.expires_at - time.time()
+                ),
+            )
+
+    await check_token_revocation(token_payload=token_payload, db=db)
+
+    db.info["user_id"] = token_payload.user_id
+
+    return token_payload
@@ -0,0 +1,40 @@
+import base64
+import binascii
+import json
+from typing import Any
+
+from src.utils import get_invalid_cursor
+
+
+def encode_cursor(values: dict[str, Any]) -> str:
+    """
+    The function encodes the keyset `values` into an opaque cursor.
+    """
+    payload = json.dumps(values, separators=(",", ":")).encode()
+
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str, keys: dict[str, type]) -> dict[str, Any]:
+    """
+    The function decodes an opaque cursor back into the keyset values
+    and checks that every value has the expected type.
+    """
+    padding = "=" * (-len(cursor) % 4)
+
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + padding))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise get_invalid_cursor()
+
+    if not isinstance(values, dict) or values.keys() != keys.keys():
+        raise get_invalid_cursor()
+
+    if not all(
+        isinstance(values[key], value_type)
+        and not isinstance(values[key], bool)
+        for key, value_type in keys.items()
+    ):
+        raise get_invalid_cursor()
+
+    return values
@@ -0,0 +1,86 @@
+import logging
+
+from src.config import settings
+from src.database import QueryStats
+from src.exceptions import QueryBudgetException
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudget:
+    """
+    The per-request limit on the number of queries and on the repeats of
+    the same statement shape, which catches N+1 patterns.
+
+    In the `log` mode a violation is logged as a warning, in the `raise`
+    mode it raises a `QueryBudgetException`, and in the `off` mode
+    nothing is checked.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        max_queries: int,
+        max_repeats: int,
+        route_max_queries: dict[str, int] | None = None,
+    ) -> None:
+        if mode not in ("off", "log", "raise"):
+            raise ValueError(
+                "The `mode` must be either `off`, `log` or `raise`."
+            )
+
+        self.mode = mode
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self.route_max_queries = route_max_queries or {}
+
+    def get_violations(self, query_stats: QueryStats, route: str) -> list[str]:
+        """
+        The method returns the descriptions of the budget violations
+        of the request.
+        """
+        violations = []
+        max_queries = self.route_max_queries.get(route, self.max_queries)
+
+        if query_stats.queries > max_queries:
+            violations.append(
+                f"{route} executed {query_stats.queries} queries, "
+                f"the budget is {max_queries}."
+            )
+
+        for statement, count in query_stats.statements.most_common():
+            if count <= self.max_repeats:
+                break
+
+            violations.append(
+                f"{route} executed the same statement {count} times, "
+                f"a likely N+1 query: {statement}"
+            )
+
+        return violations
+
+    def check(self, query_stats: QueryStats, route: str) -> None:
+        """
+        The method logs or raises the budget violations of the request.
+        """
+        if self.mode == "off":
+            return
+
+        violations = self.get_violations(query_stats=query_stats, route=route)
+
+        if not violations:
+            return
+
+        if self.mode == "raise":
+            raise QueryBudgetException(detail=" ".join(violations))
+
+        for violation in violations:
+            logger.warning(violation)
+
+
+query_budget = QueryBudget(
+    mode=settings.QUERY_BUDGET_MODE,
+    max_queries=settings.QUERY_BUDGET,
+    max_repeats=settings.QUERY_BUDGET_MAX_REPEATS,
+    route_max_queries=settings.QUERY_BUDGET_ROUTES,
+)
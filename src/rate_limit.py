@@ -0,0 +1,212 @@
+import math
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict, deque
+
+from src.config import settings
+from src.utils import get_too_many_requests
+
+try:
+    from redis import asyncio as redis_asyncio
+except ImportError:
+    redis_asyncio = None
+
+
+class RateLimitBackend(ABC):
+    """
+    The base class of the sliding-window rate limit storage backends.
+    """
+
+    @abstractmethod
+    async def hit(self, key: str, limit: int, window: float) -> float | None:
+        """
+        The method records an attempt under the `key` if fewer than `limit`
+        attempts were made within the last `window` seconds, otherwise
+        it returns the number of seconds until the next attempt is allowed.
+        """
+
+    @abstractmethod
+    async def reset(self, key: str) -> None:
+        """
+        The method forgets all attempts recorded under the `key`.
+        """
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """
+        The method forgets all recorded attempts.
+        """
+
+
+class InMemoryRateLimit(RateLimitBackend):
+    """
+    An in-process sliding-window log with a bound on the number of keys.
+    """
+
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self._attempts: OrderedDict[str, deque[float]] = OrderedDict()
+
+    async def hit(self, key: str, limit: int, window: float) -> float | None:
+        now = time.monotonic()
+        attempts = self._attempts.get(key)
+
+        if attempts is None:
+            attempts = self._attempts[key] = deque()
+        else:
+            self._attempts.move_to_end(key)
+
+        while attempts and attempts[0] <= now - window:
+            attempts.popleft()
+
+        if len(attempts) >= limit:
+            return attempts[0] + window - now
+
+        attempts.append(now)
+
+        while len(self._attempts) > self.max_keys:
+            self._attempts.popitem(last=False)
+
+        return None
+
+    async def reset(self, key: str) -> None:
+        self._attempts.pop(key, None)
+
+    async def clear(self) -> None:
+        self._attempts.clear()
+
+
+REDIS_HIT_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+
+redis.call("ZREMRANGEBYSCORE", key, 0, now - window)
+
+if redis.call("ZCARD", key) >= tonumber(ARGV[3]) then
+    local oldest = redis.call("ZRANGE", key, 0, 0, "WITHSCORES")
+    return tostring(tonumber(oldest[2]) + window - now)
+end
+
+redis.call("ZADD", key, now, ARGV[4])
+redis.call("PEXPIRE", key, ARGV[5])
+
+return false
+"""
+
+
+class RedisRateLimit(RateLimitBackend):
+    """
+    A sliding-window log shared between workers, stored in Redis sorted sets.
+
+    A hit is checked and recorded by a single Lua script, so concurrent hits
+    on the same key from different workers cannot all pass the check before
+    any of them is recorded.
+    """
+
+    def __init__(self, url: str, prefix: str = "todo-app:rate-limit:") -> None:
+        if redis_asyncio is None:
+            raise RuntimeError(
+                "The `redis` package is required for the Redis rate limit "
+                "backend."
+            )
+
+        self.prefix = prefix
+        self._client = redis_asyncio.from_url(url)
+        self._hit_script = self._client.register_script(REDIS_HIT_SCRIPT)
+
+    async def hit(self, key: str, limit: int, window: float) -> float | None:
+        now = time.time()
+        retry_after = await self._hit_script(
+            keys=[self.prefix + key],
+            args=[
+                now,
+                window,
+                limit,
+                f"{now}:{uuid.uuid4().hex}",
+                math.ceil(window * 1000),
+            ],
+        )
+
+        return None if retry_after is None else float(retry_after)
+
+    async def reset(self, key: str) -> None:
+        await self._client.delete(self.prefix + key)
+
+    async def clear(self) -> None:
+        async for key in self._client.scan_iter(match=self.prefix + "*"):
+            await self._client.delete(key)
+
+
+class LoginRateLimiter:
+    """
+    The limiter of the login attempts per username and per client address.
+    """
+
+    def __init__(
+        self,
+        backend: RateLimitBackend | None,
+        username_limit: int,
+        client_limit: int,
+        window: float,
+    ) -> None:
+        self.backend = backend
+        self.username_limit = username_limit
+        self.client_limit = client_limit
+        self.window = window
+
+    async def check(self, username: str, client: str | None) -> None:
+        """
+        The method records a login attempt, rejecting it once the client
+        or the username is over its limit.
+        """
+        if self.backend is None:
+            return
+
+        for key, limit in (
+            (f"login:client:{client}", self.client_limit),
+            (f"login:username:{username.lower()}", self.username_limit),
+        ):
+            retry_after = await self.backend.hit(
+                key=key, limit=limit, window=self.window
+            )
+
+            if retry_after is not None:
+                raise get_too_many_requests(retry_after=retry_after)
+
+    async def reset(self, username: str) -> None:
+        """
+        The method forgets the failed attempts of the `username`
+        after a successful login.
+        """
+        if self.backend is not None:
+            await self.backend.reset(key=f"login:username:{username.lower()}")
+
+    async def clear(self) -> None:
+        """
+        The method forgets all recorded attempts.
+        """
+        if self.backend is not None:
+            await self.backend.clear()
+
+
+def get_rate_limit_backend() -> RateLimitBackend | None:
+    """
+    The function returns the rate limit backend configured in the settings.
+    """
+    if settings.LOGIN_RATE_LIMIT_BACKEND == "memory":
+        return InMemoryRateLimit(max_keys=settings.LOGIN_RATE_LIMIT_MAX_KEYS)
+
+    if settings.LOGIN_RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimit(url=settings.LOGIN_RATE_LIMIT_REDIS_URL)
+
+    return None
+
+
+login_rate_limiter = LoginRateLimiter(
+    backend=get_rate_limit_backend(),
+    username_limit=settings.LOGIN_RATE_LIMIT_PER_USERNAME,
+    client_limit=settings.LOGIN_RATE_LIMIT_PER_CLIENT,
+    window=settings.LOGIN_RATE_LIMIT_WINDOW,
+)
@@ -0,0 +1,117 @@
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+from src.models import RevokedToken, User
+
+
+class TokenRevocationList:
+    """
+    An in-process copy of the revoked tokens, synced from the database.
+
+    A token is revoked either by its `jti` or by the cut-off time of its
+    user, which rejects every token of the user issued before it. Both are
+    checked with a single set or dict lookup, so the check is cheap enough
+    to run on every authenticated request.
+    """
+
+    def __init__(self, sync_interval: float) -> None:
+        self.sync_interval = sync_interval
+        self._revoked_tokens: dict[str, float] = {}
+        self._user_cutoffs: dict[int, float] = {}
+        self._synced_at: float | None = None
+
+    def is_stale(self) -> bool:
+        """
+        The method checks whether the list must be synced from the database.
+        """
+        return (
+            self._synced_at is None
+            or time.monotonic() - self._synced_at >= self.sync_interval
+        )
+
+    async def sync(self, db: AsyncSession) -> None:
+        """
+        The method merges the revoked tokens and the cut-off times that are
+        still relevant from the database into the list.
+        """
+        self._synced_at = time.monotonic()
+        now = datetime.now(tz=timezone.utc)
+
+        revoked_tokens = await db.execute(
+            select(RevokedToken.jti, RevokedToken.expires_at).filter(
+                RevokedToken.expires_at > now
+            )
+        )
+        user_cutoffs = await db.execute(
+            select(User.user_id, User.tokens_valid_after).filter(
+                User.tokens_valid_after
+                > now - timedelta(minutes=settings.REFRESH_TOKEN_EXPIRE)
+            )
+        )
+
+        for jti, expires_at in revoked_tokens:
+            self.add_token(jti=jti, expires_at=expires_at.timestamp())
+
+        for user_id, tokens_valid_after in user_cutoffs:
+            self.add_user_cutoff(
+                user_id=user_id, cutoff=tokens_valid_after.timestamp()
+            )
+
+        self._prune(now=now.timestamp())
+
+    def add_token(self, jti: str, expires_at: float) -> None:
+        """
+        The method marks the token with the `jti` as revoked.
+        """
+        self._revoked_tokens[jti] = expires_at
+
+    def add_user_cutoff(self, user_id: int, cutoff: float) -> None:
+        """
+        The method revokes all tokens of the user issued before the `cutoff`.
+        """
+        self._user_cutoffs[user_id] = max(
+            cutoff, self._user_cutoffs.get(user_id, cutoff)
+        )
+
+    def is_revoked(self, jti: str, user_id: int, issued_at: float) -> bool:
+        """
+        The method checks whether the token is revoked.
+        """
+        return (
+            jti in self._revoked_tokens
+            or issued_at < self._user_cutoffs.get(user_id, 0.0)
+        )
+
+    def clear(self) -> None:
+        """
+        The method empties the list and marks it for a sync.
+        """
+        self._revoked_tokens.clear()
+        self._user_cutoffs.clear()
+        self._synced_at = None
+
+    def _prune(self, now: float) -> None:
+        """
+        The method drops the entries of the tokens that have expired anyway.
+        """
+        self._revoked_tokens = {
+            jti: expires_at
+            for jti, expires_at in self._revoked_tokens.items()
+            if expires_at > now
+        }
+
+        refresh_token_expire = settings.REFRESH_TOKEN_EXPIRE * 60
+        self._user_cutoffs = {
+            user_id: cutoff
+            for user_id, cutoff in self._user_cutoffs.items()
+            if cutoff > now - refresh_token_expire
+        }
+
+
+token_revocation_list = TokenRevocationList(
+    sync_interval=settings.TOKEN_REVOCATION_SYNC_INTERVAL
+)
@@ -20,4 +20,4 @@ async def create_address(
     if user is None:
         raise get_failed_response(detail="Authentication failed.")
 
-    address_service.create_address(address=address, user_id=user.user_id)
+    await address_service.create_address(address=address, user_id=user.user_id)
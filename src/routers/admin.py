@@ -1,28 +1,124 @@
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Header, Path, Query, Request
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from starlette import status
+from starlette.types import Receive, Scope, Send
 
-from src.dependencies import db_dependency, user_dependency
-from src.schemas import TodoResponse
+from src.config import settings
+from src.dependencies import (
+    db_dependency,
+    read_db_dependency,
+    todo_fields_dependency,
+    user_dependency,
+)
+from src.schemas import TodoResponse, TodoStatsResponse
 from src.services.admin_service import AdminService
-from src.utils import get_invalid_credentials
+from src.utils import get_invalid_credentials, get_unsupported_media_type
 
-router = APIRouter(prefix="/admin/todos", tags=["admin"])
+router = APIRouter(prefix="/admin", tags=["admin"])
 
+USER_IMPORT_FORMATS = {"text/csv": "csv", "application/x-ndjson": "ndjson"}
 
-@router.get("/", status_code=status.HTTP_200_OK)
+
+class RequestStreamingResponse(StreamingResponse):
+    """
+    A streaming response whose content is produced while the request body
+    is still being received.
+
+    The `StreamingResponse` listens for the client disconnect with the same
+    `receive` channel that the request body is read from, which would take
+    the body chunks away from the content, so the response is only streamed.
+    A disconnected client fails the next read of the request body instead.
+    """
+
+    async def __call__(
+        self, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        await self.stream_response(send)
+
+        if self.background is not None:
+            await self.background()
+
+
+@router.get("/todos/", status_code=status.HTTP_200_OK)
 async def read_todos(
     user: user_dependency,
-    db: db_dependency,
+    db: read_db_dependency,
+    fields: todo_fields_dependency,
+    stream: bool = Query(default=False),
 ) -> list[TodoResponse]:
     admin_service = AdminService(db=db)
 
     if user is None or user.role != "admin":
         raise get_invalid_credentials()
 
-    return admin_service.get_todos_from_users()
+    if stream:
+        return StreamingResponse(
+            content=admin_service.stream_todos_from_users(fields=fields),
+            media_type="application/x-ndjson",
+        )
+
+    todos = await admin_service.get_todos_from_users(fields=fields)
+
+    return ORJSONResponse(content=todos)
+
+
+@router.get(
+    "/stats",
+    status_code=status.HTTP_200_OK,
+    response_model=TodoStatsResponse,
+)
+async def read_todo_stats(
+    user: user_dependency,
+    db: read_db_dependency,
+    users_limit: int = Query(
+        default=settings.ADMIN_STATS_PAGE_SIZE,
+        gt=0,
+        le=settings.ADMIN_STATS_MAX_PAGE_SIZE,
+    ),
+    users_after: str | None = Query(default=None),
+    user_id: int | None = Query(default=None, gt=0),
+) -> TodoStatsResponse:
+    admin_service = AdminService(db=db)
+
+    if user is None or user.role != "admin":
+        raise get_invalid_credentials()
+
+    return await admin_service.get_todo_stats(
+        users_limit=users_limit, users_after=users_after, user_id=user_id
+    )
+
+
+@router.post("/users/import", status_code=status.HTTP_200_OK)
+async def import_users(
+    user: user_dependency,
+    db: db_dependency,
+    request: Request,
+    content_type: str = Header(default=""),
+) -> StreamingResponse:
+    admin_service = AdminService(db=db)
+
+    if user is None or user.role != "admin":
+        raise get_invalid_credentials()
+
+    import_format = USER_IMPORT_FORMATS.get(
+        content_type.split(";")[0].strip().lower()
+    )
+
+    if import_format is None:
+        raise get_unsupported_media_type(
+            detail="The users must be sent as `text/csv` or "
+            "`application/x-ndjson`."
+        )
+
+    return RequestStreamingResponse(
+        content=admin_service.import_users(
+            chunks=request.stream(), import_format=import_format
+        ),
+        media_type="application/x-ndjson",
+    )
 
 
-@router.delete("/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/todos/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_todo(
     user: user_dependency,
     db: db_dependency,
@@ -33,4 +129,4 @@ async def delete_todo(
     if user is None or user.role != "admin":
         raise get_invalid_credentials()
 
-    admin_service.delete_todo_from_user(todo_id=todo_id)
+    await admin_service.delete_todo_from_user(todo_id=todo_id)
@@ -1,15 +1,25 @@
-from datetime import timedelta
 from typing import Annotated
 
 from fastapi import APIRouter, Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from starlette import status
 
-from src.dependencies import db_dependency
-from src.oauth2 import ACCESS_TOKEN_EXPIRE, create_access_token
-from src.schemas import Token, UserCreate, UserResponse
+from src.dependencies import (
+    check_login_rate_limit,
+    db_dependency,
+    user_dependency,
+)
+from src.hashing import password_hashing_pool
+from src.rate_limit import login_rate_limiter
+from src.schemas import (
+    Token,
+    TokenRefresh,
+    TokenRevoke,
+    UserCreate,
+    UserResponse,
+)
 from src.services.auth_service import AuthService
-from src.utils import get_invalid_credentials, verify_password
+from src.utils import get_failed_response, get_invalid_credentials
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -18,13 +28,16 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 async def create_user(db: db_dependency, user: UserCreate) -> UserResponse:
     auth_service = AuthService(db=db)
 
-    created_user = auth_service.create_user(user=user)
+    created_user = await auth_service.create_user(user=user)
 
     return created_user
 
 
 @router.post(
-    "/token", response_model=Token, status_code=status.HTTP_201_CREATED
+    "/token",
+    response_model=Token,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(check_login_rate_limit)],
 )
 async def login_for_access_token(
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
@@ -32,21 +45,43 @@ async def login_for_access_token(
 ) -> Token:
     auth_service = AuthService(db=db)
 
-    user = auth_service.get_user_by_username(form_data.username)
+    user = await auth_service.get_user_by_username(form_data.username)
 
     if not user:
         raise get_invalid_credentials()
 
-    if not verify_password(
+    if not await password_hashing_pool.verify(
         plain_password=form_data.password, hashed_password=user.password
     ):
         raise get_invalid_credentials()
 
-    token = create_access_token(
-        username=user.username,
-        user_id=user.user_id,
-        role=user.role,
-        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE),
+    await login_rate_limiter.reset(username=user.username)
+
+    return auth_service.create_tokens(user=user)
+
+
+@router.post(
+    "/refresh", response_model=Token, status_code=status.HTTP_201_CREATED
+)
+async def refresh_access_token(
+    db: db_dependency, token_refresh: TokenRefresh
+) -> Token:
+    auth_service = AuthService(db=db)
+
+    return await auth_service.refresh_tokens(
+        refresh_token=token_refresh.refresh_token
     )
 
-    return Token(access_token=token, token_type="bearer")
+
+@router.post("/revoke", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_tokens(
+    user: user_dependency, db: db_dependency, token_revoke: TokenRevoke
+) -> None:
+    auth_service = AuthService(db=db)
+
+    if user is None:
+        raise get_failed_response(detail="Authentication failed.")
+
+    await auth_service.revoke_tokens(
+        user=user, refresh_token=token_revoke.refresh_token
+    )
@@ -0,0 +1,40 @@
+from fastapi import APIRouter
+from starlette import status
+
+from src.cache import todo_cache
+from src.database import get_pool_stats
+from src.dependencies import user_dependency
+from src.hashing import password_hashing_pool
+from src.utils import get_invalid_credentials
+
+router = APIRouter(prefix="/internal", tags=["internal"])
+
+
+@router.get("/cache", status_code=status.HTTP_200_OK)
+async def read_cache_stats(
+    user: user_dependency,
+) -> dict[str, int | str | None]:
+    if user is None or user.role != "admin":
+        raise get_invalid_credentials()
+
+    return todo_cache.stats()
+
+
+@router.get("/pool", status_code=status.HTTP_200_OK)
+async def read_pool_stats(
+    user: user_dependency,
+) -> dict[str, int | float | dict]:
+    if user is None or user.role != "admin":
+        raise get_invalid_credentials()
+
+    return get_pool_stats()
+
+
+@router.get("/hashing", status_code=status.HTTP_200_OK)
+async def read_hashing_stats(
+    user: user_dependency,
+) -> dict[str, int | float | str]:
+    if user is None or user.role != "admin":
+        raise get_invalid_credentials()
+
+    return password_hashing_pool.stats()
@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from starlette import status
+
+from src.metrics import registry
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get(
+    "/metrics",
+    status_code=status.HTTP_200_OK,
+    response_class=PlainTextResponse,
+    include_in_schema=False,
+)
+async def read_metrics() -> PlainTextResponse:
+    return PlainTextResponse(
+        content=registry.render(), media_type="text/plain; version=0.0.4"
+    )
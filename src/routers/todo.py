@@ -1,13 +1,27 @@
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Header, Path, Query, Response
+from fastapi.responses import ORJSONResponse
 from starlette import status
 
-from src.dependencies import db_dependency, user_dependency
+from src.config import settings
+from src.dependencies import (
+    db_dependency,
+    read_db_dependency,
+    todo_fields_dependency,
+    todo_filter_dependency,
+    user_dependency,
+)
 from src.schemas import (
+    TodoBatchDelete,
+    TodoBatchResponse,
+    TodoBatchUpdate,
+    TodoBulkCreate,
+    TodoBulkCreateResponse,
     TodoCreate,
     TodoResponse,
     TodoUpdate,
 )
 from src.services.todo_service import TodoService
+from src.utils import get_etag, is_etag_matched
 
 router = APIRouter(prefix="/todos", tags=["todo"])
 
@@ -17,13 +31,71 @@ router = APIRouter(prefix="/todos", tags=["todo"])
 )
 async def read_todos(
     user: user_dependency,
-    db: db_dependency,
+    db: read_db_dependency,
+    todo_filter: todo_filter_dependency,
+    fields: todo_fields_dependency,
+    limit: int = Query(
+        default=settings.TODOS_PAGE_SIZE,
+        gt=0,
+        le=settings.TODOS_MAX_PAGE_SIZE,
+    ),
+    after: str | None = Query(default=None),
+    if_none_match: str | None = Header(default=None),
+) -> list[TodoResponse]:
+    todo_service = TodoService(db=db, user=user)
+
+    version = await todo_service.get_todos_version()
+    etag = get_etag(
+        user.user_id,
+        version,
+        limit,
+        after,
+        todo_filter.json(),
+        fields and ",".join(fields),
+    )
+
+    if is_etag_matched(if_none_match=if_none_match, etag=etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
+    page = await todo_service.get_todos(
+        limit=limit,
+        after=after,
+        todo_filter=todo_filter,
+        fields=fields,
+        version=version,
+    )
+
+    headers = {"ETag": etag}
+
+    if page.next_cursor is not None:
+        headers["X-Next-Cursor"] = page.next_cursor
+
+    return ORJSONResponse(content=page.todos, headers=headers)
+
+
+@router.get(
+    "/search",
+    status_code=status.HTTP_200_OK,
+    response_model=list[TodoResponse],
+)
+async def search_todos(
+    user: user_dependency,
+    db: read_db_dependency,
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(
+        default=settings.TODOS_PAGE_SIZE,
+        gt=0,
+        le=settings.TODOS_MAX_PAGE_SIZE,
+    ),
+    offset: int = Query(default=0, ge=0),
 ) -> list[TodoResponse]:
     todo_service = TodoService(db=db, user=user)
 
-    todos = todo_service.get_todos()
+    todos = await todo_service.search_todos(q=q, limit=limit, offset=offset)
 
-    return todos
+    return ORJSONResponse(content=todos)
 
 
 @router.get(
@@ -31,14 +103,23 @@ async def read_todos(
 )
 async def read_todo(
     user: user_dependency,
-    db: db_dependency,
+    db: read_db_dependency,
     todo_id: int = Path(gt=0),
+    if_none_match: str | None = Header(default=None),
 ) -> TodoResponse:
     todo_service = TodoService(db=db, user=user)
 
-    todo = todo_service.get_todo(todo_id=todo_id)
+    version = await todo_service.get_todos_version()
+    etag = get_etag(user.user_id, version, todo_id)
+
+    if is_etag_matched(if_none_match=if_none_match, etag=etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
+    todo = await todo_service.get_todo(todo_id=todo_id, version=version)
 
-    return todo
+    return ORJSONResponse(content=todo, headers={"ETag": etag})
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
@@ -49,11 +130,50 @@ async def create_todo(
 ) -> TodoResponse:
     todo_service = TodoService(db=db, user=user)
 
-    created_todo = todo_service.create_todo(todo=todo)
+    created_todo = await todo_service.create_todo(todo=todo)
 
     return created_todo
 
 
+@router.post("/bulk", status_code=status.HTTP_201_CREATED)
+async def create_todos(
+    user: user_dependency,
+    db: db_dependency,
+    todos: TodoBulkCreate,
+) -> TodoBulkCreateResponse:
+    todo_service = TodoService(db=db, user=user)
+
+    todo_ids = await todo_service.create_todos(todos=todos)
+
+    return TodoBulkCreateResponse(todo_ids=todo_ids)
+
+
+@router.patch("/batch", status_code=status.HTTP_200_OK)
+async def update_todos(
+    user: user_dependency,
+    db: db_dependency,
+    todos: TodoBatchUpdate,
+) -> TodoBatchResponse:
+    todo_service = TodoService(db=db, user=user)
+
+    todo_ids = await todo_service.update_todos(todos=todos)
+
+    return TodoBatchResponse(todo_ids=todo_ids)
+
+
+@router.post("/batch/delete", status_code=status.HTTP_200_OK)
+async def delete_todos(
+    user: user_dependency,
+    db: db_dependency,
+    todos: TodoBatchDelete,
+) -> TodoBatchResponse:
+    todo_service = TodoService(db=db, user=user)
+
+    todo_ids = await todo_service.delete_todos(todos=todos)
+
+    return TodoBatchResponse(todo_ids=todo_ids)
+
+
 @router.put("/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def update_todo(
     user: user_dependency,
@@ -63,7 +183,7 @@ async def update_todo(
 ) -> None:
     todo_service = TodoService(db=db, user=user)
 
-    todo_service.update_todo(todo=todo, todo_id=todo_id)
+    await todo_service.update_todo(todo=todo, todo_id=todo_id)
 
 
 @router.delete("/{todo_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -74,4 +194,4 @@ async def delete_todo(
 ) -> None:
     todo_service = TodoService(db=db, user=user)
 
-    todo_service.delete_todo(todo_id=todo_id)
+    await todo_service.delete_todo(todo_id=todo_id)
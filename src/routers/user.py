@@ -1,7 +1,13 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
 from starlette import status
 
-from src.dependencies import db_dependency, user_dependency
+from src.config import settings
+from src.dependencies import (
+    db_dependency,
+    read_db_dependency,
+    user_dependency,
+    user_include_dependency,
+)
 from src.schemas import UserResponse, UserVerification
 from src.services.user_service import UserService
 from src.utils import get_failed_response
@@ -9,17 +15,34 @@ from src.utils import get_failed_response
 router = APIRouter(prefix="/users", tags=["user"])
 
 
-@router.get("/me", status_code=status.HTTP_200_OK, response_model=UserResponse)
+@router.get(
+    "/me",
+    status_code=status.HTTP_200_OK,
+    response_model=UserResponse,
+    response_model_exclude_unset=True,
+)
 async def get_user(
     user: user_dependency,
-    db: db_dependency,
+    db: read_db_dependency,
+    include: user_include_dependency,
+    todos_limit: int = Query(
+        default=settings.TODOS_PAGE_SIZE,
+        gt=0,
+        le=settings.TODOS_MAX_PAGE_SIZE,
+    ),
+    todos_after: str | None = Query(default=None),
 ) -> UserResponse:
     user_service = UserService(db=db)
 
     if user is None:
         raise get_failed_response(detail="Authentication failed.")
 
-    return user_service.get_user_by_id(user_id=user.user_id)
+    return await user_service.get_user_by_id(
+        user_id=user.user_id,
+        include=include,
+        todos_limit=todos_limit,
+        todos_after=todos_after,
+    )
 
 
 @router.put("/reset-password", status_code=status.HTTP_204_NO_CONTENT)
@@ -33,6 +56,6 @@ async def change_password(
     if user is None:
         raise get_failed_response(detail="Authentication failed.")
 
-    user_service.change_password(
+    await user_service.change_password(
         user_id=user.user_id, user_verification=user_verification
     )
@@ -1,9 +1,12 @@
 import re
+from enum import Enum
 from string import punctuation
+from typing import Any, Mapping
 
-from pydantic import BaseModel, EmailStr, validator
+from pydantic import BaseModel, EmailStr, conlist, root_validator, validator
 
 
+from src.config import settings
 from src.models import Priority
 from src.exceptions import (
     CityFormatException,
@@ -16,13 +19,95 @@ from src.exceptions import (
     PostalCodeFormatException,
     StateFormatException,
     TitleFormatException,
+    TodoBatchFormatException,
     UsernameFormatException,
 )
 
 PHONE_NUMBER_REGEX = re.compile(
     r"^(?:\+38|0)?\(?0?\d{2}\)?\s?\d{3}-?\d{2}-?\d{2}$"
 )
-PUNCTUATION_WITHOUT_UNDERSCORE = punctuation.replace("_", "")
+UPPERCASE = "U"
+LOWERCASE = "L"
+DIGIT = "D"
+WHITESPACE = "S"
+PUNCTUATION = "P"
+UNDERSCORE = "_"
+OTHER = "O"
+NON_LETTER_CLASSES = DIGIT + WHITESPACE + PUNCTUATION + UNDERSCORE
+CHARACTER_CLASS_TABLE_MAX_SIZE = 65536
+
+
+class CharacterClassTable(dict):
+    """
+    The `str.translate` table that maps every character to its class.
+
+    The classes are those the validators check for (uppercase, lowercase,
+    digit, whitespace, punctuation, underscore and other), computed with
+    the same `str` predicates the validators used to call per check.
+    Characters are classified on first use and cached up to a bound.
+    """
+
+    def __missing__(self, codepoint: int) -> str:
+        character = chr(codepoint)
+
+        if character == "_":
+            character_class = UNDERSCORE
+        elif character in punctuation:
+            character_class = PUNCTUATION
+        elif character.isupper():
+            character_class = UPPERCASE
+        elif character.islower():
+            character_class = LOWERCASE
+        elif character.isdigit():
+            character_class = DIGIT
+        elif character.isspace():
+            character_class = WHITESPACE
+        else:
+            character_class = OTHER
+
+        if len(self) < CHARACTER_CLASS_TABLE_MAX_SIZE:
+            self[codepoint] = character_class
+
+        return character_class
+
+
+CHARACTER_CLASSES = CharacterClassTable()
+ASCII_CHARACTER_CLASSES = "".join(
+    CHARACTER_CLASSES[codepoint] for codepoint in range(128)
+)
+ASCII_NON_LETTERS = "".join(
+    chr(codepoint)
+    for codepoint, character_class in enumerate(ASCII_CHARACTER_CLASSES)
+    if character_class in NON_LETTER_CLASSES
+)
+
+
+def get_character_classes(value: str) -> str:
+    """
+    The function returns the class of every character of the `value`,
+    classifying the whole string in a single `str.translate` pass.
+    """
+    if not isinstance(value, str):
+        raise TypeError("The value must be a string.")
+
+    if value.isascii():
+        return value.translate(ASCII_CHARACTER_CLASSES)
+
+    return value.translate(CHARACTER_CLASSES)
+
+
+def has_letters(value: str) -> bool:
+    """
+    The function checks if the `value` has any character other than
+    digits, whitespaces and punctuation marks.
+
+    Stripping those characters stops at the first other character
+    from either end, so the common case does not scan the whole string.
+    """
+    if value.isascii():
+        return bool(value.strip(ASCII_NON_LETTERS))
+
+    return bool(get_character_classes(value).strip(NON_LETTER_CLASSES))
 
 
 class UserBase(BaseModel):
@@ -44,19 +129,19 @@ class UserBase(BaseModel):
                 detail="The length of the `username` must be between 5 and 30 characters.",
             )
 
-        if any(character.isupper() for character in value):
+        character_classes = get_character_classes(value)
+
+        if UPPERCASE in character_classes:
             raise UsernameFormatException(
                 detail="The `username` must not contain uppercase characters.",
             )
 
-        if any(character.isspace() for character in value):
+        if WHITESPACE in character_classes:
             raise UsernameFormatException(
                 detail="The `username` must not contain whitespaces.",
             )
 
-        if any(
-            character in PUNCTUATION_WITHOUT_UNDERSCORE for character in value
-        ):
+        if PUNCTUATION in character_classes:
             raise UsernameFormatException(
                 detail="The `username` must not contain any punctuation marks "
                 "other than underscores.",
@@ -74,28 +159,32 @@ class UserBase(BaseModel):
                 detail="The `password` must be at least 8 characters long.",
             )
 
-        if not any(character.isupper() for character in value):
+        character_classes = get_character_classes(value)
+
+        if UPPERCASE not in character_classes:
             raise PasswordFormatException(
                 detail="The `password` must contain at least one uppercase letter.",
             )
 
-        if not any(character.islower() for character in value):
+        if LOWERCASE not in character_classes:
             raise PasswordFormatException(
                 detail="The `password` must contain at least one lowercase letter.",
             )
 
-        if not any(character.isdigit() for character in value):
+        if DIGIT not in character_classes:
             raise PasswordFormatException(
                 detail="The `password` must contain at least one digit.",
             )
 
-        if not any(character in punctuation for character in value):
+        if not (
+            PUNCTUATION in character_classes or UNDERSCORE in character_classes
+        ):
             raise PasswordFormatException(
                 detail="The `password` must contain at least one punctuation mark "
                 "such as !#$%&'\"()*+,-/:;<=>?@[\\]^_`{|}~.",
             )
 
-        if any(character.isspace() for character in value):
+        if WHITESPACE in character_classes:
             raise PasswordFormatException(
                 detail="The `password` must not contain whitespaces.",
             )
@@ -107,17 +196,19 @@ class UserBase(BaseModel):
         """
         The method checks if the `first_name` passes all validations.
         """
-        if any(character.isspace() for character in value):
+        character_classes = get_character_classes(value)
+
+        if WHITESPACE in character_classes:
             raise FirstNameFormatException(
                 detail="The `first_name` must not contain whitespaces.",
             )
 
-        if any(character.isdigit() for character in value):
+        if DIGIT in character_classes:
             raise FirstNameFormatException(
                 detail="The `first_name` must not contain digits.",
             )
 
-        if any(character in punctuation for character in value):
+        if PUNCTUATION in character_classes or UNDERSCORE in character_classes:
             raise FirstNameFormatException(
                 detail="The `first_name` must not contain punctuation marks.",
             )
@@ -134,17 +225,19 @@ class UserBase(BaseModel):
         """
         The method checks if the `last_name` passes all validations.
         """
-        if any(character.isspace() for character in value):
+        character_classes = get_character_classes(value)
+
+        if WHITESPACE in character_classes:
             raise LastNameFormatException(
                 detail="The `last_name` must not contain whitespaces.",
             )
 
-        if any(character.isdigit() for character in value):
+        if DIGIT in character_classes:
             raise LastNameFormatException(
                 detail="The `last_name` must not contain digits.",
             )
 
-        if any(character in punctuation for character in value):
+        if PUNCTUATION in character_classes or UNDERSCORE in character_classes:
             raise LastNameFormatException(
                 detail="The `last_name` must not contain punctuation marks.",
             )
@@ -182,6 +275,7 @@ class UserResponse(UserBase):
     user_id: int
     is_active: bool
     todos: list["TodoResponse"] = []
+    todos_next_cursor: str | None = None
     address: "AddressResponse" = None
 
     class Config:
@@ -206,11 +300,23 @@ class TokenPayload(BaseModel):
     username: str | None = None
     user_id: int | None = None
     role: str | None = None
+    jti: str | None = None
+    issued_at: float | None = None
+    expires_at: float | None = None
 
 
 class Token(BaseModel):
     access_token: str
     token_type: str
+    refresh_token: str | None = None
+
+
+class TokenRefresh(BaseModel):
+    refresh_token: str
+
+
+class TokenRevoke(BaseModel):
+    refresh_token: str | None = None
 
 
 class TodoBase(BaseModel):
@@ -224,12 +330,7 @@ class TodoBase(BaseModel):
         """
         The method checks if the `title` passes all validations.
         """
-        if all(
-            character.isdigit()
-            or character.isspace()
-            or character in punctuation
-            for character in value
-        ):
+        if not has_letters(value):
             raise TitleFormatException(
                 detail="The `title` must contain letters.",
             )
@@ -247,12 +348,7 @@ class TodoBase(BaseModel):
         """
         The method checks if the `description` passes all validations.
         """
-        if all(
-            character.isdigit()
-            or character.isspace()
-            or character in punctuation
-            for character in value
-        ):
+        if not has_letters(value):
             raise DescriptionFormatException(
                 detail="The `description` must contain letters.",
             )
@@ -274,6 +370,58 @@ class TodoUpdate(TodoBase):
     pass
 
 
+TodoBulkCreate = conlist(
+    TodoCreate, min_items=1, max_items=settings.TODOS_BULK_MAX_ITEMS
+)
+
+
+class TodoBulkCreateResponse(BaseModel):
+    todo_ids: list[int]
+
+
+class TodoBatchFilter(BaseModel):
+    todo_ids: list[int] | None = None
+    complete: bool | None = None
+
+    @root_validator(skip_on_failure=True)
+    def validate_filter(cls, values) -> dict:
+        """
+        The method checks if the batch `filter` narrows the `todos` down.
+        """
+        if values["todo_ids"] is None and values["complete"] is None:
+            raise TodoBatchFormatException(
+                detail="The `filter` must contain `todo_ids` or `complete`.",
+            )
+
+        return values
+
+
+class TodoBatchUpdate(BaseModel):
+    filter: TodoBatchFilter
+    complete: bool | None = None
+    priority: Priority | None = None
+
+    @root_validator(skip_on_failure=True)
+    def validate_values(cls, values) -> dict:
+        """
+        The method checks if the batch update changes at least one field.
+        """
+        if values["complete"] is None and values["priority"] is None:
+            raise TodoBatchFormatException(
+                detail="The batch update must contain `complete` or `priority`.",
+            )
+
+        return values
+
+
+class TodoBatchDelete(BaseModel):
+    filter: TodoBatchFilter
+
+
+class TodoBatchResponse(BaseModel):
+    todo_ids: list[int]
+
+
 class TodoResponse(TodoBase):
     todo_id: int
     owner: "UserSummaryResponse"
@@ -282,6 +430,101 @@ class TodoResponse(TodoBase):
         orm_mode = True
 
 
+class TodoCountsResponse(BaseModel):
+    total: int = 0
+    complete: int = 0
+    by_priority: dict[int, int] = {}
+
+
+class UserTodoCountsResponse(TodoCountsResponse):
+    user_id: int
+
+
+class TodoStatsResponse(BaseModel):
+    overall: TodoCountsResponse
+    users: list[UserTodoCountsResponse]
+    users_next_cursor: str | None = None
+
+
+class TodoSort(str, Enum):
+    todo_id = "todo_id"
+    todo_id_desc = "-todo_id"
+    priority = "priority"
+    priority_desc = "-priority"
+    title = "title"
+    title_desc = "-title"
+
+
+class TodoField(str, Enum):
+    title = "title"
+    description = "description"
+    priority = "priority"
+    complete = "complete"
+    todo_id = "todo_id"
+    owner = "owner"
+
+
+class TodoFilter(BaseModel):
+    complete: bool | None = None
+    priority: Priority | None = None
+    priority_min: Priority | None = None
+    priority_max: Priority | None = None
+    sort: TodoSort = TodoSort.todo_id
+
+
+class TodoPage(BaseModel):
+    todos: list[dict]
+    next_cursor: str | None = None
+
+
+def get_todo_response_dict(
+    todo_id: int,
+    title: str,
+    description: str,
+    priority: Priority,
+    complete: bool,
+    user_id: int,
+    email: str,
+    username: str,
+) -> dict:
+    """
+    The function returns a trusted `todo` row projected from the database
+    as a dict shaped like `TodoResponse`, without validating it again.
+    """
+    return {
+        "title": title,
+        "description": description,
+        "priority": priority.value,
+        "complete": complete,
+        "todo_id": todo_id,
+        "owner": {"user_id": user_id, "email": email, "username": username},
+    }
+
+
+def get_sparse_todo_response_dict(
+    values: Mapping[str, Any], fields: list[TodoField]
+) -> dict:
+    """
+    The function returns the requested `fields` of a trusted `todo` row
+    projected from the database, shaped like `TodoResponse`.
+    """
+    todo = {}
+
+    for field in fields:
+        if field is TodoField.owner:
+            todo["owner"] = {
+                "user_id": values["user_id"],
+                "email": values["email"],
+                "username": values["username"],
+            }
+        elif field is TodoField.priority:
+            todo["priority"] = values["priority"].value
+        else:
+            todo[field.value] = values[field.value]
+
+    return todo
+
+
 class AddressBase(BaseModel):
     city: str
     state: str
@@ -293,12 +536,14 @@ class AddressBase(BaseModel):
         """
         The method checks if the `city` passes all validations.
         """
-        if any(character in punctuation for character in value):
+        character_classes = get_character_classes(value)
+
+        if PUNCTUATION in character_classes or UNDERSCORE in character_classes:
             raise CityFormatException(
                 detail="The `city` must not contain punctuation marks.",
             )
 
-        if any(character.isdigit() for character in value):
+        if DIGIT in character_classes:
             raise CityFormatException(
                 detail="The `city` must not contain digits.",
             )
@@ -315,12 +560,14 @@ class AddressBase(BaseModel):
         """
         The method checks if the `state` passes all validations.
         """
-        if any(character in punctuation for character in value):
+        character_classes = get_character_classes(value)
+
+        if PUNCTUATION in character_classes or UNDERSCORE in character_classes:
             raise StateFormatException(
                 detail="The `state` must not contain punctuation marks.",
             )
 
-        if any(character.isdigit() for character in value):
+        if DIGIT in character_classes:
             raise StateFormatException(
                 detail="The `state` must not contain digits.",
             )
@@ -337,12 +584,14 @@ class AddressBase(BaseModel):
         """
         The method checks if the `country` passes all validations.
         """
-        if any(character in punctuation for character in value):
+        character_classes = get_character_classes(value)
+
+        if PUNCTUATION in character_classes or UNDERSCORE in character_classes:
             raise CountryFormatException(
                 detail="The `country` must not contain punctuation marks.",
             )
 
-        if any(character.isdigit() for character in value):
+        if DIGIT in character_classes:
             raise CountryFormatException(
                 detail="The `country` must not contain digits.",
             )
@@ -1,3 +1,5 @@
+from sqlalchemy import insert, select, update
+
 from src.dependencies import db_dependency
 from src.models import Address, User
 from src.schemas import AddressCreate
@@ -7,17 +9,28 @@ class AddressService:
     def __init__(self, db: db_dependency) -> None:
         self.db = db
 
-    def create_address(self, address: AddressCreate, user_id: int) -> None:
+    async def create_address(
+        self, address: AddressCreate, user_id: int
+    ) -> None:
         """
-        The method creates a new `address` and associates it with the user.
+        The method creates a new `address` and associates it with the user
+        with a single statement, inserting the `address` in a CTE.
         """
-        created_address = Address(**address.dict())
-
-        self.db.add(created_address)
-        self.db.flush()
-
-        user = self.db.query(User).filter(User.user_id == user_id).first()
-        user.address_id = created_address.address_id
+        created_address = (
+            insert(Address)
+            .values(**address.dict())
+            .returning(Address.address_id)
+            .cte("created_address")
+        )
 
-        self.db.add(user)
-        self.db.commit()
+        await self.db.execute(
+            update(User)
+            .filter(User.user_id == user_id)
+            .values(
+                address_id=select(
+                    created_address.c.address_id
+                ).scalar_subquery()
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
@@ -1,29 +1,421 @@
+import asyncio
+import codecs
+import csv
+from collections import Counter
+from typing import AsyncIterator
+
+import orjson
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import String, delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
+
+from src.cache import todo_cache
+from src.config import settings
 from src.dependencies import db_dependency
-from src.models import Todo
-from src.schemas import TodoResponse
+from src.hashing import password_hashing_pool
+from src.models import Priority, Role, Todo, TodoStats, TodoStatsTotal, User
+from src.schemas import (
+    TodoCountsResponse,
+    TodoField,
+    TodoStatsResponse,
+    UserCreate,
+    UserTodoCountsResponse,
+)
+from src.services.todo_service import get_todo_row_dict, select_todos
+from src.pagination import decode_cursor, encode_cursor
 from src.utils import get_todo_not_found
 
+USER_COLUMN_LENGTHS = {
+    column.name: column.type.length
+    for column in User.__table__.columns
+    if column.name in UserCreate.__fields__
+    and isinstance(column.type, String)
+    and column.type.length is not None
+}
+
+
+async def read_lines(
+    chunks: AsyncIterator[bytes], max_line_length: int
+) -> AsyncIterator[tuple[int, bytes | None]]:
+    """
+    The function splits the streamed `chunks` into numbered lines, holding
+    no more than a line and a chunk in memory. The lines longer than
+    `max_line_length` are skipped and yielded as `None`.
+    """
+    buffer = b""
+    line_number = 0
+    is_too_long = False
+
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+
+        for line in lines:
+            line_number += 1
+            is_too_long = is_too_long or len(line) > max_line_length
+            yield line_number, None if is_too_long else line.rstrip(b"\r")
+            is_too_long = False
+
+        if len(buffer) > max_line_length:
+            buffer = b""
+            is_too_long = True
+
+    if buffer or is_too_long:
+        yield line_number + 1, None if is_too_long else buffer.rstrip(b"\r")
+
+
+def add_todo_counts(
+    counts: TodoCountsResponse, priority: Priority, complete: bool, count: int
+) -> None:
+    """
+    The function adds the `count` of the `todos` with the `priority`
+    and `complete` to the `counts`.
+    """
+    counts.total += count
+    counts.complete += count if complete else 0
+    counts.by_priority[priority.value] = (
+        counts.by_priority.get(priority.value, 0) + count
+    )
+
+
+def get_import_error_report(line_number: int, exception: Exception) -> dict:
+    """
+    The function returns the report of an import record rejected
+    with the `exception`.
+    """
+    if isinstance(exception, ValidationError):
+        detail = exception.errors()
+    elif isinstance(exception, HTTPException):
+        detail = exception.detail
+    else:
+        detail = str(exception)
+
+    return {"line": line_number, "status": "error", "detail": detail}
+
 
 class AdminService:
     def __init__(self, db: db_dependency) -> None:
         self.db = db
 
-    def get_todos_from_users(self) -> list[TodoResponse]:
+    async def get_todos_from_users(
+        self, fields: list[TodoField] | None = None
+    ) -> list[dict]:
+        """
+        The method returns a list of all user `todos` with only
+        the requested `fields`.
+        """
+        result = await self.db.execute(
+            select_todos(fields).order_by(Todo.todo_id)
+        )
+
+        return [get_todo_row_dict(row, fields=fields) for row in result]
+
+    async def stream_todos_from_users(
+        self, fields: list[TodoField] | None = None
+    ) -> AsyncIterator[bytes]:
+        """
+        The method streams all user `todos` with only the requested `fields`
+        as NDJSON lines, fetching them from a server-side cursor in batches.
+        """
+        result = await self.db.stream(
+            select_todos(fields)
+            .order_by(Todo.todo_id)
+            .execution_options(yield_per=settings.ADMIN_TODOS_STREAM_BATCH)
+        )
+
+        async for row in result:
+            yield orjson.dumps(get_todo_row_dict(row, fields=fields)) + b"\n"
+
+    async def get_todo_stats(
+        self,
+        users_limit: int,
+        users_after: str | None = None,
+        user_id: int | None = None,
+    ) -> TodoStatsResponse:
+        """
+        The method returns the counts of the `todos` by `priority` and
+        `complete` overall, and per user for a page of `users_limit` users
+        starting after the `users_after` cursor, or for the `user_id` only.
+
+        The counts are read from the summary tables rather than the `todo`
+        table. The overall counts take a bounded number of rows whatever
+        the number of users, and the users are paged by their id.
+        """
+        overall = TodoCountsResponse()
+        totals = await self.db.execute(
+            select(
+                TodoStatsTotal.priority,
+                TodoStatsTotal.complete,
+                func.sum(TodoStatsTotal.count),
+            )
+            .group_by(TodoStatsTotal.priority, TodoStatsTotal.complete)
+            .having(func.sum(TodoStatsTotal.count) > 0)
+        )
+
+        for priority, complete, count in totals:
+            add_todo_counts(overall, priority, complete, count)
+
+        owner_ids = (
+            select(TodoStats.owner_id)
+            .filter(TodoStats.count > 0)
+            .distinct()
+            .order_by(TodoStats.owner_id)
+            .limit(users_limit + 1)
+        )
+
+        if user_id is not None:
+            owner_ids = owner_ids.filter(TodoStats.owner_id == user_id)
+
+        if users_after is not None:
+            cursor = decode_cursor(cursor=users_after, keys={"user_id": int})
+            owner_ids = owner_ids.filter(
+                TodoStats.owner_id > cursor["user_id"]
+            )
+
+        result = await self.db.execute(
+            select(
+                TodoStats.owner_id,
+                TodoStats.priority,
+                TodoStats.complete,
+                TodoStats.count,
+            )
+            .filter(
+                TodoStats.count > 0,
+                TodoStats.owner_id.in_(owner_ids.scalar_subquery()),
+            )
+            .order_by(TodoStats.owner_id)
+        )
+
+        users: dict[int, UserTodoCountsResponse] = {}
+
+        for owner_id, priority, complete, count in result:
+            if owner_id not in users:
+                users[owner_id] = UserTodoCountsResponse(user_id=owner_id)
+
+            add_todo_counts(users[owner_id], priority, complete, count)
+
+        users_next_cursor = None
+
+        if len(users) > users_limit:
+            users.popitem()
+            users_next_cursor = encode_cursor(
+                values={"user_id": next(reversed(users))}
+            )
+
+        return TodoStatsResponse(
+            overall=overall,
+            users=list(users.values()),
+            users_next_cursor=users_next_cursor,
+        )
+
+    async def import_users(
+        self, chunks: AsyncIterator[bytes], import_format: str
+    ) -> AsyncIterator[bytes]:
+        """
+        The method creates users from the streamed CSV or NDJSON `chunks`
+        and streams a report with an NDJSON line per record, followed by
+        the totals.
+
+        The records are validated as they arrive and inserted in batches,
+        each in its own transaction, with the passwords of a batch hashed
+        in parallel. Only a batch of records is held in memory.
+        """
+        statuses = Counter({"created": 0, "error": 0})
+        batch: list[tuple[int, UserCreate]] = []
+
+        async for line_number, user in self._read_import_users(
+            chunks=chunks, import_format=import_format
+        ):
+            if isinstance(user, Exception):
+                reports = [get_import_error_report(line_number, user)]
+            else:
+                batch.append((line_number, user))
+
+                if len(batch) < settings.USER_IMPORT_BATCH_SIZE:
+                    continue
+
+                reports = await self._insert_users(batch=batch)
+                batch = []
+
+            for report in reports:
+                statuses[report["status"]] += 1
+                yield orjson.dumps(report) + b"\n"
+
+        for report in await self._insert_users(batch=batch):
+            statuses[report["status"]] += 1
+            yield orjson.dumps(report) + b"\n"
+
+        yield orjson.dumps(
+            {"created": statuses["created"], "failed": statuses["error"]}
+        ) + b"\n"
+
+    async def _read_import_users(
+        self, chunks: AsyncIterator[bytes], import_format: str
+    ) -> AsyncIterator[tuple[int, UserCreate | Exception]]:
+        """
+        The method parses and validates the streamed records one line at
+        a time, yielding either the user or the reason it was rejected.
+        """
+        header = None
+
+        async for line_number, line in read_lines(
+            chunks=chunks, max_line_length=settings.USER_IMPORT_MAX_LINE_LENGTH
+        ):
+            if line_number == 1 and line is not None:
+                line = line.removeprefix(codecs.BOM_UTF8)
+
+            if line is not None and not line.strip():
+                continue
+
+            try:
+                if line is None:
+                    raise ValueError(
+                        f"The line is longer than "
+                        f"{settings.USER_IMPORT_MAX_LINE_LENGTH} bytes."
+                    )
+
+                if import_format == "csv":
+                    values = next(csv.reader([line.decode()], strict=True))
+
+                    if header is None:
+                        header = values
+                        continue
+
+                    record = {
+                        field: value
+                        for field, value in zip(header, values)
+                        if value
+                    }
+                else:
+                    record = orjson.loads(line)
+
+                yield line_number, self._get_import_user(record=record)
+            except (ValueError, HTTPException, csv.Error) as exception:
+                yield line_number, exception
+
+    @staticmethod
+    def _get_import_user(record: object) -> UserCreate:
         """
-        The method returns a list of all user `todos`.
+        The method validates an import `record`, including the checks
+        that would otherwise fail the insert of its whole batch.
         """
-        todos = self.db.query(Todo).all()
+        if not isinstance(record, dict):
+            raise ValueError("The record must be an object.")
+
+        user = UserCreate(**record)
+
+        if user.role not in Role.__members__:
+            raise ValueError("The `role` must be either `admin` or `user`.")
+
+        for field, length in USER_COLUMN_LENGTHS.items():
+            value = getattr(user, field)
+
+            if value is None:
+                continue
+
+            if len(value) > length:
+                raise ValueError(
+                    f"The `{field}` must be at most {length} characters long."
+                )
+
+            if "\x00" in value:
+                raise ValueError(
+                    f"The `{field}` must not contain NUL characters."
+                )
+
+        return user
+
+    async def _insert_users(
+        self, batch: list[tuple[int, UserCreate]]
+    ) -> list[dict]:
+        """
+        The method hashes the passwords of the `batch` in parallel, inserts
+        its users with a single statement, skipping the existing usernames
+        and emails, and returns the report of every record.
+
+        The import keeps at most one password per worker in the hashing
+        pool queue and waits for room in it when other requests fill the
+        queue, so no record fails because the pool is busy.
+        """
+        if not batch:
+            return []
+
+        semaphore = asyncio.Semaphore(password_hashing_pool.max_workers)
+
+        async def hash_password(password: str) -> str:
+            async with semaphore:
+                return await password_hashing_pool.hash(
+                    password=password, wait=True
+                )
+
+        hashed_passwords = await asyncio.gather(
+            *(hash_password(password=user.password) for _, user in batch),
+            return_exceptions=True,
+        )
+
+        reports = {}
+        rows = {}
+
+        for (line_number, user), hashed_password in zip(
+            batch, hashed_passwords
+        ):
+            if isinstance(hashed_password, Exception):
+                reports[line_number] = get_import_error_report(
+                    line_number, hashed_password
+                )
+            else:
+                rows[line_number] = {
+                    **user.dict(),
+                    "password": hashed_password,
+                    "is_active": True,
+                }
+
+        user_ids = {}
+        detail = "The `username` or `email` already exists."
+
+        if rows:
+            try:
+                result = await self.db.execute(
+                    insert(User)
+                    .on_conflict_do_nothing()
+                    .returning(User.user_id, User.username),
+                    list(rows.values()),
+                )
+                user_ids = {username: user_id for user_id, username in result}
+                await self.db.commit()
+            except DBAPIError:
+                await self.db.rollback()
+                detail = "The batch of the record could not be inserted."
+
+        for line_number, row in rows.items():
+            if row["username"] in user_ids:
+                reports[line_number] = {
+                    "line": line_number,
+                    "status": "created",
+                    "user_id": user_ids.pop(row["username"]),
+                }
+            else:
+                reports[line_number] = get_import_error_report(
+                    line_number, ValueError(detail)
+                )
 
-        return todos
+        return [reports[line_number] for line_number, _ in batch]
 
-    def delete_todo_from_user(self, todo_id: int) -> None:
+    async def delete_todo_from_user(self, todo_id: int) -> None:
         """
-        The method deletes the user's `todo`.
+        The method deletes the user's `todo` with a single statement.
         """
-        todo = self.db.query(Todo).filter(Todo.todo_id == todo_id).first()
+        owner_id = await self.db.scalar(
+            delete(Todo)
+            .filter(Todo.todo_id == todo_id)
+            .returning(Todo.owner_id)
+            .execution_options(synchronize_session=False)
+        )
 
-        if todo is None:
+        if owner_id is None:
             raise get_todo_not_found()
 
-        self.db.query(Todo).filter(Todo.todo_id == todo_id).delete()
-        self.db.commit()
+        await self.db.commit()
+        await todo_cache.invalidate(owner_id=owner_id)
@@ -1,34 +1,162 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert
+
 from src.dependencies import db_dependency
-from src.models import User
-from src.schemas import UserCreate, UserResponse
-from src.utils import get_hashed_password
+from src.hashing import password_hashing_pool
+from src.models import RevokedToken, User
+from src.oauth2 import (
+    check_token_revocation,
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+)
+from src.revocation import token_revocation_list
+from src.schemas import Token, TokenPayload, UserCreate, UserResponse
+from src.utils import get_credentials_exception
 
 
 class AuthService:
     def __init__(self, db: db_dependency) -> None:
         self.db = db
 
-    def get_user_by_username(self, username: str) -> User:
+    async def get_user_by_username(self, username: str) -> User:
         """
         The method returns the `user` by username.
         """
-        user = self.db.query(User).filter(User.username == username).first()
+        user = await self.db.scalar(
+            select(User).filter(User.username == username)
+        )
 
         return user
 
-    def create_user(self, user: UserCreate) -> UserResponse:
+    async def create_user(self, user: UserCreate) -> UserResponse:
         """
         The method creates a new `user`.
         """
-        hashed_password = get_hashed_password(password=user.password)
+        hashed_password = await password_hashing_pool.hash(
+            password=user.password
+        )
         user.password = hashed_password
 
         created_user = User(
             is_active=True,
+            todos=[],
+            address=None,
             **user.dict(),
         )
 
         self.db.add(created_user)
-        self.db.commit()
+        await self.db.commit()
 
         return created_user
+
+    @staticmethod
+    def create_tokens(user: User) -> Token:
+        """
+        The method creates a new pair of `access` and `refresh` tokens.
+        """
+        return Token(
+            access_token=create_access_token(
+                username=user.username, user_id=user.user_id, role=user.role
+            ),
+            token_type="bearer",
+            refresh_token=create_refresh_token(
+                username=user.username, user_id=user.user_id, role=user.role
+            ),
+        )
+
+    async def refresh_tokens(self, refresh_token: str) -> Token:
+        """
+        The method exchanges the `refresh_token` for a new pair of tokens
+        without verifying the password, revoking the used `refresh_token`.
+
+        The token is also checked against the user's cut-off time loaded
+        here, since the revocation list of this worker may not have synced
+        a password change made on another worker yet.
+        """
+        token_payload = decode_token(token=refresh_token, token_type="refresh")
+        await check_token_revocation(token_payload=token_payload, db=self.db)
+
+        user = await self.db.get(User, token_payload.user_id)
+
+        if user is None or not user.is_active:
+            raise get_credentials_exception()
+
+        if (
+            user.tokens_valid_after is not None
+            and token_payload.issued_at < user.tokens_valid_after.timestamp()
+        ):
+            raise get_credentials_exception()
+
+        revoked_jtis = await self._revoke(token_payloads=[token_payload])
+
+        if token_payload.jti not in revoked_jtis:
+            raise get_credentials_exception()
+
+        return self.create_tokens(user=user)
+
+    async def revoke_tokens(
+        self, user: TokenPayload, refresh_token: str | None = None
+    ) -> None:
+        """
+        The method revokes the user's current `access` token and,
+        if given, the user's `refresh_token`, ignoring the tokens
+        that are already revoked.
+        """
+        token_payloads = [user]
+
+        if refresh_token is not None:
+            token_payload = decode_token(
+                token=refresh_token, token_type="refresh"
+            )
+
+            if token_payload.user_id != user.user_id:
+                raise get_credentials_exception()
+
+            token_payloads.append(token_payload)
+
+        await self._revoke(token_payloads=token_payloads)
+
+    async def _revoke(self, token_payloads: list[TokenPayload]) -> set[str]:
+        """
+        The method stores the tokens in the revocation list, purging
+        the revoked tokens that have expired since, and returns the `jti`
+        of the tokens that were not revoked before.
+
+        The tokens are inserted with a single statement that skips the ones
+        already stored, so a token revoked concurrently, for example by
+        another worker, is detected atomically.
+        """
+        await self.db.execute(
+            delete(RevokedToken).where(
+                RevokedToken.expires_at <= datetime.now(tz=timezone.utc)
+            )
+        )
+        revoked_jtis = await self.db.scalars(
+            insert(RevokedToken)
+            .values(
+                [
+                    {
+                        "jti": token_payload.jti,
+                        "user_id": token_payload.user_id,
+                        "expires_at": datetime.fromtimestamp(
+                            token_payload.expires_at, tz=timezone.utc
+                        ),
+                    }
+                    for token_payload in token_payloads
+                ]
+            )
+            .on_conflict_do_nothing()
+            .returning(RevokedToken.jti)
+        )
+        revoked_jtis = set(revoked_jtis)
+        await self.db.commit()
+
+        for token_payload in token_payloads:
+            token_revocation_list.add_token(
+                jti=token_payload.jti, expires_at=token_payload.expires_at
+            )
+
+        return revoked_jtis
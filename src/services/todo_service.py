@@ -1,70 +1,285 @@
+from sqlalchemy import (
+    ARRAY,
+    Integer,
+    Select,
+    any_,
+    delete,
+    func,
+    insert,
+    literal,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+
+from src.cache import todo_cache
 from src.dependencies import db_dependency, user_dependency
-from src.models import Todo, User
+from src.models import TODO_SEARCH_VECTOR, Priority, Todo, User
+from src.pagination import decode_cursor, encode_cursor
 from src.schemas import (
+    TodoBatchDelete,
+    TodoBatchFilter,
+    TodoBatchUpdate,
+    TodoBulkCreate,
     TodoCreate,
+    TodoField,
+    TodoFilter,
+    TodoPage,
     TodoResponse,
     TodoUpdate,
     UserSummaryResponse,
+    get_sparse_todo_response_dict,
+    get_todo_response_dict,
 )
 from src.utils import (
     get_failed_response,
+    get_invalid_cursor,
     get_todo_not_found,
 )
 
 
+TODO_RESPONSE_COLUMNS = (
+    Todo.todo_id,
+    Todo.title,
+    Todo.description,
+    Todo.priority,
+    Todo.complete,
+    User.user_id,
+    User.email,
+    User.username,
+)
+TODO_FIELD_COLUMNS = {
+    TodoField.title: (Todo.title,),
+    TodoField.description: (Todo.description,),
+    TodoField.priority: (Todo.priority,),
+    TodoField.complete: (Todo.complete,),
+    TodoField.todo_id: (Todo.todo_id,),
+    TodoField.owner: (User.user_id, User.email, User.username),
+}
+
+
+def select_todos(fields: list[TodoField] | None, *extra_columns) -> Select:
+    """
+    The function returns a query of the columns of the `todo` `fields`,
+    or of all `TodoResponse` columns when no `fields` are given, along
+    with the `extra_columns` not selected already.
+
+    The owner is joined only when the `owner` field is selected.
+    """
+    if fields is None:
+        return select(*TODO_RESPONSE_COLUMNS).join(User)
+
+    columns = [
+        column for field in fields for column in TODO_FIELD_COLUMNS[field]
+    ]
+    column_keys = {column.key for column in columns}
+    query = select(
+        *columns,
+        *(column for column in extra_columns if column.key not in column_keys),
+    ).select_from(Todo)
+
+    if TodoField.owner in fields:
+        query = query.join(User)
+
+    return query
+
+
+def get_todo_row_dict(row, fields: list[TodoField] | None) -> dict:
+    """
+    The function returns the `todo` row selected by `select_todos`
+    as a dict shaped like `TodoResponse`.
+    """
+    if fields is None:
+        return get_todo_response_dict(*row)
+
+    return get_sparse_todo_response_dict(values=row._mapping, fields=fields)
+
+
 class TodoService:
     def __init__(self, db: db_dependency, user: user_dependency) -> None:
         self.db = db
         self.user = user
 
-    def get_todos(self) -> list[TodoResponse]:
+    async def get_todos_version(self) -> int:
         """
-        The method returns a list of all `todos` by owner.
+        The method returns the version of the owner's `todos`, which changes
+        on every write to them.
         """
         if self.user is None:
             raise get_failed_response(detail="Authentication failed.")
 
-        result = (
-            self.db.query(Todo, User)
-            .join(User)
+        return await self.db.scalar(
+            select(User.todos_version).filter(
+                User.user_id == self.user.user_id
+            )
+        )
+
+    async def get_todos(
+        self,
+        limit: int,
+        after: str | None = None,
+        todo_filter: TodoFilter = TodoFilter(),
+        fields: list[TodoField] | None = None,
+        version: int | None = None,
+    ) -> TodoPage:
+        """
+        The method returns a page of `todos` by owner matching the
+        `todo_filter`, starting after the `after` cursor, with only
+        the requested `fields`.
+        """
+        if self.user is None:
+            raise get_failed_response(detail="Authentication failed.")
+
+        return await todo_cache.get_or_load(
+            owner_id=self.user.user_id,
+            key=(
+                f"todos:{version}:{limit}:{after}:{todo_filter.json()}:"
+                f"{fields and ','.join(fields)}"
+            ),
+            loader=lambda: self._load_todos(
+                limit=limit,
+                after=after,
+                todo_filter=todo_filter,
+                fields=fields,
+            ),
+        )
+
+    async def _load_todos(
+        self,
+        limit: int,
+        after: str | None,
+        todo_filter: TodoFilter,
+        fields: list[TodoField] | None,
+    ) -> TodoPage:
+        """
+        The method loads a page of `todos` by owner from the database,
+        selecting only the columns of the `fields` and the sort key.
+        """
+        sort_key = todo_filter.sort.lstrip("-")
+        descending = todo_filter.sort.startswith("-")
+        sort_columns = [Todo.todo_id]
+
+        if sort_key != "todo_id":
+            sort_columns.insert(0, getattr(Todo, sort_key))
+
+        query = (
+            select_todos(fields, *sort_columns)
             .filter(Todo.owner_id == self.user.user_id)
-            .all()
+            .filter(*self._get_filter_conditions(todo_filter=todo_filter))
+            .order_by(
+                *(
+                    column.desc() if descending else column
+                    for column in sort_columns
+                )
+            )
+            .limit(limit + 1)
         )
 
-        todos = [
-            TodoResponse(
-                **todo.__dict__, owner=UserSummaryResponse(**owner.__dict__)
+        if after is not None:
+            cursor = self._decode_sort_cursor(
+                after=after, sort=todo_filter.sort, sort_key=sort_key
+            )
+            keyset = tuple_(*sort_columns)
+            boundary = tuple_(
+                *(
+                    literal(cursor[column.key], type_=column.type)
+                    for column in sort_columns
+                )
             )
-            for todo, owner in result
+            query = query.filter(
+                keyset < boundary if descending else keyset > boundary
+            )
+
+        result = (await self.db.execute(query)).all()
+
+        todos = [
+            get_todo_row_dict(row, fields=fields) for row in result[:limit]
         ]
 
-        return todos
+        next_cursor = None
+
+        if len(result) > limit:
+            last_todo = result[limit - 1]
+            next_cursor = encode_cursor(
+                values={
+                    "sort": todo_filter.sort,
+                    **{
+                        column.key: getattr(last_todo, column.key)
+                        for column in sort_columns
+                    },
+                }
+            )
+
+        return TodoPage(todos=todos, next_cursor=next_cursor)
 
-    def get_todo(self, todo_id: int) -> TodoResponse:
+    async def search_todos(
+        self, q: str, limit: int, offset: int = 0
+    ) -> list[dict]:
+        """
+        The method returns the owner's `todos` matching the search query `q`,
+        the most relevant first.
+        """
+        if self.user is None:
+            raise get_failed_response(detail="Authentication failed.")
+
+        query = (
+            select(*TODO_RESPONSE_COLUMNS)
+            .join(User)
+            .filter(Todo.owner_id == self.user.user_id)
+            .limit(limit)
+            .offset(offset)
+        )
+
+        if self.db.bind.dialect.name == "postgresql":
+            ts_query = func.websearch_to_tsquery("english", q)
+            rank = func.ts_rank(TODO_SEARCH_VECTOR, ts_query)
+            query = query.filter(TODO_SEARCH_VECTOR.op("@@")(ts_query))
+            query = query.order_by(rank.desc(), Todo.todo_id)
+        else:
+            query = query.filter(
+                or_(
+                    Todo.title.icontains(q, autoescape=True),
+                    Todo.description.icontains(q, autoescape=True),
+                )
+            )
+            query = query.order_by(Todo.todo_id)
+
+        result = await self.db.execute(query)
+
+        return [get_todo_response_dict(*row) for row in result]
+
+    async def get_todo(self, todo_id: int, version: int | None = None) -> dict:
         """
         The method returns the user's `todo`.
         """
         if self.user is None:
             raise get_failed_response(detail="Authentication failed.")
 
-        result = (
-            self.db.query(Todo, User)
+        return await todo_cache.get_or_load(
+            owner_id=self.user.user_id,
+            key=f"todo:{version}:{todo_id}",
+            loader=lambda: self._load_todo(todo_id=todo_id),
+        )
+
+    async def _load_todo(self, todo_id: int) -> dict:
+        """
+        The method loads the user's `todo` from the database.
+        """
+        result = await self.db.execute(
+            select(*TODO_RESPONSE_COLUMNS)
             .join(User)
             .filter(Todo.todo_id == todo_id)
             .filter(Todo.owner_id == self.user.user_id)
-            .first()
         )
+        result = result.first()
 
         if result is not None:
-            todo, owner = result
-
-            return TodoResponse(
-                **todo.__dict__, owner=UserSummaryResponse(**owner.__dict__)
-            )
+            return get_todo_response_dict(*result)
 
         raise get_todo_not_found()
 
-    def create_todo(self, todo: TodoCreate) -> TodoResponse:
+    async def create_todo(self, todo: TodoCreate) -> TodoResponse:
         """
         The method creates a new `todo`.
         """
@@ -74,53 +289,180 @@ class TodoService:
         created_todo = Todo(**todo.dict(), owner_id=self.user.user_id)
 
         self.db.add(created_todo)
-        self.db.commit()
+        await self.db.commit()
+        await todo_cache.invalidate(owner_id=self.user.user_id)
+
+        owner = await self.db.get(User, self.user.user_id)
+
+        return TodoResponse(
+            **created_todo.__dict__,
+            owner=UserSummaryResponse(**owner.__dict__),
+        )
+
+    async def create_todos(self, todos: TodoBulkCreate) -> list[int]:
+        """
+        The method creates new `todos` with a single multi-row insert
+        and returns their ids in the order of the given `todos`.
+        """
+        if self.user is None:
+            raise get_failed_response(detail="Authentication failed.")
+
+        todo_ids = await self.db.scalars(
+            insert(Todo).returning(Todo.todo_id, sort_by_parameter_order=True),
+            [{**todo.dict(), "owner_id": self.user.user_id} for todo in todos],
+        )
+        todo_ids = todo_ids.all()
+
+        await self.db.commit()
+        await todo_cache.invalidate(owner_id=self.user.user_id)
 
-        return created_todo
+        return todo_ids
 
-    def update_todo(self, todo: TodoUpdate, todo_id: int) -> None:
+    async def update_todo(self, todo: TodoUpdate, todo_id: int) -> None:
         """
-        The method updates an existing `todo`.
+        The method updates an existing `todo` with a single statement.
         """
         if self.user is None:
             raise get_failed_response(detail="Authentication failed.")
 
-        todo_to_update = (
-            self.db.query(Todo)
+        updated_todo_id = await self.db.scalar(
+            update(Todo)
             .filter(Todo.todo_id == todo_id)
             .filter(Todo.owner_id == self.user.user_id)
-            .first()
+            .values(**todo.dict())
+            .returning(Todo.todo_id)
+            .execution_options(synchronize_session=False)
         )
 
-        if todo_to_update is None:
+        if updated_todo_id is None:
             raise get_todo_not_found()
 
-        todo_to_update.title = todo.title
-        todo_to_update.description = todo.description
-        todo_to_update.priority = todo.priority
-        todo_to_update.complete = todo.complete
+        await self.db.commit()
+        await todo_cache.invalidate(owner_id=self.user.user_id)
+
+    async def update_todos(self, todos: TodoBatchUpdate) -> list[int]:
+        """
+        The method updates all `todos` matching the batch filter with
+        a single statement and returns the ids of the matched `todos`.
+        """
+        if self.user is None:
+            raise get_failed_response(detail="Authentication failed.")
+
+        todo_ids = await self.db.scalars(
+            update(Todo)
+            .where(*self._get_batch_conditions(batch_filter=todos.filter))
+            .values(**todos.dict(exclude={"filter"}, exclude_none=True))
+            .returning(Todo.todo_id)
+            .execution_options(synchronize_session=False)
+        )
+        todo_ids = sorted(todo_ids)
+
+        await self.db.commit()
+        await todo_cache.invalidate(owner_id=self.user.user_id)
+
+        return todo_ids
+
+    async def delete_todos(self, todos: TodoBatchDelete) -> list[int]:
+        """
+        The method deletes all `todos` matching the batch filter with
+        a single statement and returns the ids of the matched `todos`.
+        """
+        if self.user is None:
+            raise get_failed_response(detail="Authentication failed.")
+
+        todo_ids = await self.db.scalars(
+            delete(Todo)
+            .where(*self._get_batch_conditions(batch_filter=todos.filter))
+            .returning(Todo.todo_id)
+            .execution_options(synchronize_session=False)
+        )
+        todo_ids = sorted(todo_ids)
+
+        await self.db.commit()
+        await todo_cache.invalidate(owner_id=self.user.user_id)
+
+        return todo_ids
+
+    @staticmethod
+    def _get_filter_conditions(todo_filter: TodoFilter) -> list:
+        """
+        The method returns the `WHERE` conditions of the `todo_filter`.
+        """
+        conditions = []
+
+        if todo_filter.complete is not None:
+            conditions.append(Todo.complete == todo_filter.complete)
+
+        if todo_filter.priority is not None:
+            conditions.append(Todo.priority == todo_filter.priority)
+
+        if todo_filter.priority_min is not None:
+            conditions.append(Todo.priority >= todo_filter.priority_min)
+
+        if todo_filter.priority_max is not None:
+            conditions.append(Todo.priority <= todo_filter.priority_max)
+
+        return conditions
+
+    @staticmethod
+    def _decode_sort_cursor(after: str, sort: str, sort_key: str) -> dict:
+        """
+        The method decodes the `after` cursor of the given `sort` order.
+        """
+        keys = {"sort": str, "todo_id": int}
+
+        if sort_key == "priority":
+            keys["priority"] = int
+        elif sort_key == "title":
+            keys["title"] = str
+
+        cursor = decode_cursor(cursor=after, keys=keys)
+
+        if cursor["sort"] != sort:
+            raise get_invalid_cursor()
+
+        if sort_key == "priority":
+            try:
+                cursor["priority"] = Priority(cursor["priority"])
+            except ValueError:
+                raise get_invalid_cursor()
+
+        return cursor
+
+    def _get_batch_conditions(self, batch_filter: TodoBatchFilter) -> list:
+        """
+        The method returns the `WHERE` conditions of the batch filter.
+        """
+        conditions = [Todo.owner_id == self.user.user_id]
+
+        if batch_filter.todo_ids is not None:
+            conditions.append(
+                Todo.todo_id
+                == any_(literal(batch_filter.todo_ids, type_=ARRAY(Integer)))
+            )
+
+        if batch_filter.complete is not None:
+            conditions.append(Todo.complete == batch_filter.complete)
 
-        self.db.add(todo_to_update)
-        self.db.commit()
+        return conditions
 
-    def delete_todo(self, todo_id: int) -> None:
+    async def delete_todo(self, todo_id: int) -> None:
         """
-        The method deletes an existing `todo`.
+        The method deletes an existing `todo` with a single statement.
         """
         if self.user is None:
             raise get_failed_response(detail="Authentication failed.")
 
-        todo = (
-            self.db.query(Todo)
+        deleted_todo_id = await self.db.scalar(
+            delete(Todo)
             .filter(Todo.todo_id == todo_id)
             .filter(Todo.owner_id == self.user.user_id)
-            .first()
+            .returning(Todo.todo_id)
+            .execution_options(synchronize_session=False)
         )
 
-        if todo is None:
+        if deleted_todo_id is None:
             raise get_todo_not_found()
 
-        self.db.query(Todo).filter(Todo.todo_id == todo_id).filter(
-            Todo.owner_id == self.user.user_id
-        ).delete()
-        self.db.commit()
+        await self.db.commit()
+        await todo_cache.invalidate(owner_id=self.user.user_id)
@@ -1,38 +1,99 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from src.config import settings
 from src.dependencies import db_dependency
+from src.hashing import password_hashing_pool
 from src.models import User
-from src.schemas import UserVerification, UserResponse
-from src.utils import verify_password, get_hashed_password, get_failed_response
+from src.revocation import token_revocation_list
+from src.schemas import (
+    TokenPayload,
+    UserBase,
+    UserResponse,
+    UserVerification,
+)
+from src.services.todo_service import TodoService
+from src.utils import get_failed_response
 
 
 class UserService:
     def __init__(self, db: db_dependency) -> None:
         self.db = db
 
-    def get_user_by_id(self, user_id: int) -> UserResponse:
+    async def get_user_by_id(
+        self,
+        user_id: int,
+        include: set[str] = frozenset(),
+        todos_limit: int = settings.TODOS_PAGE_SIZE,
+        todos_after: str | None = None,
+    ) -> UserResponse:
         """
-        The method returns the `user` by id.
+        The method returns the `user's` profile by id, expanded with only
+        the relations named in `include`.
+
+        The `address` is joined into the same query, while the `todos` are
+        loaded as a page starting after the `todos_after` cursor. Relations
+        that are not included are left unset on the response.
         """
-        user = self.db.query(User).filter(User.user_id == user_id).first()
+        query = select(User).filter(User.user_id == user_id)
+
+        if "address" in include:
+            query = query.options(joinedload(User.address))
+
+        user = await self.db.scalar(query)
+
+        if user is None:
+            raise get_failed_response(detail="Authentication failed.")
+
+        expansions = {}
 
-        return user
+        if "address" in include:
+            expansions["address"] = user.address
 
-    def change_password(
+        if "todos" in include:
+            todo_service = TodoService(
+                db=self.db, user=TokenPayload(user_id=user_id)
+            )
+            version = await todo_service.get_todos_version()
+            page = await todo_service.get_todos(
+                limit=todos_limit, after=todos_after, version=version
+            )
+            expansions["todos"] = page.todos
+            expansions["todos_next_cursor"] = page.next_cursor
+
+        return UserResponse(
+            **{field: getattr(user, field) for field in UserBase.__fields__},
+            user_id=user.user_id,
+            is_active=user.is_active,
+            **expansions,
+        )
+
+    async def change_password(
         self, user_id: int, user_verification: UserVerification
     ) -> None:
         """
-        The method changes the `user's` password.
+        The method changes the `user's` password and revokes all of
+        the user's outstanding tokens.
         """
-        user = self.get_user_by_id(user_id=user_id)
+        user = await self.db.get(User, user_id)
 
-        if not verify_password(
+        if not await password_hashing_pool.verify(
             plain_password=user_verification.password,
             hashed_password=user.password,
         ):
             raise get_failed_response(detail="Error on password change.")
 
-        user.password = get_hashed_password(
+        user.password = await password_hashing_pool.hash(
             password=user_verification.new_password
         )
 
+        user.tokens_valid_after = datetime.now(tz=timezone.utc)
+
         self.db.add(user)
-        self.db.commit()
+        await self.db.commit()
+
+        token_revocation_list.add_user_cutoff(
+            user_id=user_id, cutoff=user.tokens_valid_after.timestamp()
+        )
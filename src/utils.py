@@ -1,3 +1,6 @@
+import hashlib
+import math
+
 from fastapi import HTTPException
 from passlib.context import CryptContext
 from starlette import status
@@ -19,6 +22,31 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return bcrypt_context.verify(secret=plain_password, hash=hashed_password)
 
 
+def get_etag(*parts: object) -> str:
+    """
+    The function returns a strong `ETag` derived from the given `parts`.
+    """
+    digest = hashlib.sha256(":".join(map(str, parts)).encode()).hexdigest()
+
+    return f'"{digest[:32]}"'
+
+
+def is_etag_matched(if_none_match: str | None, etag: str) -> bool:
+    """
+    The function checks whether the `If-None-Match` header matches the `etag`.
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    return any(
+        tag.strip().removeprefix("W/") == etag
+        for tag in if_none_match.split(",")
+    )
+
+
 def get_credentials_exception() -> HTTPException:
     """
     The function returns `credentials_exception` response.
@@ -50,6 +78,49 @@ def get_invalid_credentials() -> HTTPException:
     )
 
 
+def get_invalid_cursor() -> HTTPException:
+    """
+    The function returns a response if the pagination cursor is malformed.
+    """
+    return HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="Invalid pagination cursor.",
+    )
+
+
+def get_password_hashing_unavailable() -> HTTPException:
+    """
+    The function returns a response if the password hashing queue is full.
+    """
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many password operations in progress, try again later.",
+        headers={"Retry-After": "1"},
+    )
+
+
+def get_too_many_requests(retry_after: float) -> HTTPException:
+    """
+    The function returns a response if the client is over its rate limit.
+    """
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many attempts, try again later.",
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+def get_unsupported_media_type(detail: str) -> HTTPException:
+    """
+    The function returns a response if the request body has
+    an unsupported format.
+    """
+    return HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail=detail,
+    )
+
+
 def get_todo_not_found() -> HTTPException:
     """
     The function returns a response if `todo` is not found.
@@ -1,16 +1,23 @@
+import asyncio
 from typing import Type
 
-from pytest import fixture
+from pytest import MonkeyPatch, fixture
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 from starlette import status
 
+from src.cache import todo_cache
 from src.config import settings
-from src.database import get_db
+from src.database import QueryStats, get_db
 from src.main import app
 from src.models import Base, Todo
-from src.oauth2 import create_access_token
+from src.oauth2 import create_access_token, token_cache
+from src.query_budget import query_budget
+from src.rate_limit import login_rate_limiter
+from src.revocation import token_revocation_list
 
 SQLALCHEMY_DATABASE_URL = (
     f"postgresql://"
@@ -27,6 +34,19 @@ TestingSessionLocal = sessionmaker(
     autocommit=False, autoflush=False, bind=engine
 )
 
+async_engine = create_async_engine(
+    url=SQLALCHEMY_DATABASE_URL.replace(
+        "postgresql://", "postgresql+asyncpg://", 1
+    ),
+    poolclass=NullPool,
+)
+
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+query_budget.mode = "raise"
+
 
 @fixture
 def session() -> Session:
@@ -50,14 +70,17 @@ def client(session: Session) -> TestClient:
     Test client initialization function.
     """
 
-    def override_get_db():
-        try:
-            yield session
-        finally:
-            session.close()
+    async def override_get_db():
+        async with TestingAsyncSessionLocal() as db:
+            yield db
 
     app.dependency_overrides[get_db] = override_get_db
 
+    asyncio.run(todo_cache.clear())
+    asyncio.run(token_cache.clear())
+    token_revocation_list.clear()
+    asyncio.run(login_rate_limiter.clear())
+
     yield TestClient(app=app)
 
 
@@ -203,3 +226,21 @@ def test_todos(
     session.commit()
 
     return session.query(Todo).all()
+
+
+@fixture
+def executed_statements(monkeypatch: MonkeyPatch) -> list[str]:
+    """
+    The function collects the shapes of the statements executed
+    by every request made through the test client.
+    """
+    statements = []
+    check = query_budget.check
+
+    def record_statements(query_stats: QueryStats, route: str) -> None:
+        statements.extend(query_stats.statements.elements())
+        check(query_stats=query_stats, route=route)
+
+    monkeypatch.setattr(query_budget, "check", record_statements)
+
+    return statements
@@ -54,7 +54,9 @@ def test_authorized_user_create_address(
         },
     )
 
-    response_after_creation = authorized_user_client.get(url="/users/me")
+    response_after_creation = authorized_user_client.get(
+        url="/users/me", params={"include": "address"}
+    )
 
     user = UserResponse(**response_after_creation.json())
 
@@ -63,3 +65,24 @@ def test_authorized_user_create_address(
     assert user.address.country == country
     assert user.address.postal_code == postal_code
     assert response.status_code == status.HTTP_201_CREATED
+
+
+def test_authorized_user_create_address_single_statement(
+    authorized_user_client: TestClient, executed_statements: list[str]
+) -> None:
+    authorized_user_client.get(url="/users/me")
+    executed_statements.clear()
+
+    response = authorized_user_client.post(
+        url="/addresses/",
+        json={
+            "city": "Lviv",
+            "state": "Lviv",
+            "country": "Ukraine",
+            "postal_code": "79000",
+        },
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len(executed_statements) == 1
+    assert executed_statements[0].startswith("WITH created_address AS")
@@ -1,9 +1,14 @@
+import json
 from typing import Type
 
 from fastapi.testclient import TestClient
+from pytest import MonkeyPatch
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
 from starlette import status
 
-from src.models import Todo
+from src.config import settings
+from src.models import Todo, User
 from src.schemas import TodoResponse
 
 
@@ -34,6 +39,44 @@ def test_authorized_admin_read_todos_from_users(
     assert response.status_code == status.HTTP_200_OK
 
 
+def test_authorized_admin_stream_todos_from_users(
+    authorized_admin_client: TestClient, test_todos: list[Type[Todo]]
+) -> None:
+    response = authorized_admin_client.get(
+        url="/admin/todos/", params={"stream": True}
+    )
+
+    todos = [
+        TodoResponse(**json.loads(line))
+        for line in response.iter_lines()
+        if line
+    ]
+
+    assert [todo.todo_id for todo in todos] == [
+        todo.todo_id for todo in test_todos
+    ]
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_authorized_admin_read_todos_from_users_sparse_fields(
+    authorized_admin_client: TestClient, test_todos: list[Type[Todo]]
+) -> None:
+    response = authorized_admin_client.get(
+        url="/admin/todos/", params={"fields": "complete,owner"}
+    )
+
+    assert response.json()[0] == {
+        "complete": False,
+        "owner": {
+            "user_id": test_todos[0].owner_id,
+            "email": "vasyl.poremchuk@gmail.com",
+            "username": "vasyl",
+        },
+    }
+    assert response.status_code == status.HTTP_200_OK
+
+
 def test_unauthorized_user_delete_todos_from_users(
     client: TestClient, test_todos: list[Type[Todo]]
 ) -> None:
@@ -62,3 +105,255 @@ def test_authorized_admin_delete_todos_from_users(
 
     assert len(response_after_deletion.json()) == 2
     assert response.status_code == status.HTTP_204_NO_CONTENT
+
+
+def test_authorized_user_read_todo_stats(
+    authorized_user_client: TestClient,
+) -> None:
+    response = authorized_user_client.get(url="/admin/stats")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_authorized_admin_read_todo_stats(
+    authorized_admin_client: TestClient, test_todos: list[Type[Todo]]
+) -> None:
+    authorized_admin_client.put(
+        url=f"/todos/{test_todos[1].todo_id}",
+        json={
+            "title": "Plan Charity Event",
+            "description": "Coordinate a charity event.",
+            "priority": 2,
+            "complete": True,
+        },
+    )
+    authorized_admin_client.delete(url=f"/admin/todos/{test_todos[2].todo_id}")
+
+    response = authorized_admin_client.get(url="/admin/stats")
+
+    assert response.json() == {
+        "overall": {
+            "total": 2,
+            "complete": 1,
+            "by_priority": {"2": 1, "3": 1},
+        },
+        "users": [
+            {
+                "user_id": test_todos[0].owner_id,
+                "total": 2,
+                "complete": 1,
+                "by_priority": {"2": 1, "3": 1},
+            }
+        ],
+        "users_next_cursor": None,
+    }
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_authorized_admin_read_todo_stats_pages_users(
+    authorized_admin_client: TestClient, test_todos: list[Type[Todo]]
+) -> None:
+    admin_id, user_id = test_todos[0].owner_id, test_todos[2].owner_id
+
+    response = authorized_admin_client.get(
+        url="/admin/stats", params={"users_limit": 1}
+    )
+    first_page = response.json()
+
+    assert first_page["overall"] == {
+        "total": 3,
+        "complete": 0,
+        "by_priority": {"3": 1, "4": 1, "5": 1},
+    }
+    assert [user["user_id"] for user in first_page["users"]] == [admin_id]
+    assert first_page["users_next_cursor"] is not None
+
+    response = authorized_admin_client.get(
+        url="/admin/stats",
+        params={
+            "users_limit": 1,
+            "users_after": first_page["users_next_cursor"],
+        },
+    )
+    second_page = response.json()
+
+    assert second_page["overall"] == first_page["overall"]
+    assert second_page["users"] == [
+        {
+            "user_id": user_id,
+            "total": 1,
+            "complete": 0,
+            "by_priority": {"4": 1},
+        }
+    ]
+    assert second_page["users_next_cursor"] is None
+
+    response = authorized_admin_client.get(
+        url="/admin/stats", params={"user_id": user_id}
+    )
+
+    assert response.json()["users"] == second_page["users"]
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_authorized_admin_read_todo_stats_after_user_deletion(
+    authorized_admin_client: TestClient,
+    session: Session,
+    test_todos: list[Type[Todo]],
+) -> None:
+    session.execute(
+        delete(User).filter(User.user_id == test_todos[2].owner_id)
+    )
+    session.commit()
+
+    response = authorized_admin_client.get(url="/admin/stats")
+
+    assert response.json()["overall"] == {
+        "total": 2,
+        "complete": 0,
+        "by_priority": {"3": 1, "5": 1},
+    }
+    assert [user["user_id"] for user in response.json()["users"]] == [
+        test_todos[0].owner_id
+    ]
+
+
+def test_authorized_user_import_users(
+    authorized_user_client: TestClient,
+) -> None:
+    response = authorized_user_client.post(
+        url="/admin/users/import",
+        content=b"",
+        headers={"Content-Type": "text/csv"},
+    )
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_authorized_admin_import_users_unsupported_media_type(
+    authorized_admin_client: TestClient,
+) -> None:
+    response = authorized_admin_client.post(
+        url="/admin/users/import",
+        content=b"{}",
+        headers={"Content-Type": "application/xml"},
+    )
+
+    assert response.status_code == status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+
+
+def test_authorized_admin_import_users_csv(
+    authorized_admin_client: TestClient,
+) -> None:
+    content = (
+        b"\xef\xbb\xbf"
+        b"email,username,password,role,first_name,last_name,phone_number\r\n"
+        b"stephen.curry@gmail.com,stephen,Ch3fCurry!,user,Stephen,Curry,\r\n"
+        b"vasyl.poremchuk@gmail.com,vasyl,V@syl1234,user,,,\r\n"
+        b"kevin.durant@gmail.com,kd,K3v1nDur@nt,user,,,\r\n"
+        b"\r\n"
+        b"kyrie.irving@gmail.com,kyrie,Uncl3Drew!,admin,Kyrie,Irving,\r\n"
+    )
+
+    response = authorized_admin_client.post(
+        url="/admin/users/import",
+        content=content,
+        headers={"Content-Type": "text/csv; charset=utf-8"},
+    )
+    reports = [json.loads(line) for line in response.iter_lines()]
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert [report.get("status") for report in reports[:-1]] == [
+        "error",
+        "created",
+        "error",
+        "created",
+    ]
+    assert [report.get("line") for report in reports[:-1]] == [4, 2, 3, 6]
+    assert reports[2]["detail"] == (
+        "The `username` or `email` already exists."
+    )
+    assert reports[-1] == {"created": 2, "failed": 2}
+
+    login = authorized_admin_client.post(
+        url="/auth/token",
+        data={"username": "kyrie", "password": "Uncl3Drew!"},
+    )
+
+    assert login.status_code == status.HTTP_201_CREATED
+
+
+def test_authorized_admin_import_users_csv_malformed_rows(
+    authorized_admin_client: TestClient,
+) -> None:
+    content = (
+        b"email,username,password,role\n"
+        b"klay.thompson@gmail.com,kl\x00ay,Spl@shBro11,user\n"
+        b'"draymond.green@gmail.com,draymond,Dr@ym0nd23,user\n'
+        b"andre.iguodala@gmail.com,andre,Igu0d@la9,user\n"
+    )
+
+    response = authorized_admin_client.post(
+        url="/admin/users/import",
+        content=content,
+        headers={"Content-Type": "text/csv"},
+    )
+    reports = [json.loads(line) for line in response.iter_lines()]
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [report.get("status") for report in reports[:-1]] == [
+        "error",
+        "error",
+        "created",
+    ]
+    assert reports[-1] == {"created": 1, "failed": 2}
+
+
+def test_authorized_admin_import_users_ndjson(
+    authorized_admin_client: TestClient, monkeypatch: MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "USER_IMPORT_BATCH_SIZE", 2)
+    records = [
+        {
+            "email": f"player.{index}@gmail.com",
+            "username": f"player{index}",
+            "password": f"Pl@yer{index}123",
+            "role": "user",
+        }
+        for index in range(3)
+    ]
+    records.insert(1, {**records[0], "email": "player.copy@gmail.com"})
+    records.insert(2, {**records[2], "role": "owner"})
+    content = b"\n".join(
+        [json.dumps(record).encode() for record in records] + [b"[]", b"{"]
+    )
+
+    response = authorized_admin_client.post(
+        url="/admin/users/import",
+        content=content,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    reports = {
+        report.get("line"): report
+        for report in map(json.loads, response.iter_lines())
+    }
+
+    assert response.status_code == status.HTTP_200_OK
+    assert {
+        line: report["status"]
+        for line, report in reports.items()
+        if line is not None
+    } == {
+        1: "created",
+        2: "error",
+        3: "error",
+        4: "created",
+        5: "created",
+        6: "error",
+        7: "error",
+    }
+    assert reports[2]["detail"] == (
+        "The `username` or `email` already exists."
+    )
+    assert reports[None] == {"created": 3, "failed": 4}
@@ -1,8 +1,9 @@
 from fastapi.testclient import TestClient
 from jose import jwt
-from pytest import mark
+from pytest import MonkeyPatch, mark
 from starlette import status
 
+from src.config import settings
 from src.oauth2 import ALGORITHM, SECRET_KEY
 from src.schemas import Token, UserResponse
 
@@ -95,3 +96,210 @@ def test_invalid_credentials(
     )
 
     assert response.status_code == status_code
+
+
+def test_refresh_access_token(
+    client: TestClient, test_user: dict[str, int | str]
+) -> None:
+    response = client.post(
+        url="/auth/token",
+        data={
+            "username": test_user["username"],
+            "password": test_user["password"],
+        },
+    )
+    login_response = Token(**response.json())
+
+    response = client.post(
+        url="/auth/refresh",
+        json={"refresh_token": login_response.refresh_token},
+    )
+    refresh_response = Token(**response.json())
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert refresh_response.refresh_token != login_response.refresh_token
+
+    response = client.get(
+        url="/users/me",
+        headers={"Authorization": f"Bearer {refresh_response.access_token}"},
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+
+    response = client.post(
+        url="/auth/refresh",
+        json={"refresh_token": login_response.refresh_token},
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_refresh_with_rotated_token_on_another_worker(
+    client: TestClient,
+    test_user: dict[str, int | str],
+    monkeypatch: MonkeyPatch,
+) -> None:
+    async def skip_token_revocation_check(**kwargs) -> None:
+        pass
+
+    response = client.post(
+        url="/auth/token",
+        data={
+            "username": test_user["username"],
+            "password": test_user["password"],
+        },
+    )
+    login_response = Token(**response.json())
+
+    client.post(
+        url="/auth/refresh",
+        json={"refresh_token": login_response.refresh_token},
+    )
+    monkeypatch.setattr(
+        "src.services.auth_service.check_token_revocation",
+        skip_token_revocation_check,
+    )
+
+    response = client.post(
+        url="/auth/refresh",
+        json={"refresh_token": login_response.refresh_token},
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_refresh_after_password_change_on_another_worker(
+    client: TestClient,
+    test_user: dict[str, int | str],
+    monkeypatch: MonkeyPatch,
+) -> None:
+    async def skip_token_revocation_check(**kwargs) -> None:
+        pass
+
+    response = client.post(
+        url="/auth/token",
+        data={
+            "username": test_user["username"],
+            "password": test_user["password"],
+        },
+    )
+    login_response = Token(**response.json())
+
+    response = client.put(
+        url="/users/reset-password",
+        json={
+            "password": test_user["password"],
+            "new_password": "N3wp@ssw0rd",
+        },
+        headers={"Authorization": f"Bearer {login_response.access_token}"},
+    )
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    monkeypatch.setattr(
+        "src.services.auth_service.check_token_revocation",
+        skip_token_revocation_check,
+    )
+
+    response = client.post(
+        url="/auth/refresh",
+        json={"refresh_token": login_response.refresh_token},
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_refresh_with_access_token(
+    client: TestClient, token_user: str
+) -> None:
+    response = client.post(
+        url="/auth/refresh", json={"refresh_token": token_user}
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_revoke_tokens(
+    client: TestClient, test_user: dict[str, int | str]
+) -> None:
+    response = client.post(
+        url="/auth/token",
+        data={
+            "username": test_user["username"],
+            "password": test_user["password"],
+        },
+    )
+    login_response = Token(**response.json())
+    headers = {"Authorization": f"Bearer {login_response.access_token}"}
+
+    response = client.post(
+        url="/auth/revoke",
+        json={"refresh_token": login_response.refresh_token},
+        headers=headers,
+    )
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = client.get(url="/users/me", headers=headers)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = client.post(
+        url="/auth/refresh",
+        json={"refresh_token": login_response.refresh_token},
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_revoke_tokens_with_rotated_refresh_token(
+    client: TestClient, test_user: dict[str, int | str]
+) -> None:
+    response = client.post(
+        url="/auth/token",
+        data={
+            "username": test_user["username"],
+            "password": test_user["password"],
+        },
+    )
+    login_response = Token(**response.json())
+    client.post(
+        url="/auth/refresh",
+        json={"refresh_token": login_response.refresh_token},
+    )
+    headers = {"Authorization": f"Bearer {login_response.access_token}"}
+
+    response = client.post(
+        url="/auth/revoke",
+        json={"refresh_token": login_response.refresh_token},
+        headers=headers,
+    )
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = client.get(url="/users/me", headers=headers)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_login_rate_limit_per_username(
+    client: TestClient, test_user: dict[str, int | str]
+) -> None:
+    for _ in range(settings.LOGIN_RATE_LIMIT_PER_USERNAME):
+        response = client.post(
+            url="/auth/token",
+            data={"username": test_user["username"], "password": "Password"},
+        )
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    response = client.post(
+        url="/auth/token",
+        data={
+            "username": test_user["username"],
+            "password": test_user["password"],
+        },
+    )
+
+    assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert int(response.headers["Retry-After"]) >= 1
@@ -0,0 +1,82 @@
+import asyncio
+
+from fastapi import HTTPException
+from pytest import raises
+from starlette import status
+
+from src.hashing import PasswordHashingPool
+
+
+def test_password_hashing_pool_hash_and_verify() -> None:
+    pool = PasswordHashingPool(max_workers=2, max_queue_size=4)
+
+    async def hash_and_verify() -> tuple[bool, bool]:
+        hashed_password = await pool.hash(password="P@ssw0rd")
+
+        return (
+            await pool.verify(
+                plain_password="P@ssw0rd", hashed_password=hashed_password
+            ),
+            await pool.verify(
+                plain_password="Password", hashed_password=hashed_password
+            ),
+        )
+
+    try:
+        assert asyncio.run(hash_and_verify()) == (True, False)
+    finally:
+        pool.shutdown()
+
+    stats = pool.stats()
+
+    assert stats["submitted"] == 3
+    assert stats["completed"] == 3
+    assert stats["pending"] == 0
+    assert stats["rejected"] == 0
+    assert stats["busy_seconds"] > 0
+
+
+def test_password_hashing_pool_rejects_when_queue_is_full() -> None:
+    pool = PasswordHashingPool(max_workers=1, max_queue_size=1)
+
+    async def hash_concurrently() -> list[str | BaseException]:
+        return await asyncio.gather(
+            pool.hash(password="P@ssw0rd"),
+            pool.hash(password="P@ssw0rd"),
+            return_exceptions=True,
+        )
+
+    try:
+        hashed_password, rejection = asyncio.run(hash_concurrently())
+    finally:
+        pool.shutdown()
+
+    assert isinstance(hashed_password, str)
+    assert isinstance(rejection, HTTPException)
+    assert rejection.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert pool.stats()["rejected"] == 1
+
+
+def test_password_hashing_pool_waits_when_queue_is_full() -> None:
+    pool = PasswordHashingPool(max_workers=1, max_queue_size=1)
+
+    async def hash_concurrently() -> list[str]:
+        return await asyncio.gather(
+            pool.hash(password="P@ssw0rd"),
+            pool.hash(password="P@ssw0rd", wait=True),
+        )
+
+    try:
+        hashed_passwords = asyncio.run(hash_concurrently())
+    finally:
+        pool.shutdown()
+
+    assert all(isinstance(password, str) for password in hashed_passwords)
+    assert pool.stats()["submitted"] == 2
+    assert pool.stats()["max_pending"] == 1
+    assert pool.stats()["rejected"] == 0
+
+
+def test_password_hashing_pool_invalid_executor_type() -> None:
+    with raises(ValueError):
+        PasswordHashingPool(executor_type="fiber")
@@ -0,0 +1,77 @@
+from fastapi.testclient import TestClient
+from starlette import status
+
+from src.config import settings
+
+
+def test_unauthorized_user_read_cache_stats(client: TestClient) -> None:
+    response = client.get(url="/internal/cache")
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_authorized_user_read_cache_stats(
+    authorized_user_client: TestClient,
+) -> None:
+    response = authorized_user_client.get(url="/internal/cache")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_authorized_admin_read_cache_stats(
+    authorized_admin_client: TestClient,
+) -> None:
+    authorized_admin_client.get(url="/todos/")
+    authorized_admin_client.get(url="/todos/")
+
+    response = authorized_admin_client.get(url="/internal/cache")
+    stats = response.json()
+
+    assert stats["backend"] == "InMemoryCache"
+    assert stats["hits"] >= 1
+    assert stats["misses"] >= 1
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_authorized_user_read_pool_stats(
+    authorized_user_client: TestClient,
+) -> None:
+    response = authorized_user_client.get(url="/internal/pool")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_authorized_admin_read_pool_stats(
+    authorized_admin_client: TestClient,
+) -> None:
+    response = authorized_admin_client.get(url="/internal/pool")
+    stats = response.json()
+
+    assert stats["size"] == settings.DATABASE_POOL_SIZE
+    assert stats["max_overflow"] == settings.DATABASE_MAX_OVERFLOW
+    assert {"checked_out", "overflow", "timeouts"} <= stats.keys()
+    assert stats["replicas"] == {}
+    assert stats["wait_seconds"]["buckets"]["+Inf"] == (
+        stats["wait_seconds"]["count"]
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_authorized_user_read_hashing_stats(
+    authorized_user_client: TestClient,
+) -> None:
+    response = authorized_user_client.get(url="/internal/hashing")
+
+    assert response.status_code == status.HTTP_403_FORBIDDEN
+
+
+def test_authorized_admin_read_hashing_stats(
+    authorized_admin_client: TestClient,
+) -> None:
+    response = authorized_admin_client.get(url="/internal/hashing")
+    stats = response.json()
+
+    assert stats["submitted"] >= 1
+    assert stats["completed"] >= 1
+    assert {"pending", "rejected", "busy_seconds"} <= stats.keys()
+    assert response.status_code == status.HTTP_200_OK
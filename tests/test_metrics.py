@@ -0,0 +1,68 @@
+from typing import Type
+
+from fastapi.testclient import TestClient
+from starlette import status
+
+from src.metrics import Registry
+from src.models import Todo
+
+
+def test_registry_render() -> None:
+    registry = Registry()
+    requests = registry.counter(
+        name="requests_total",
+        documentation="The number of requests.",
+        label_names=("route",),
+    )
+    latency = registry.histogram(
+        name="latency_seconds",
+        documentation="The request latency.",
+        buckets=(0.1, 1),
+    )
+
+    requests.labels('/todos/{todo_id}"').inc()
+    latency.labels().observe(0.5)
+
+    assert registry.render().splitlines() == [
+        "# HELP requests_total The number of requests.",
+        "# TYPE requests_total counter",
+        'requests_total{route="/todos/{todo_id}\\""} 1',
+        "# HELP latency_seconds The request latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.1"} 0',
+        'latency_seconds_bucket{le="1"} 1',
+        'latency_seconds_bucket{le="+Inf"} 1',
+        "latency_seconds_sum 0.5",
+        "latency_seconds_count 1",
+    ]
+
+
+def test_read_metrics(
+    authorized_user_client: TestClient, test_todos: list[Type[Todo]]
+) -> None:
+    authorized_user_client.get(url=f"/todos/{test_todos[2].todo_id}")
+
+    response = authorized_user_client.get(url="/metrics")
+    samples = dict(
+        line.rsplit(" ", 1)
+        for line in response.text.splitlines()
+        if not line.startswith("#")
+    )
+    labels = '{method="GET",route="/todos/{todo_id}",status="200"}'
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/plain")
+    assert float(samples[f"http_requests_total{labels}"]) >= 1
+    assert float(samples[f"http_request_duration_seconds_count{labels}"]) >= 1
+    assert (
+        float(
+            samples[
+                'http_request_db_queries_sum{method="GET",'
+                'route="/todos/{todo_id}"}'
+            ]
+        )
+        >= 1
+    )
+    assert 'db_pool_checkouts_total{engine="primary"}' in samples
+    assert float(samples["password_hashing_submitted_total"]) >= 1
+    assert "password_hashing_pending" in samples
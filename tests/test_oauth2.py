@@ -0,0 +1,102 @@
+import asyncio
+import hashlib
+import time
+from datetime import timedelta
+
+from fastapi import HTTPException
+from pytest import MonkeyPatch, raises
+from sqlalchemy.orm import Session
+from starlette import status
+
+from src import oauth2
+from src.oauth2 import create_access_token, get_current_user, token_cache
+from src.revocation import token_revocation_list
+from src.schemas import TokenPayload
+from tests.conftest import TestingAsyncSessionLocal
+
+
+async def get_token_payload(token: str) -> TokenPayload:
+    async with TestingAsyncSessionLocal() as db:
+        return await get_current_user(token=token, db=db)
+
+
+def test_get_current_user_caches_verified_token(
+    session: Session, monkeypatch: MonkeyPatch
+) -> None:
+    calls = []
+    decode = oauth2.jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args)
+        return decode(*args, **kwargs)
+
+    monkeypatch.setattr(oauth2.jwt, "decode", counting_decode)
+    asyncio.run(token_cache.clear())
+    token_revocation_list.clear()
+
+    token = create_access_token(username="john", user_id=1, role="user")
+
+    first_payload = asyncio.run(get_token_payload(token=token))
+    second_payload = asyncio.run(get_token_payload(token=token))
+
+    assert first_payload == second_payload
+    assert first_payload.username == "john"
+    assert len(calls) == 1
+    assert token_cache.size() == 1
+
+
+def test_get_current_user_honours_token_expiry(session: Session) -> None:
+    asyncio.run(token_cache.clear())
+    token_revocation_list.clear()
+
+    token = create_access_token(
+        username="john",
+        user_id=1,
+        role="user",
+        expires_delta=timedelta(seconds=5),
+    )
+    asyncio.run(get_token_payload(token=token))
+
+    expires_at, _ = token_cache._entries[
+        hashlib.sha256(token.encode()).hexdigest()
+    ]
+
+    assert expires_at - time.monotonic() <= 5
+
+    expired_token = create_access_token(
+        username="john",
+        user_id=1,
+        role="user",
+        expires_delta=timedelta(seconds=-5),
+    )
+
+    with raises(HTTPException) as exc_info:
+        asyncio.run(get_token_payload(token=expired_token))
+
+    assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+    assert token_cache.size() == 1
+
+
+def test_get_current_user_rejects_revoked_token(session: Session) -> None:
+    asyncio.run(token_cache.clear())
+    token_revocation_list.clear()
+
+    token = create_access_token(username="john", user_id=1, role="user")
+    token_payload = asyncio.run(get_token_payload(token=token))
+
+    token_revocation_list.add_token(
+        jti=token_payload.jti, expires_at=token_payload.expires_at
+    )
+
+    with raises(HTTPException) as exc_info:
+        asyncio.run(get_token_payload(token=token))
+
+    assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
+
+    token_revocation_list.add_user_cutoff(
+        user_id=1, cutoff=token_payload.issued_at + 1
+    )
+    token = create_access_token(username="john", user_id=1, role="user")
+
+    with raises(HTTPException):
+        asyncio.run(get_token_payload(token=token))
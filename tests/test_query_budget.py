@@ -0,0 +1,80 @@
+import asyncio
+from typing import Type
+
+from fastapi.testclient import TestClient
+from pytest import MonkeyPatch, raises
+
+from src.database import QueryStats
+from src.exceptions import QueryBudgetException
+from src.middleware import MetricsMiddleware
+from src.models import Todo
+from src.query_budget import QueryBudget, query_budget
+
+
+def test_query_budget_flags_repeated_statements() -> None:
+    budget = QueryBudget(mode="raise", max_queries=10, max_repeats=2)
+    query_stats = QueryStats()
+
+    query_stats.add(statement="SELECT * FROM todo", duration=0.001)
+
+    for owner_id in range(3):
+        query_stats.add(
+            statement=f'SELECT * FROM "user" WHERE user_id = ${owner_id + 1}',
+            duration=0.001,
+        )
+
+    violations = budget.get_violations(query_stats=query_stats, route="/")
+
+    assert len(violations) == 1
+    assert "3 times" in violations[0]
+    assert "WHERE user_id = ?" in violations[0]
+
+    with raises(QueryBudgetException):
+        budget.check(query_stats=query_stats, route="/")
+
+
+def test_query_budget_per_route(
+    authorized_user_client: TestClient,
+    test_todos: list[Type[Todo]],
+    monkeypatch: MonkeyPatch,
+) -> None:
+    monkeypatch.setitem(query_budget.route_max_queries, "/todos/{todo_id}", 0)
+
+    with raises(QueryBudgetException) as exc_info:
+        authorized_user_client.get(url=f"/todos/{test_todos[2].todo_id}")
+
+    assert "/todos/{todo_id} executed" in exc_info.value.detail
+
+
+def test_query_budget_checked_before_response_completes(
+    monkeypatch: MonkeyPatch,
+) -> None:
+    events = []
+
+    async def app(scope: dict, receive, send) -> None:
+        await send({"type": "http.response.start", "status": 200})
+        await send(
+            {"type": "http.response.body", "body": b"", "more_body": True}
+        )
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message: dict) -> None:
+        events.append(message["type"])
+
+    def check(query_stats: QueryStats, route: str) -> None:
+        events.append("query_budget.check")
+
+    monkeypatch.setattr(query_budget, "check", check)
+
+    asyncio.run(
+        MetricsMiddleware(app=app)(
+            {"type": "http", "method": "GET"}, None, send
+        )
+    )
+
+    assert events == [
+        "http.response.start",
+        "http.response.body",
+        "query_budget.check",
+        "http.response.body",
+    ]
@@ -0,0 +1,90 @@
+import asyncio
+import os
+import uuid
+
+from fastapi import HTTPException
+from pytest import mark, raises
+from starlette import status
+
+from src.rate_limit import (
+    InMemoryRateLimit,
+    LoginRateLimiter,
+    RedisRateLimit,
+    redis_asyncio,
+)
+
+TEST_REDIS_URL = os.environ.get("TEST_REDIS_URL")
+
+
+def test_in_memory_rate_limit_sliding_window() -> None:
+    backend = InMemoryRateLimit(max_keys=10)
+
+    async def hit_until_limited() -> list[float | None]:
+        return [
+            await backend.hit(key="login", limit=2, window=0.2)
+            for _ in range(3)
+        ]
+
+    first, second, third = asyncio.run(hit_until_limited())
+
+    assert first is None
+    assert second is None
+    assert 0 < third <= 0.2
+
+    asyncio.run(asyncio.sleep(0.2))
+
+    assert asyncio.run(backend.hit(key="login", limit=2, window=0.2)) is None
+
+
+@mark.skipif(
+    redis_asyncio is None or TEST_REDIS_URL is None,
+    reason="The Redis rate limit needs `redis` and `TEST_REDIS_URL`.",
+)
+def test_redis_rate_limit_concurrent_hits() -> None:
+    async def hit_concurrently() -> list[float | None]:
+        backend = RedisRateLimit(
+            url=TEST_REDIS_URL,
+            prefix=f"todo-app:test:{uuid.uuid4().hex}:",
+        )
+
+        try:
+            return await asyncio.gather(
+                *(
+                    backend.hit(key="login", limit=5, window=60.0)
+                    for _ in range(50)
+                )
+            )
+        finally:
+            await backend.clear()
+
+    retry_afters = asyncio.run(hit_concurrently())
+
+    assert retry_afters.count(None) == 5
+    assert all(
+        0 < retry_after <= 60.0
+        for retry_after in retry_afters
+        if retry_after is not None
+    )
+
+
+def test_login_rate_limiter_per_client() -> None:
+    limiter = LoginRateLimiter(
+        backend=InMemoryRateLimit(max_keys=10),
+        username_limit=10,
+        client_limit=2,
+        window=60.0,
+    )
+
+    async def check_usernames(*usernames: str) -> None:
+        for username in usernames:
+            await limiter.check(username=username, client="127.0.0.1")
+
+    asyncio.run(check_usernames("michael", "lebron"))
+
+    with raises(HTTPException) as exc_info:
+        asyncio.run(check_usernames("kobe"))
+
+    assert exc_info.value.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert exc_info.value.headers["Retry-After"] == "60"
+
+    asyncio.run(limiter.check(username="kobe", client="10.0.0.1"))
@@ -0,0 +1,127 @@
+from fastapi import HTTPException
+from pydantic import ValidationError
+from pytest import mark, raises
+
+from src.exceptions import (
+    CountryFormatException,
+    DescriptionFormatException,
+    FirstNameFormatException,
+    PasswordFormatException,
+    TitleFormatException,
+    UsernameFormatException,
+)
+from src.schemas import AddressCreate, TodoCreate, UserCreate
+
+USER = {
+    "email": "lebron.james@gmail.com",
+    "username": "lebron",
+    "password": "L3br()nnn",
+    "role": "user",
+    "first_name": "Lebron",
+    "last_name": "James",
+}
+TODO = {
+    "title": "Plan Charity Event",
+    "description": "Coordinate a charity event.",
+    "priority": 5,
+}
+ADDRESS = {
+    "city": "Kyiv",
+    "state": "Kyiv",
+    "country": "Ukraine",
+    "postal_code": "01001",
+}
+
+
+@mark.parametrize(
+    "model, data, exception, detail",
+    [
+        (
+            UserCreate,
+            {**USER, "username": "Lebron"},
+            UsernameFormatException,
+            "The `username` must not contain uppercase characters.",
+        ),
+        (
+            UserCreate,
+            {**USER, "username": "lebron.james"},
+            UsernameFormatException,
+            "The `username` must not contain any punctuation marks "
+            "other than underscores.",
+        ),
+        (
+            UserCreate,
+            {**USER, "password": "l3br()nnn"},
+            PasswordFormatException,
+            "The `password` must contain at least one uppercase letter.",
+        ),
+        (
+            UserCreate,
+            {**USER, "password": "Ä3brönnnn"},
+            PasswordFormatException,
+            "The `password` must contain at least one punctuation mark "
+            "such as !#$%&'\"()*+,-/:;<=>?@[\\]^_`{|}~.",
+        ),
+        (
+            UserCreate,
+            {**USER, "password": "L3br()n nn"},
+            PasswordFormatException,
+            "The `password` must not contain whitespaces.",
+        ),
+        (
+            UserCreate,
+            {**USER, "first_name": "Le_bron"},
+            FirstNameFormatException,
+            "The `first_name` must not contain punctuation marks.",
+        ),
+        (
+            TodoCreate,
+            {**TODO, "title": "2026-10-18 ²"},
+            TitleFormatException,
+            "The `title` must contain letters.",
+        ),
+        (
+            TodoCreate,
+            {**TODO, "description": "Plan"},
+            DescriptionFormatException,
+            "The length of the `description` should be at least 5 and "
+            "no more than 200 characters.",
+        ),
+        (
+            AddressCreate,
+            {**ADDRESS, "country": "ukraine"},
+            CountryFormatException,
+            "The `country` must start with a capital letter "
+            "(except USA, UK, etc.).",
+        ),
+    ],
+)
+def test_schema_validation_errors(
+    model: type, data: dict, exception: type[HTTPException], detail: str
+) -> None:
+    with raises(exception) as exc_info:
+        model(**data)
+
+    assert exc_info.value.detail == detail
+
+
+@mark.parametrize(
+    "model, data",
+    [
+        (UserCreate, {**USER, "username": "леброн_2"}),
+        (UserCreate, {**USER, "first_name": "Леброн"}),
+        (TodoCreate, {**TODO, "title": "计划慈善活动"}),
+        (AddressCreate, {**ADDRESS, "country": "USA"}),
+        (AddressCreate, {**ADDRESS, "postal_code": "12a45"}),
+    ],
+)
+def test_schema_validation_passes(model: type, data: dict) -> None:
+    assert model(**data)
+
+
+@mark.parametrize("field", ["first_name", "last_name"])
+def test_schema_validation_rejects_null_names(field: str) -> None:
+    with raises(ValidationError) as exc_info:
+        UserCreate(**{**USER, field: None})
+
+    assert exc_info.value.errors()[0]["type"] == "type_error"
@@ -1,11 +1,14 @@
+import json
 from typing import Type
 
+import orjson
 from fastapi.testclient import TestClient
 from pytest import mark
 from starlette import status
 
-from src.models import Todo
-from src.schemas import TodoResponse
+from src.cache import todo_cache
+from src.models import Priority, Todo
+from src.schemas import TodoResponse, get_todo_response_dict
 
 
 def test_unauthorized_user_read_todos(
@@ -27,6 +30,244 @@ def test_authorized_user_read_todos(
     assert response.status_code == status.HTTP_200_OK
 
 
+def test_authorized_admin_read_todos_paginated(
+    authorized_admin_client: TestClient, test_todos: list[Type[Todo]]
+) -> None:
+    first_response = authorized_admin_client.get(
+        url="/todos/", params={"limit": 1}
+    )
+    next_cursor = first_response.headers["X-Next-Cursor"]
+
+    second_response = authorized_admin_client.get(
+        url="/todos/", params={"limit": 1, "after": next_cursor}
+    )
+
+    first_page = [TodoResponse(**todo) for todo in first_response.json()]
+    second_page = [TodoResponse(**todo) for todo in second_response.json()]
+
+    assert [todo.todo_id for todo in first_page] == [test_todos[0].todo_id]
+    assert [todo.todo_id for todo in second_page] == [test_todos[1].todo_id]
+    assert "X-Next-Cursor" not in second_response.headers
+    assert second_response.status_code == status.HTTP_200_OK
+
+
+@mark.parametrize("after", ["not-a-cursor", "eyJ0b2RvX2lkIjoieCJ9"])
+def test_authorized_user_read_todos_invalid_cursor(
+    authorized_user_client: TestClient,
+    test_todos: list[Type[Todo]],
+    after: str,
+) -> None:
+    response = authorized_user_client.get(
+        url="/todos/", params={"after": after}
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@mark.parametrize(
+    "params, titles",
+    [
+        (
+            {"sort": "-priority"},
+            ["Plan Charity Event", "Research Paper"],
+        ),
+        (
+            {"sort": "title"},
+            ["Plan Charity Event", "Research Paper"],
+        ),
+        (
+            {"priority": 3},
+            ["Research Paper"],
+        ),
+        (
+            {"priority_min": 4, "complete": False},
+            ["Plan Charity Event"],
+        ),
+        (
+            {"complete": True},
+            [],
+        ),
+    ],
+)
+def test_authorized_admin_read_todos_filtered(
+    authorized_admin_client: TestClient,
+    test_todos: list[Type[Todo]],
+    params: dict[str, int | str | bool],
+    titles: list[str],
+) -> None:
+    response = authorized_admin_client.get(url="/todos/", params=params)
+
+    todos = [TodoResponse(**todo) for todo in response.json()]
+
+    assert [todo.title for todo in todos] == titles
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_authorized_admin_read_todos_sorted_paginated(
+    authorized_admin_client: TestClient, test_todos: list[Type[Todo]]
+) -> None:
+    first_response = authorized_admin_client.get(
+        url="/todos/", params={"limit": 1, "sort": "priority"}
+    )
+    second_response = authorized_admin_client.get(
+        url="/todos/",
+        params={
+            "limit": 1,
+            "sort": "priority",
+            "after": first_response.headers["X-Next-Cursor"],
+        },
+    )
+    other_sort_response = authorized_admin_client.get(
+        url="/todos/",
+        params={
+            "limit": 1,
+            "sort": "title",
+            "after": first_response.headers["X-Next-Cursor"],
+        },
+    )
+
+    assert first_response.json()[0]["title"] == "Research Paper"
+    assert second_response.json()[0]["title"] == "Plan Charity Event"
+    assert other_sort_response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+def test_authorized_admin_read_todos_sparse_fields(
+    authorized_admin_client: TestClient, test_todos: list[Type[Todo]]
+) -> None:
+    first_response = authorized_admin_client.get(
+        url="/todos/",
+        params={"limit": 1, "sort": "-priority", "fields": "todo_id,title"},
+    )
+    second_response = authorized_admin_client.get(
+        url="/todos/",
+        params={
+            "limit": 1,
+            "sort": "-priority",
+            "fields": "title,todo_id",
+            "after": first_response.headers["X-Next-Cursor"],
+        },
+    )
+
+    assert first_response.json() == [
+        {"title": "Plan Charity Event", "todo_id": test_todos[1].todo_id}
+    ]
+    assert second_response.json() == [
+        {"title": "Research Paper", "todo_id": test_todos[0].todo_id}
+    ]
+
+
+def test_authorized_user_read_todos_unknown_field(
+    authorized_user_client: TestClient,
+) -> None:
+    response = authorized_user_client.get(
+        url="/todos/", params={"fields": "title,password"}
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_unauthorized_user_search_todos(
+    client: TestClient, test_todos: list[Type[Todo]]
+) -> None:
+    response = client.get(url="/todos/search", params={"q": "charity"})
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@mark.parametrize(
+    "q, titles",
+    [
+        ("charity", ["Plan Charity Event"]),
+        ("sponsors venue", ["Plan Charity Event"]),
+        ("research OR notes", ["Research Paper"]),
+        ("garage", []),
+    ],
+)
+def test_authorized_admin_search_todos(
+    authorized_admin_client: TestClient,
+    test_todos: list[Type[Todo]],
+    q: str,
+    titles: list[str],
+) -> None:
+    response = authorized_admin_client.get(
+        url="/todos/search", params={"q": q}
+    )
+
+    todos = [TodoResponse(**todo) for todo in response.json()]
+
+    assert [todo.title for todo in todos] == titles
+    assert response.status_code == status.HTTP_200_OK
+
+
+def test_authorized_user_read_todos_cached(
+    authorized_user_client: TestClient, test_todos: list[Type[Todo]]
+) -> None:
+    hits = todo_cache.hits
+
+    authorized_user_client.get(url="/todos/")
+    cached_response = authorized_user_client.get(url="/todos/")
+
+    authorized_user_client.put(
+        url=f"/todos/{test_todos[2].todo_id}",
+        json={
+            "title": "Exercise Routine",
+            "description": "Set a workout routine. Stay consistent.",
+            "priority": 5,
+            "complete": True,
+        },
+    )
+    response_after_update = authorized_user_client.get(url="/todos/")
+
+    assert todo_cache.hits == hits + 1
+    assert cached_response.json()[0]["title"] == test_todos[2].title
+    assert response_after_update.json()[0]["title"] == "Exercise Routine"
+    assert response_after_update.json()[0]["complete"] is True
+
+
+def test_authorized_user_read_todos_not_modified(
+    authorized_user_client: TestClient, test_todos: list[Type[Todo]]
+) -> None:
+    response = authorized_user_client.get(url="/todos/")
+    etag = response.headers["ETag"]
+
+    not_modified_response = authorized_user_client.get(
+        url="/todos/", headers={"If-None-Match": etag}
+    )
+    other_query_response = authorized_user_client.get(
+        url="/todos/",
+        params={"complete": True},
+        headers={"If-None-Match": etag},
+    )
+
+    authorized_user_client.delete(url=f"/todos/{test_todos[2].todo_id}")
+
+    response_after_deletion = authorized_user_client.get(
+        url="/todos/", headers={"If-None-Match": etag}
+    )
+
+    assert not_modified_response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified_response.headers["ETag"] == etag
+    assert not_modified_response.content == b""
+    assert other_query_response.status_code == status.HTTP_200_OK
+    assert response_after_deletion.status_code == status.HTTP_200_OK
+    assert response_after_deletion.headers["ETag"] != etag
+    assert response_after_deletion.json() == []
+
+
+def test_authorized_user_read_todo_not_modified(
+    authorized_user_client: TestClient, test_todos: list[Type[Todo]]
+) -> None:
+    url = f"/todos/{test_todos[2].todo_id}"
+
+    response = authorized_user_client.get(url=url)
+    not_modified_response = authorized_user_client.get(
+        url=url, headers={"If-None-Match": f'W/{response.headers["ETag"]}'}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not_modified_response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
 def test_unauthorized_user_read_todo(
     client: TestClient, test_todos: list[Type[Todo]]
 ) -> None:
@@ -150,6 +391,54 @@ def test_authorized_user_create_todo(
     assert response.status_code == status.HTTP_201_CREATED
 
 
+def test_unauthorized_user_create_todos(client: TestClient) -> None:
+    response = client.post(
+        url="/todos/bulk",
+        json=[
+            {
+                "title": "Buy Groceries",
+                "description": "Get essential items from the store.",
+                "priority": 4,
+            }
+        ],
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_authorized_user_create_todos(
+    authorized_user_client: TestClient,
+) -> None:
+    data = [
+        {
+            "title": f"Read Chapter {number}",
+            "description": f"Read and summarize chapter {number}.",
+            "priority": number % 5 + 1,
+            "complete": number % 2 == 0,
+        }
+        for number in range(1, 11)
+    ]
+
+    response = authorized_user_client.post(url="/todos/bulk", json=data)
+    todo_ids = response.json()["todo_ids"]
+
+    response_after_creation = authorized_user_client.get(url="/todos/")
+    todos = [TodoResponse(**todo) for todo in response_after_creation.json()]
+
+    assert len(todo_ids) == len(data)
+    assert [todo.todo_id for todo in todos] == todo_ids
+    assert [todo.title for todo in todos] == [todo["title"] for todo in data]
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+def test_authorized_user_create_todos_empty(
+    authorized_user_client: TestClient,
+) -> None:
+    response = authorized_user_client.post(url="/todos/bulk", json=[])
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 def test_unauthorized_user_update_todo(
     client: TestClient, test_todos: list[Type[Todo]]
 ) -> None:
@@ -214,6 +503,76 @@ def test_authorized_user_update_todo(
     assert response.status_code == status.HTTP_204_NO_CONTENT
 
 
+def test_unauthorized_user_update_todos(
+    client: TestClient, test_todos: list[Type[Todo]]
+) -> None:
+    response = client.patch(
+        url="/todos/batch",
+        json={
+            "filter": {"todo_ids": [test_todos[2].todo_id]},
+            "complete": True,
+        },
+    )
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+def test_authorized_admin_update_todos(
+    authorized_admin_client: TestClient, test_todos: list[Type[Todo]]
+) -> None:
+    todo_ids = [todo.todo_id for todo in test_todos]
+
+    response = authorized_admin_client.patch(
+        url="/todos/batch",
+        json={"filter": {"todo_ids": todo_ids}, "complete": True},
+    )
+    response_after_update = authorized_admin_client.get(url="/todos/")
+
+    todos = [TodoResponse(**todo) for todo in response_after_update.json()]
+
+    assert response.json()["todo_ids"] == todo_ids[:2]
+    assert all(todo.complete for todo in todos)
+    assert response.status_code == status.HTTP_200_OK
+
+
+@mark.parametrize(
+    "data",
+    [
+        {"filter": {}, "complete": True},
+        {"filter": {"complete": False}},
+    ],
+)
+def test_authorized_user_update_todos_invalid_batch(
+    authorized_user_client: TestClient,
+    test_todos: list[Type[Todo]],
+    data: dict,
+) -> None:
+    response = authorized_user_client.patch(url="/todos/batch", json=data)
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+def test_authorized_admin_delete_todos(
+    authorized_admin_client: TestClient, test_todos: list[Type[Todo]]
+) -> None:
+    authorized_admin_client.patch(
+        url="/todos/batch",
+        json={
+            "filter": {"todo_ids": [test_todos[0].todo_id]},
+            "complete": True,
+        },
+    )
+
+    response = authorized_admin_client.post(
+        url="/todos/batch/delete", json={"filter": {"complete": True}}
+    )
+    response_after_deletion = authorized_admin_client.get(url="/todos/")
+
+    assert response.json()["todo_ids"] == [test_todos[0].todo_id]
+    assert len(response_after_deletion.json()) == 1
+    assert response.status_code == status.HTTP_200_OK
+
+
 def test_unauthorized_user_delete_todo(
     client: TestClient, test_todos: list[Type[Todo]]
 ) -> None:
@@ -248,3 +607,62 @@ def test_authorized_user_delete_todo(
     )
 
     assert response.status_code == status.HTTP_204_NO_CONTENT
+
+
+def test_authorized_user_write_todo_single_statement(
+    authorized_user_client: TestClient,
+    test_todos: list[Type[Todo]],
+    executed_statements: list[str],
+) -> None:
+    authorized_user_client.get(url="/users/me")
+    executed_statements.clear()
+
+    response = authorized_user_client.put(
+        url=f"/todos/{test_todos[2].todo_id}",
+        json={
+            "title": "Exercise Routine",
+            "description": "Set a workout routine. Stay consistent.",
+            "priority": 5,
+            "complete": True,
+        },
+    )
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert len(executed_statements) == 1
+    assert executed_statements[0].startswith("UPDATE todo SET")
+
+    executed_statements.clear()
+
+    response = authorized_user_client.delete(
+        url=f"/todos/{test_todos[2].todo_id}"
+    )
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    assert len(executed_statements) == 1
+    assert executed_statements[0].startswith("DELETE FROM todo")
+
+    executed_statements.clear()
+
+    response = authorized_user_client.delete(
+        url=f"/todos/{test_todos[2].todo_id}"
+    )
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    assert len(executed_statements) == 1
+
+
+def test_todo_response_dict_matches_schema() -> None:
+    todo = get_todo_response_dict(
+        todo_id=1,
+        title="Research Paper",
+        description="Gather sources and draft a research paper",
+        priority=Priority.three,
+        complete=False,
+        user_id=2,
+        email="lebron.james@gmail.com",
+        username="lebron",
+    )
+
+    assert json.loads(orjson.dumps(todo)) == json.loads(
+        TodoResponse(**todo).json()
+    )
@@ -1,6 +1,8 @@
 from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
 from starlette import status
 
+from src.models import Todo
 from src.schemas import UserResponse
 
 
@@ -23,6 +25,83 @@ def test_authorized_user_get_info(authorized_user_client: TestClient) -> None:
     assert response.status_code == status.HTTP_200_OK
 
 
+def test_user_get_info_is_slim_by_default(
+    authorized_user_client: TestClient,
+) -> None:
+    response = authorized_user_client.get(url="/users/me")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert "todos" not in response.json()
+    assert "address" not in response.json()
+
+
+def test_user_get_info_includes_paginated_todos(
+    authorized_admin_client: TestClient, test_todos: list[dict]
+) -> None:
+    response = authorized_admin_client.get(
+        url="/users/me", params={"include": "todos,address", "todos_limit": 1}
+    )
+    user = response.json()
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(user["todos"]) == 1
+    assert user["address"] is None
+
+    response = authorized_admin_client.get(
+        url="/users/me",
+        params={
+            "include": "todos",
+            "todos_limit": 1,
+            "todos_after": user["todos_next_cursor"],
+        },
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert (
+        response.json()["todos"][0]["todo_id"] != user["todos"][0]["todo_id"]
+    )
+
+
+def test_user_get_info_todos_see_writes_from_other_workers(
+    authorized_user_client: TestClient,
+    session: Session,
+    test_todos: list[Todo],
+) -> None:
+    response = authorized_user_client.get(
+        url="/users/me", params={"include": "todos"}
+    )
+
+    assert len(response.json()["todos"]) == 1
+
+    session.add(
+        Todo(
+            title="Renew Passport",
+            description="Book an appointment and renew the passport.",
+            priority=2,
+            complete=False,
+            owner_id=test_todos[2].owner_id,
+        )
+    )
+    session.commit()
+
+    response = authorized_user_client.get(
+        url="/users/me", params={"include": "todos"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert len(response.json()["todos"]) == 2
+
+
+def test_user_get_info_with_unknown_include(
+    authorized_user_client: TestClient,
+) -> None:
+    response = authorized_user_client.get(
+        url="/users/me", params={"include": "password"}
+    )
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 def test_unauthorized_user_reset_password(client: TestClient) -> None:
     response = client.put(
         url="/users/reset-password",
@@ -41,3 +120,28 @@ def test_authorized_user_reset_password(
     )
 
     assert response.status_code == status.HTTP_204_NO_CONTENT
+
+
+def test_reset_password_revokes_tokens(
+    authorized_user_client: TestClient,
+) -> None:
+    response = authorized_user_client.put(
+        url="/users/reset-password",
+        json={"password": "L3br()nnn", "new_password": "N3wp@ssw0rd"},
+    )
+
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    response = authorized_user_client.get(url="/users/me")
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = authorized_user_client.post(
+        url="/auth/token",
+        data={"username": "lebron", "password": "N3wp@ssw0rd"},
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = authorized_user_client.get(url="/users/me", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK